@@ -0,0 +1,192 @@
+"""FTE and listing pages for the parser benchmarks.
+
+The checked-in corpus (benchmarks/corpus/fte and benchmarks/corpus/listing)
+holds SEI FTE pages rebuilt from records of all_fte_data_1.json and gov.br
+style listing pages; saved pages dropped into those directories are picked
+up as well. Synthetic FTEs with a chosen number of CNAE rows expose how the
+parsers scale with table size.
+
+    python -m benchmarks.corpus build [--data-file all_fte_data_1.json]
+"""
+import argparse
+import html
+import json
+import os
+import random
+
+from fte_viewer_backend.extraction import CNAE_KEY
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+FTE_DIR = os.path.join(CORPUS_DIR, "fte")
+LISTING_DIR = os.path.join(CORPUS_DIR, "listing")
+
+# CNAE row counts of the synthetic FTEs
+SYNTHETIC_SIZES = (10, 100, 1000)
+
+_SEI_HEAD = (
+    '<!DOCTYPE html>\n<html lang="pt-br">\n<head>\n'
+    '<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-1">\n'
+    '<title>SEI/IBAMA - {document} - Ficha Técnica de Enquadramento</title>\n'
+    '<style type="text/css">p.Tabela_Texto_Alinhado_Esquerda {{font-size:11pt}}</style>\n'
+    '</head>\n<body>\n'
+    '<p class="Texto_Centralizado_Maiusculas_Negrito">Ministério do Meio Ambiente</p>\n'
+    '<p class="Texto_Centralizado_Maiusculas_Negrito">Instituto Brasileiro do Meio Ambiente '
+    'e dos Recursos Naturais Renováveis</p>\n'
+    '<table border="1" cellpadding="1" cellspacing="1" style="width:100%">\n<tbody>\n'
+    '<tr><td colspan="3"><p class="Tabela_Texto_Centralizado">'
+    '<strong>FICHA TÉCNICA DE ENQUADRAMENTO</strong></p></td></tr>\n'
+)
+
+_SEI_TAIL = (
+    '</tbody>\n</table>\n'
+    '<p class="Texto_Alinhado_Esquerda">Documento assinado eletronicamente.</p>\n'
+    '<p class="Texto_Alinhado_Esquerda">A autenticidade deste documento pode ser conferida '
+    'no site https://sei.ibama.gov.br/autenticidade</p>\n'
+    '</body>\n</html>\n'
+)
+
+
+def _cell(text):
+    return f'<td><p class="Tabela_Texto_Alinhado_Esquerda">{html.escape(text)}</p></td>'
+
+
+def render_fte_page(record, document="0"):
+    """SEI FTE page with the main table rows of an all_fte_data.json record"""
+    rows = [
+        f"<tr>{_cell(key)}{_cell(value)}</tr>"
+        for key, value in record.get("metadata", {}).items()
+    ]
+    cnae_rows = record.get(CNAE_KEY, [])
+    if cnae_rows:
+        # CNAE rows are kept among the sections in the crawl output; they are
+        # rendered once, under the block header, from the CNAE list instead
+        cnae_codes = {entry["código"] for entry in cnae_rows}
+        sections = [section for section in record.get("sections", [])
+                    if section["content"] not in cnae_codes]
+    else:
+        sections = record.get("sections", [])
+    for section in sections:
+        rows.append(f"<tr>{_cell(section['title'])}{_cell(section['content'])}</tr>")
+    if cnae_rows:
+        rows.append(f'<tr><td colspan="3"><p><strong>{CNAE_KEY}</strong></p></td></tr>')
+        rows.append(f"<tr>{_cell('Agrupamento:')}{_cell('Código:')}{_cell('Descrição:')}</tr>")
+        for entry in cnae_rows:
+            rows.append(
+                f"<tr>{_cell(entry['agrupamento'].capitalize())}{_cell(entry['código'])}"
+                f"{_cell(entry['descricao'])}</tr>"
+            )
+    return _SEI_HEAD.format(document=document) + "\n".join(rows) + "\n" + _SEI_TAIL
+
+
+def synthetic_record(cnae_rows, seed=0):
+    """all_fte_data.json style record with the given number of CNAE rows"""
+    rng = random.Random(seed)
+    metadata = {
+        "Código:": f"{rng.randint(1, 22)} – {rng.randint(1, 80)}",
+        "Descrição:": "Fabricação de produtos sintéticos para benchmark",
+        "Versão FTE:": f"{rng.randint(1, 3)}.{rng.randint(0, 9)}",
+        "Data:": "05/05/2023",
+    }
+    sections = [
+        {"title": "PP/GU:", "content": rng.choice(["Pequeno", "Médio", "Alto"]), "items": []},
+        {"title": "A descrição compreende:", "content": "- a fabricação sintética;", "items": []},
+        {"title": "CTF/APP:", "content": "sim.", "items": []},
+    ]
+    cnae = []
+    for i in range(cnae_rows):
+        code = f"{rng.randint(1000, 9999)}-{rng.randint(0, 9)}/{rng.randint(0, 99):02d}"
+        cnae.append({
+            "agrupamento": rng.choice(["subclasse", "descritor"]),
+            "código": code,
+            "descricao": rng.choice(["", f"Fabricação de produto {i}"]),
+        })
+    return {"metadata": metadata, "sections": sections, CNAE_KEY: cnae}
+
+
+def synthetic_fte_page(cnae_rows, seed=0):
+    """FTE page HTML (str) with the given number of CNAE rows"""
+    return render_fte_page(synthetic_record(cnae_rows, seed), document=str(seed))
+
+
+def render_listing_page(fte_urls, title="Lista de todas as FTEs", seed=0):
+    """gov.br listing page: navigation noise around the FTE buttons"""
+    rng = random.Random(seed)
+    nav = "\n".join(
+        f'<li><a href="https://www.gov.br/ibama/pt-br/assuntos/item-{rng.randint(1, 999)}">'
+        f'Item de menu {i}</a></li>'
+        for i in range(120)
+    )
+    buttons = "\n".join(
+        f'<p><a class="plgBotao external-link" href="{html.escape(url)}" '
+        f'target="_blank">Acesse a FTE</a></p>'
+        for url in fte_urls
+    )
+    return (
+        '<!DOCTYPE html>\n<html lang="pt-br">\n<head>\n<meta charset="utf-8">\n'
+        f'<title>{html.escape(title)} — Instituto Brasileiro do Meio Ambiente</title>\n'
+        '<script>window.dataLayer = window.dataLayer || [];</script>\n</head>\n<body>\n'
+        f'<nav><ul>\n{nav}\n</ul></nav>\n'
+        f'<main><h1>{html.escape(title)}</h1>\n{buttons}\n</main>\n'
+        '<footer><p>Todo o conteúdo deste site está publicado sob a licença '
+        'Creative Commons Atribuição-SemDerivações 3.0</p></footer>\n</body>\n</html>\n'
+    )
+
+
+def load_pages(directory):
+    """[(name, bytes)] for the saved pages of a corpus directory"""
+    if not os.path.isdir(directory):
+        return []
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(directory, name), "rb") as f:
+                pages.append((name, f.read()))
+    return pages
+
+
+def build_corpus(data_file="all_fte_data_1.json", count=8):
+    """Write the checked-in corpus from records of a crawl output"""
+    with open(data_file, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    # Pick records spread over the CNAE row counts, largest tables included
+    entries = sorted(entries, key=lambda entry: len(entry["data"].get(CNAE_KEY, [])))
+    step = max(1, len(entries) // count)
+    picked = entries[::step][:count - 1] + [entries[-1]]
+
+    os.makedirs(FTE_DIR, exist_ok=True)
+    os.makedirs(LISTING_DIR, exist_ok=True)
+    for entry in picked:
+        document = entry["url"].rsplit("id_documento=", 1)[-1].split("&", 1)[0]
+        # SEI serves its pages in ISO-8859-1
+        with open(os.path.join(FTE_DIR, f"sei_{document}.html"), "wb") as f:
+            f.write(render_fte_page(entry["data"], document).encode("iso-8859-1", "xmlcharrefreplace"))
+
+    listings = {
+        "listing_atividades.html": [entry["url"] for entry in picked],
+        "listing_sem_fte.html": [],
+    }
+    for seed, (name, urls) in enumerate(listings.items()):
+        with open(os.path.join(LISTING_DIR, name), "w", encoding="utf-8") as f:
+            f.write(render_listing_page(urls, seed=seed))
+    return len(picked), len(listings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.corpus")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.required = True
+    build_parser = commands.add_parser("build", help="Rewrite the checked-in corpus")
+    build_parser.add_argument("--data-file", default="all_fte_data_1.json")
+    build_parser.add_argument("--count", type=int, default=8,
+                              help="FTE pages to render")
+    args = parser.parse_args(argv)
+
+    fte_pages, listing_pages = build_corpus(args.data_file, args.count)
+    print(f"Wrote {fte_pages} FTE pages to {FTE_DIR}")
+    print(f"Wrote {listing_pages} listing pages to {LISTING_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
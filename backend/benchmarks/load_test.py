@@ -0,0 +1,132 @@
+"""End-to-end crawl against the local mock server.
+
+Starts the mock listing and document hosts, runs `fte-scraper crawl` against
+them in a scratch directory, then reports crawl throughput, server-side
+latency percentiles, injected faults and the retries they caused, and
+whether every FTE made it into all_fte_data.json.
+
+    python -m benchmarks.load_test --categories 2200 --error-rate 0.05 --hang-rate 0.01
+"""
+import argparse
+import collections
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlparse
+
+from .mock_server import (DOCUMENT_PATH, add_site_arguments, site_from_args, start_servers,
+                          stop_servers)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run_crawl(directory, urls_file, listing_base_url, hosts, args):
+    """Run the crawler in a subprocess; returns (exit code, wall seconds)"""
+    command = [
+        sys.executable, "-m", "fte_viewer_backend.scrapper", "crawl",
+        "--urls-file", urls_file,
+        "--base-url", listing_base_url,
+        "--no-cache",
+        "--max-rate", str(args.max_rate),
+        "--timeout", str(args.client_timeout),
+    ]
+    for host in hosts:
+        command.extend(["--rate", f"{host}={args.rate}"])
+    if args.parse_workers is not None:
+        command.extend(["--parse-workers", str(args.parse_workers)])
+    if args.discover:
+        command.append("--discover")
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [BACKEND_DIR, env.get("PYTHONPATH")]))
+    with open(os.path.join(directory, "crawl.log"), "w", encoding="utf-8") as log:
+        start = time.monotonic()
+        process = subprocess.run(command, cwd=directory, env=env, stdout=log,
+                                 stderr=subprocess.STDOUT)
+        return process.returncode, time.monotonic() - start
+
+
+def report(site, returncode, seconds, directory):
+    requests = site.requests
+    statuses = collections.Counter(status for _, status, _ in requests)
+    per_url = collections.Counter(path for path, _, _ in requests)
+    retries = sum(count - 1 for count in per_url.values())
+    latencies = [elapsed for _, status, elapsed in requests if status == 200]
+
+    entries = 0
+    output_file = os.path.join(directory, "all_fte_data.json")
+    if os.path.exists(output_file):
+        with open(output_file, "r", encoding="utf-8") as f:
+            entries = len(json.load(f))
+    expected = site.expected_entries()
+    documents = {path for path, status, _ in requests
+                 if status == 200 and path.startswith(DOCUMENT_PATH)}
+    document_fetches = sum(1 for path, status, _ in requests
+                           if status == 200 and path.startswith(DOCUMENT_PATH))
+
+    print(f"\n{'='*80}\nLOAD TEST RESULTS\n{'='*80}")
+    print(f"Crawl exit code: {returncode}")
+    print(f"Wall time: {seconds:.2f} s")
+    print(f"Listing pages: {site.categories} ({site.categories / seconds:.1f}/s)")
+    print(f"FTE entries written: {entries} of {expected} ({entries / seconds:.1f}/s)")
+    print(f"Requests served: {len(requests)} ({len(requests) / seconds:.1f}/s)")
+    print(f"Documents fetched: {document_fetches} for {len(documents)} distinct documents")
+    for status, count in sorted(statuses.items()):
+        print(f"  HTTP {status}: {count}")
+    print(f"Retried requests: {retries} (URLs requested more than once: "
+          f"{sum(1 for count in per_url.values() if count > 1)})")
+    print(f"Latency p50: {percentile(latencies, 0.50) * 1000:.1f} ms")
+    print(f"Latency p95: {percentile(latencies, 0.95) * 1000:.1f} ms")
+    print(f"Latency p99: {percentile(latencies, 0.99) * 1000:.1f} ms")
+    print(f"Latency max: {max(latencies, default=0.0) * 1000:.1f} ms")
+    print(f"Crawl log: {os.path.join(directory, 'crawl.log')}")
+    return entries == expected and returncode == 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_test")
+    add_site_arguments(parser)
+    parser.add_argument("--rate", type=float, default=20.0,
+                        help="Starting crawl rate (req/s) for each mock host")
+    parser.add_argument("--max-rate", type=float, default=100.0,
+                        help="Highest rate the crawler's adaptive limiter may reach")
+    parser.add_argument("--client-timeout", type=float, default=2.0,
+                        help="Crawler HTTP timeout; hung responses should outlast it")
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--discover", action="store_true",
+                        help="Let the crawler find the listing pages on the mock index page")
+    parser.add_argument("--keep", default=None,
+                        help="Run the crawl in this directory and keep its output")
+    args = parser.parse_args(argv)
+
+    site = site_from_args(args)
+    servers, listing_base_url = start_servers(site)
+    hosts = [urlparse(listing_base_url).netloc, urlparse(site.document_base_url).netloc]
+    try:
+        with tempfile.TemporaryDirectory() as scratch:
+            directory = args.keep or scratch
+            os.makedirs(directory, exist_ok=True)
+            urls_file = os.path.join(directory, "listing_urls.txt")
+            with open(urls_file, "w", encoding="utf-8") as f:
+                f.write("\n".join(site.slugs()) + "\n")
+
+            print(f"Crawling {site.categories} listing pages from {listing_base_url}")
+            returncode, seconds = run_crawl(directory, urls_file, listing_base_url, hosts, args)
+            complete = report(site, returncode, seconds, directory)
+    finally:
+        stop_servers(servers)
+    return 0 if complete else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
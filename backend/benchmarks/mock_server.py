@@ -0,0 +1,253 @@
+"""Local stand-in for the gov.br listing pages and the SEI FTE documents.
+
+Two HTTP servers share one MockSite: the listing host serves
+lista-de-todas-as-ftes/<slug> pages whose "Acesse a FTE" buttons point at
+documento_consulta_externa.php on the document host, which serves the
+corpus FTE pages. The index page at lista-de-todas-as-ftes/ links every
+listing page, for crawl --discover. Latency, throttling (429/503 with
+Retry-After), hung responses, the number of categories and how many
+documents neighbouring listings share are configurable, and every request
+is recorded for the load test report.
+
+    python -m benchmarks.mock_server --categories 2200 --error-rate 0.05
+"""
+import argparse
+import html
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .corpus import FTE_DIR, load_pages, render_listing_page, synthetic_fte_page
+
+LISTING_PATH = "/ibama/pt-br/servicos/cadastros/ctf/ctf-app/ftes/lista-de-todas-as-ftes/"
+DOCUMENT_PATH = "/sei/documento_consulta_externa.php"
+
+
+class MockSite:
+    """Pages, injected faults and the request log shared by both servers"""
+
+    def __init__(self, categories=220, ftes_per_listing=4, latency=0.05, jitter=0.02,
+                 error_rate=0.0, hang_rate=0.0, hang_seconds=5.0, retry_after=1, seed=0,
+                 shared_ftes=0):
+        self.categories = categories
+        self.ftes_per_listing = ftes_per_listing
+        # Documents of the previous listing also linked from each listing page
+        self.shared_ftes = shared_ftes
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.retry_after = retry_after
+        self.document_base_url = None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # (path, status, seconds) for every request served
+        self.requests = []
+
+        # SEI serves the saved FTE pages; synthetic ones stand in without a corpus
+        self.documents = [body for _, body in load_pages(FTE_DIR)]
+        if not self.documents:
+            self.documents = [synthetic_fte_page(10, seed).encode("iso-8859-1", "xmlcharrefreplace")
+                              for seed in range(8)]
+
+    def slugs(self):
+        return [f"categoria-{index:04d}" for index in range(self.categories)]
+
+    def document_url(self, document_id):
+        return (f"{self.document_base_url}{DOCUMENT_PATH}?id_acesso_externo={document_id % 997}"
+                f"&id_documento={document_id}&infra_hash={document_id:032x}")
+
+    def index_page(self):
+        links = "\n".join(
+            f'<li><a href="{LISTING_PATH}{slug}">{html.escape(slug)}</a></li>'
+            for slug in self.slugs()
+        )
+        return ('<!DOCTYPE html>\n<html lang="pt-br">\n<head><meta charset="utf-8">\n'
+                '<title>Lista de todas as FTEs</title></head>\n<body>\n'
+                '<nav><a href="/ibama/pt-br">Início</a></nav>\n'
+                f'<main><ul>\n{links}\n</ul></main>\n</body>\n</html>\n').encode("utf-8")
+
+    def listing_page(self, slug):
+        if slug == "":
+            return self.index_page()
+        try:
+            index = self.slugs().index(slug)
+        except ValueError:
+            return None
+        first = index * self.ftes_per_listing
+        shared = range(max(0, first - self.shared_ftes), first)
+        urls = [self.document_url(document_id)
+                for document_id in [*range(first, first + self.ftes_per_listing), *shared]]
+        return render_listing_page(urls, title=slug, seed=index).encode("utf-8")
+
+    def expected_entries(self):
+        """Entries a complete crawl writes: one per document link of every listing page"""
+        return sum(self.ftes_per_listing + min(self.shared_ftes, index * self.ftes_per_listing)
+                   for index in range(self.categories))
+
+    def document_page(self, document_id):
+        if not 0 <= document_id < self.categories * self.ftes_per_listing:
+            return None
+        return self.documents[document_id % len(self.documents)]
+
+    def fault(self):
+        """The fault to inject for the next request: None, "hang" or an HTTP status"""
+        with self._lock:
+            roll = self._random.random()
+            delay = max(0.0, self._random.gauss(self.latency, self.jitter))
+            status = self._random.choice((429, 503))
+        if roll < self.hang_rate:
+            return "hang", self.hang_seconds
+        if roll < self.hang_rate + self.error_rate:
+            return status, delay
+        return None, delay
+
+    def record(self, path, status, seconds):
+        with self._lock:
+            self.requests.append((path, status, seconds))
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so connection reuse behaves as it does against gov.br
+    protocol_version = "HTTP/1.1"
+    site = None
+
+    def do_GET(self):
+        start = time.monotonic()
+        fault, delay = self.site.fault()
+        time.sleep(delay)
+        if fault == "hang":
+            status = 504
+            self._send(status, b"")
+        elif fault:
+            status = fault
+            self._send(status, b"Too busy", {"Retry-After": str(self.site.retry_after)})
+        else:
+            status, body, content_type = self._page()
+            self._send(status, body, {"Content-Type": content_type})
+        self.site.record(self.path, status, time.monotonic() - start)
+
+    def _page(self):
+        url = urlparse(self.path)
+        body = None
+        content_type = "text/html; charset=utf-8"
+        if url.path.startswith(LISTING_PATH):
+            body = self.site.listing_page(url.path[len(LISTING_PATH):])
+        elif url.path == DOCUMENT_PATH:
+            try:
+                document_id = int(parse_qs(url.query)["id_documento"][0])
+            except (KeyError, ValueError):
+                document_id = -1
+            body = self.site.document_page(document_id)
+            content_type = "text/html; charset=iso-8859-1"
+        if body is None:
+            return 404, b"Not found", "text/plain"
+        return 200, body, content_type
+
+    def _send(self, status, body, headers=None):
+        try:
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on a hung response
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping hung keep-alive connections are expected here
+        pass
+
+
+def start_servers(site, host="127.0.0.1", listing_port=0, document_port=0):
+    """Serve site on a listing host and a document host; returns (servers, listing_base_url)"""
+    handler = type("SiteHandler", (MockHandler,), {"site": site})
+    servers = []
+    for port in (listing_port, document_port):
+        server = MockServer((host, port), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    listing_server, document_server = servers
+    site.document_base_url = f"http://{host}:{document_server.server_address[1]}"
+    listing_base_url = f"http://{host}:{listing_server.server_address[1]}{LISTING_PATH}"
+    return servers, listing_base_url
+
+
+def stop_servers(servers):
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def add_site_arguments(parser):
+    parser.add_argument("--categories", type=int, default=220,
+                        help="Listing pages served (the real site has 220)")
+    parser.add_argument("--ftes-per-listing", type=int, default=4)
+    parser.add_argument("--shared-ftes", type=int, default=0,
+                        help="Documents of the previous listing page also linked from each page")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Mean response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02,
+                        help="Standard deviation of the response delay")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of requests answered 429/503 with Retry-After")
+    parser.add_argument("--hang-rate", type=float, default=0.0,
+                        help="Fraction of requests held for --hang-seconds")
+    parser.add_argument("--hang-seconds", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def site_from_args(args):
+    return MockSite(
+        categories=args.categories,
+        ftes_per_listing=args.ftes_per_listing,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        seed=args.seed,
+        shared_ftes=args.shared_ftes,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.mock_server")
+    add_site_arguments(parser)
+    parser.add_argument("--port", type=int, default=8765,
+                        help="Listing host port; documents are served on the next port")
+    parser.add_argument("--urls-file", default=None,
+                        help="Write the listing slugs here for fte-scraper crawl --urls-file")
+    args = parser.parse_args(argv)
+
+    site = site_from_args(args)
+    servers, listing_base_url = start_servers(site, listing_port=args.port,
+                                              document_port=args.port + 1)
+    if args.urls_file:
+        with open(args.urls_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(site.slugs()) + "\n")
+    print(f"Listing pages: {listing_base_url}<slug>")
+    print(f"FTE documents: {site.document_base_url}{DOCUMENT_PATH}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_servers(servers)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
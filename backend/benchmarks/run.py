@@ -0,0 +1,261 @@
+"""Offline throughput benchmarks for the FTE parsers.
+
+Runs every parser on the checked-in corpus and on synthetic FTEs with 10,
+100 and 1000 CNAE rows, then reports pages/sec, µs per row (CNAE rows for
+FTE pages, anchors for listing pages, entries for the version analysis and
+for writing all_fte_data.json) and peak memory. Timings are compared with baselines.json and the run
+fails when a benchmark is slower than its baseline by more than the
+tolerance. Baselines are machine dependent: refresh them with --update on
+the machine that runs the comparison.
+
+    python -m benchmarks.run [--filter NAME] [--update] [--tolerance 0.5]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from fte_viewer_backend.analyze_versions import analyze_fte_versions
+from fte_viewer_backend.extraction import CNAE_KEY, FTEExtraction, extract_description_from_raw_text
+from fte_viewer_backend.fetcher import decode_body
+from fte_viewer_backend.html_parsing import make_soup, listing_strainer, DEFAULT_PARSER
+from fte_viewer_backend.parse_worker import parse_fte_page
+from fte_viewer_backend.records import FTERecord
+from fte_viewer_backend.serialization import write_json
+from fte_viewer_backend.scrapper import find_fte_links, markdown_to_json, parse_fte_to_json
+
+from .corpus import (
+    FTE_DIR, LISTING_DIR, SYNTHETIC_SIZES, load_pages, synthetic_fte_page, synthetic_record,
+)
+
+BASELINES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_TOLERANCE = 0.5
+# Each timing repeat runs the benchmark for at least this long
+MIN_REPEAT_SECONDS = 0.2
+DEFAULT_REPEATS = 5
+
+
+class Benchmark:
+    """One parser call over a fixed input: run() is what gets timed"""
+
+    def __init__(self, name, run, pages, rows):
+        self.name = name
+        self.run = run
+        self.pages = pages
+        self.rows = rows
+
+
+def _quiet(func, *args):
+    # parse_fte_to_json and analyze_fte_versions print progress
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+def _over(func, inputs):
+    def run():
+        for value in inputs:
+            func(value)
+    return run
+
+
+def fte_benchmarks(label, pages, parser):
+    """Benchmarks over a set of FTE pages given as [(body, content_type)]"""
+    soups = [make_soup(decode_body(body, content_type), parser) for body, content_type in pages]
+    extractions = [FTEExtraction(soup) for soup in soups]
+    rows = sum(len(extraction.cnae_rows) for extraction in extractions)
+    raw_texts = [(extraction.raw_text, extraction.cnae_rows) for extraction in extractions]
+
+    def describe_all():
+        # The pre-index lookup: one full page scan per CNAE row
+        for raw_text, cnae_rows in raw_texts:
+            for cnae_type, code in cnae_rows:
+                extract_description_from_raw_text(raw_text, code, cnae_type)
+
+    def parse_pages():
+        for body, content_type in pages:
+            parse_fte_page(body, content_type, parser)
+
+    return [
+        Benchmark(f"markdown_to_json[{label}]", _over(markdown_to_json, soups), len(soups), rows),
+        Benchmark(f"extract_description_from_raw_text[{label}]", describe_all, len(soups), rows),
+        Benchmark(f"parse_fte_to_json[{label}]",
+                  _over(lambda soup: _quiet(parse_fte_to_json, soup), soups), len(soups), rows),
+        Benchmark(f"parse_fte_page[{label}]", parse_pages, len(pages), rows),
+    ]
+
+
+def listing_benchmarks(pages, parser):
+    soups = [make_soup(decode_body(body), parser, parse_only=listing_strainer())
+             for _, body in pages]
+    anchors = sum(len(soup.find_all("a")) for soup in soups)
+    return [Benchmark("find_fte_links[corpus]", _over(find_fte_links, soups), len(soups), anchors)]
+
+
+def analyze_benchmark(directory, entries=1000):
+    """analyze_fte_versions over a synthetic crawl output with repeated codes"""
+    data = []
+    for i in range(entries):
+        # Roughly three versions per code, like the published FTEs
+        record = synthetic_record(0, seed=i // 3)
+        record["metadata"]["Versão FTE:"] = f"{1 + i % 3}.{i % 7}"
+        data.append({"url": f"https://sei.ibama.gov.br/doc?id_documento={i}", "data": record})
+    data_file = os.path.join(directory, "all_fte_data.json")
+    with open(data_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    return Benchmark(f"analyze_fte_versions[synthetic-{entries}]",
+                     lambda: _quiet(analyze_fte_versions, data_file), 1, entries)
+
+
+def dump_benchmarks(directory, entries=1000):
+    """Writing all_fte_data.json: json.dump of the entry dicts vs write_json of FTERecords"""
+    data = []
+    for i in range(entries):
+        record = synthetic_record(20, seed=i)
+        data.append({"url": f"https://sei.ibama.gov.br/doc?id_documento={i}",
+                     "data": {"metadata": record["metadata"], "sections": record["sections"],
+                              "raw_content": "Ficha Técnica de Enquadramento\n" * 40,
+                              CNAE_KEY: record[CNAE_KEY]}})
+    records = [FTERecord.from_entry(entry) for entry in data]
+    output_path = os.path.join(directory, "dump.json")
+
+    def json_dump():
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    return [
+        Benchmark(f"json.dump[synthetic-{entries}]", json_dump, 1, entries),
+        Benchmark(f"write_json[synthetic-{entries}]",
+                  lambda: write_json(output_path, records, pretty=True), 1, entries),
+    ]
+
+
+def collect_benchmarks(directory, parser=DEFAULT_PARSER):
+    benchmarks = []
+    corpus = [(body, None) for _, body in load_pages(FTE_DIR)]
+    if corpus:
+        benchmarks.extend(fte_benchmarks("corpus", corpus, parser))
+    for size in SYNTHETIC_SIZES:
+        page = synthetic_fte_page(size, seed=size).encode("iso-8859-1", "xmlcharrefreplace")
+        benchmarks.extend(fte_benchmarks(f"synthetic-{size}", [(page, None)], parser))
+    listings = load_pages(LISTING_DIR)
+    if listings:
+        benchmarks.extend(listing_benchmarks(listings, parser))
+    benchmarks.append(analyze_benchmark(directory))
+    benchmarks.extend(dump_benchmarks(directory))
+    return benchmarks
+
+
+def time_benchmark(benchmark, repeats=DEFAULT_REPEATS):
+    """Best seconds per run() call over several repeats"""
+    benchmark.run()  # warm up caches and lazy imports
+    best = None
+    for _ in range(repeats):
+        calls = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < MIN_REPEAT_SECONDS:
+            benchmark.run()
+            calls += 1
+            elapsed = time.perf_counter() - start
+        per_call = elapsed / calls
+        best = per_call if best is None else min(best, per_call)
+    return best
+
+
+def peak_memory(benchmark):
+    """Peak bytes allocated by Python during one run() call"""
+    tracemalloc.start()
+    try:
+        benchmark.run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(benchmark, repeats=DEFAULT_REPEATS):
+    seconds = time_benchmark(benchmark, repeats)
+    return {
+        "seconds_per_call": seconds,
+        "pages_per_second": benchmark.pages / seconds,
+        "us_per_row": seconds * 1e6 / benchmark.rows if benchmark.rows else None,
+        "peak_memory_kib": peak_memory(benchmark) / 1024,
+    }
+
+
+def load_baselines(path=BASELINES_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baselines(results, path=BASELINES_FILE):
+    baselines = load_baselines(path)
+    for name, result in results.items():
+        baselines[name] = {"seconds_per_call": round(result["seconds_per_call"], 9)}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(baselines.items())), f, indent=2)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("--filter", default=None,
+                        help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--parser", default=DEFAULT_PARSER, help="HTML tree builder")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown over the baseline (0.5 = 50%%)")
+    parser.add_argument("--update", action="store_true",
+                        help="Store this run's timings as the new baselines")
+    parser.add_argument("--json", default=None, help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    baselines = load_baselines()
+    results = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as directory:
+        benchmarks = collect_benchmarks(directory, args.parser)
+        if args.filter:
+            benchmarks = [b for b in benchmarks if args.filter in b.name]
+
+        print(f"{'benchmark':<48} {'pages/s':>10} {'µs/row':>10} {'peak KiB':>10} {'vs base':>8}")
+        for benchmark in benchmarks:
+            result = measure(benchmark, args.repeats)
+            results[benchmark.name] = result
+
+            baseline = baselines.get(benchmark.name)
+            change = ""
+            if baseline:
+                ratio = result["seconds_per_call"] / baseline["seconds_per_call"]
+                change = f"{(ratio - 1) * 100:+.0f}%"
+                if ratio > 1 + args.tolerance:
+                    regressions.append((benchmark.name, ratio))
+            us_per_row = "-" if result["us_per_row"] is None else f"{result['us_per_row']:.1f}"
+            print(f"{benchmark.name:<48} {result['pages_per_second']:>10.1f} {us_per_row:>10} "
+                  f"{result['peak_memory_kib']:>10.0f} {change:>8}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update:
+        save_baselines(results)
+        print(f"\nBaselines saved to: {BASELINES_FILE}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than baseline by more than "
+              f"{args.tolerance:.0%}:")
+        for name, ratio in regressions:
+            print(f"  {name}: {ratio:.2f}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
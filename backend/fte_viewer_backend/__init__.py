@@ -0,0 +1,32 @@
+"""FTE Viewer backend: scraping and processing of IBAMA FTE pages"""
+
+__version__ = "1.0.0"
+
+# Public helpers, resolved on first access (PEP 562) so that importing the
+# package, or running one of its commands, does not pull in every dependency
+_EXPORTS = {
+    "extract_fte_content": "extraction",
+    "extract_description_from_raw_text": "extraction",
+    "markdown_to_json": "scrapper",
+    "parse_fte_to_json": "scrapper",
+    "get_page_content": "scrapper",
+    "find_fte_links": "scrapper",
+    "FTEScraper": "scrapper",
+    "CnaeIndex": "cnae_index",
+    "FTERecord": "records",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
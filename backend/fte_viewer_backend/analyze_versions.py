@@ -0,0 +1,235 @@
+import csv
+import json
+import sys
+from collections import defaultdict
+
+from .extraction import metadata_value
+from .jsonl_output import read_entries
+from .lineage import load_lineage, version_key
+
+# Bytes read at a time when streaming the all_fte_data.json array
+STREAM_CHUNK_SIZE = 1 << 16
+
+def iter_fte_entries(data_file='all_fte_data.json', chunk_size=STREAM_CHUNK_SIZE):
+    """Yield the entries of all_fte_data.json (or of the crawl's JSONL output) one at a time.
+
+    Only the entry being decoded is held in memory, so files far larger than
+    RAM can be analyzed.
+    """
+    if data_file.endswith('.jsonl'):
+        yield from read_entries(data_file)
+        return
+
+    decoder = json.JSONDecoder()
+    with open(data_file, 'r', encoding='utf-8') as f:
+        buffer = ''
+        position = 0
+        started = False
+        eof = False
+        while True:
+            # Skip the separators between entries
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if not started and position < len(buffer):
+                if buffer[position] != '[':
+                    raise ValueError(f"{data_file} does not contain a JSON array")
+                started = True
+                position += 1
+                continue
+            if position < len(buffer) and buffer[position] == ']':
+                return
+            if position < len(buffer):
+                try:
+                    entry, end = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    # Entry continues past the end of the buffer
+                    if eof:
+                        raise
+                else:
+                    yield entry
+                    position = end
+                    continue
+            if eof:
+                if started:
+                    raise ValueError(f"{data_file} ends before its closing ']'")
+                return
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+def collect_versions(entries):
+    """Group entries by código, keeping only a small summary of each version.
+
+    Returns (codigo_groups, entry_count); memory grows with the number of
+    versions, not with the size of the records.
+    """
+    codigo_groups = defaultdict(list)
+    entry_count = 0
+    for item in entries:
+        entry_count += 1
+        metadata = item['data'].get('metadata', {})
+        codigo = _field(metadata, 'Código:')
+        codigo_groups[codigo].append({
+            'version': _field(metadata, 'Versão FTE:'),
+            'url': item['url'],
+            'descricao': _field(metadata, 'Descrição:')
+        })
+    return codigo_groups, entry_count
+
+def _field(metadata, label):
+    value = metadata_value(metadata, label)
+    return 'N/A' if value is None else value
+
+def groups_from_lineage(lineage_file):
+    """collect_versions' código groups read from a published fte_lineage.json.
+
+    The lineage already merges spellings of a code and repeated documents,
+    so nothing is recomputed from the records; returns (codigo_groups, version_count).
+    """
+    lineage = load_lineage(lineage_file)
+    codigo_groups = {}
+    for code in lineage['codes'].values():
+        codigo_groups[code['codigo']] = [
+            {'version': version['version'] or 'N/A', 'url': version['url'],
+             'descricao': version['descricao'] or 'N/A'}
+            for version in code['versions']
+        ]
+    return codigo_groups, sum(len(versions) for versions in codigo_groups.values())
+
+def analyze_fte_versions(data_file='all_fte_data.json'):
+    """Analyze FTE data to find codes with multiple versions"""
+    
+    try:
+        # Stream the FTE data; only per-código version summaries are kept
+        codigo_groups, entry_count = collect_versions(iter_fte_entries(data_file))
+        
+        print(f"Total FTE entries loaded: {entry_count}")
+        
+        # Find codes with multiple versions
+        multi_version_codes = {}
+        single_version_codes = {}
+        
+        for codigo, versions in codigo_groups.items():
+            if len(versions) > 1:
+                multi_version_codes[codigo] = versions
+            else:
+                single_version_codes[codigo] = versions
+        
+        print(f"\n{'='*80}")
+        print(f"ANALYSIS RESULTS")
+        print(f"{'='*80}")
+        print(f"Total unique codes: {len(codigo_groups)}")
+        print(f"Codes with single version: {len(single_version_codes)}")
+        print(f"Codes with multiple versions: {len(multi_version_codes)}")
+        
+        if multi_version_codes:
+            print(f"\n{'='*80}")
+            print(f"CODES WITH MULTIPLE VERSIONS")
+            print(f"{'='*80}")
+            
+            for codigo, versions in multi_version_codes.items():
+                print(f"\nFTE - {codigo}")
+                print(f"Total versions: {len(versions)}")
+                print("-" * 50)
+                
+                # Sort versions by version number
+                sorted_versions = sorted(versions, key=lambda x: parse_version(x['version']))
+                
+                for i, version_info in enumerate(sorted_versions):
+                    if i == 0:
+                        print(f"  → Versão: {version_info['version']} (mais antiga)")
+                    elif i == len(sorted_versions) - 1:
+                        print(f"  → Versão: {version_info['version']} (mais recente)")
+                    else:
+                        print(f"  → Versão: {version_info['version']}")
+                    
+                    print(f"    Descrição: {version_info['descricao']}")
+                    print(f"    URL: {version_info['url']}")
+                    print()
+        
+        # Summary statistics
+        print(f"\n{'='*80}")
+        print(f"SUMMARY STATISTICS")
+        print(f"{'='*80}")
+        
+        version_counts = [len(versions) for versions in codigo_groups.values()]
+        if version_counts:
+            max_versions = max(version_counts)
+            min_versions = min(version_counts)
+            avg_versions = sum(version_counts) / len(version_counts)
+            
+            print(f"Maximum versions per code: {max_versions}")
+            print(f"Minimum versions per code: {min_versions}")
+            print(f"Average versions per code: {avg_versions:.2f}")
+        
+        # Show some examples of single version codes
+        if single_version_codes:
+            print(f"\n{'='*80}")
+            print(f"EXAMPLES OF SINGLE VERSION CODES (first 5)")
+            print(f"{'='*80}")
+            
+            for i, (codigo, versions) in enumerate(list(single_version_codes.items())[:5]):
+                print(f"{i+1}. FTE - {codigo}")
+                print(f"   Versão: {versions[0]['version']}")
+                print(f"   Descrição: {versions[0]['descricao']}")
+                print()
+        
+        return multi_version_codes
+        
+    except FileNotFoundError:
+        print(f"Error: {data_file} not found. Please run the scraper first.")
+        return None
+    except Exception as e:
+        print(f"Error analyzing data: {e}")
+        return None
+
+def parse_version(version_str):
+    """Sort key for a version string: its numbers, so 1.9 sorts before 1.10"""
+    return version_key(version_str)
+
+def export_multi_version_codes(multi_version_codes, output_file='multi_version_codes.json'):
+    """Export the codes with multiple versions to JSON for further analysis"""
+    print(f"\n{'='*80}")
+    print(f"EXPORTING MULTI-VERSION CODES TO JSON")
+    print(f"{'='*80}")
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(multi_version_codes, f, indent=2, ensure_ascii=False)
+    
+    print(f"Multi-version codes exported to: {output_file}")
+
+def version_report(codigo_groups, multi_only=True):
+    """{codigo: versions oldest first} for the report files"""
+    return {
+        codigo: sorted(versions, key=lambda x: parse_version(x['version']))
+        for codigo, versions in codigo_groups.items()
+        if len(versions) > 1 or not multi_only
+    }
+
+def write_version_report(codigo_groups, output_file, output_format='json', multi_only=True):
+    """Write the per-código versions as JSON or CSV; output_file '-' is stdout"""
+    report = version_report(codigo_groups, multi_only)
+    out = sys.stdout if output_file == '-' else open(output_file, 'w', encoding='utf-8', newline='')
+    try:
+        if output_format == 'csv':
+            writer = csv.writer(out)
+            writer.writerow(['codigo', 'versions', 'version', 'latest', 'url', 'descricao'])
+            for codigo, versions in report.items():
+                for i, version_info in enumerate(versions):
+                    writer.writerow([codigo, len(versions), version_info['version'],
+                                     i == len(versions) - 1, version_info['url'],
+                                     version_info['descricao']])
+        else:
+            json.dump(report, out, indent=2, ensure_ascii=False)
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return len(report)
+
+if __name__ == "__main__":
+    multi_version_codes = analyze_fte_versions()
+    
+    if multi_version_codes:
+        export_multi_version_codes(multi_version_codes)
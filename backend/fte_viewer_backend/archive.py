@@ -0,0 +1,126 @@
+import gzip
+import json
+import os
+import threading
+import time
+
+from .incremental import content_hash
+
+DEFAULT_ARCHIVE_DIR = "fte_archive"
+MANIFEST_FILE = "manifest.jsonl"
+OBJECTS_DIR = "objects"
+
+
+def _zstandard():
+    # Optional (pip install -e ".[archive]"); gzip is always available
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def _compress(body):
+    zstandard = _zstandard()
+    if zstandard is not None:
+        return ".zst", zstandard.ZstdCompressor(level=10).compress(body)
+    return ".gz", gzip.compress(body, compresslevel=6)
+
+
+def read_object(path):
+    """Decompressed body of an archived object; the extension names the codec"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if path.endswith(".zst"):
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd compressed; install the archive extra to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class RawArchive:
+    """Content-addressed store of every fetched page, compressed.
+
+    Bodies are stored once per sha256 under objects/; manifest.jsonl gets a
+    line per fetch with the URL, hash, content type and fetch time, so the
+    dataset can be rebuilt offline from what was actually downloaded.
+    """
+
+    def __init__(self, directory=DEFAULT_ARCHIVE_DIR):
+        self.directory = directory
+        self.stats = {"stored": 0, "deduplicated": 0, "bytes": 0}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, OBJECTS_DIR), exist_ok=True)
+        self._manifest = None
+
+    def _object_dir(self, digest):
+        return os.path.join(self.directory, OBJECTS_DIR, digest[:2])
+
+    def object_path(self, digest):
+        """Path of an archived body, or None if it is not in the archive"""
+        directory = self._object_dir(digest)
+        for extension in (".zst", ".gz"):
+            path = os.path.join(directory, digest + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def store(self, url, body, content_type=None):
+        """Archive a fetched body and record the fetch; returns its hash"""
+        digest = content_hash(body)
+        if self.object_path(digest) is None:
+            extension, compressed = _compress(body)
+            directory = self._object_dir(digest)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, digest + extension)
+            # Unique temporary name: two threads may fetch the same body at once
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+            outcome, size = "stored", len(compressed)
+        else:
+            outcome, size = "deduplicated", 0
+
+        line = json.dumps({"url": url, "hash": digest, "content_type": content_type,
+                           "fetched_at": time.time()}, ensure_ascii=False)
+        with self._lock:
+            if self._manifest is None:
+                self._manifest = open(os.path.join(self.directory, MANIFEST_FILE), 'a',
+                                      encoding='utf-8')
+            self._manifest.write(line + "\n")
+            self._manifest.flush()
+            self.stats[outcome] += 1
+            self.stats["bytes"] += size
+        return digest
+
+    def read(self, digest):
+        path = self.object_path(digest)
+        if path is None:
+            raise FileNotFoundError(f"{digest} is not in {self.directory}")
+        return read_object(path)
+
+    def manifest(self):
+        """{url: manifest record} of the latest fetch of each URL"""
+        latest = {}
+        try:
+            with open(os.path.join(self.directory, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn last line of an interrupted crawl
+                        continue
+                    previous = latest.get(record["url"])
+                    if previous is None or record["fetched_at"] >= previous["fetched_at"]:
+                        latest[record["url"]] = record
+        except FileNotFoundError:
+            pass
+        return latest
+
+    def close(self):
+        with self._lock:
+            if self._manifest is not None:
+                self._manifest.close()
+                self._manifest = None
@@ -0,0 +1,92 @@
+import json
+import re
+
+from .extraction import CNAE_KEY, metadata_value
+from .incremental import fte_key
+from .lineage import build_lineage
+
+DEFAULT_CNAE_FILE = "fte_cnae.json"
+
+# Bumped when the artifact layout or cnae_key changes
+CNAE_INDEX_VERSION = 1
+
+# The two agrupamentos of the CNAE tables on the FTE pages
+AGRUPAMENTOS = ("subclasse", "descritor")
+
+_DIGIT_RE = re.compile(r"\d")
+
+
+def cnae_key(code):
+    """Lookup key of a CNAE code: its digits, so "4681-8/01", "4681801" and
+    "4681-8 / 01" are the same key. Codes without digits are folded to lowercase.
+    """
+    if not code:
+        return None
+    return "".join(_DIGIT_RE.findall(code)) or code.strip().lower() or None
+
+
+def build_cnae_index(entries, lineage=None):
+    """CNAE key -> FTEs listing it, one table per agrupamento.
+
+    Each FTE appears once per key with its id, código, version, position in
+    fte_index.json and whether it is the latest version of its código
+    (from the lineage, built here when not given).
+    """
+    if lineage is None:
+        lineage = build_lineage(entries)
+    latest = {code["latest"] for code in lineage["codes"].values()}
+
+    tables = {agrupamento: {} for agrupamento in AGRUPAMENTOS}
+    seen = set()
+    for position, entry in enumerate(entries):
+        fte_id = fte_key(entry["url"])
+        data = entry.get("data", {})
+        metadata = data.get("metadata", {})
+        for cnae in data.get(CNAE_KEY, []):
+            agrupamento = cnae.get("agrupamento") or "subclasse"
+            key = cnae_key(cnae.get("código"))
+            if key is None or (agrupamento, key, fte_id) in seen:
+                continue
+            seen.add((agrupamento, key, fte_id))
+            tables.setdefault(agrupamento, {}).setdefault(key, []).append({
+                "id": fte_id,
+                "codigo": metadata_value(metadata, "Código:"),
+                "versao": metadata_value(metadata, "Versão FTE:"),
+                "position": position,
+                "latest": fte_id in latest,
+            })
+    return {
+        "version": CNAE_INDEX_VERSION,
+        **{agrupamento: dict(sorted(table.items())) for agrupamento, table in tables.items()},
+    }
+
+
+class CnaeIndex:
+    """Lookups over a CNAE index built by build_cnae_index or loaded from fte_cnae.json"""
+
+    def __init__(self, index):
+        if index.get("version") != CNAE_INDEX_VERSION:
+            raise ValueError(f"CNAE index version {index.get('version')}, "
+                             f"expected {CNAE_INDEX_VERSION}")
+        self.index = index
+        self.agrupamentos = [name for name, table in index.items() if isinstance(table, dict)]
+
+    @classmethod
+    def load(cls, path=DEFAULT_CNAE_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def lookup(self, code, agrupamento=None, latest_only=False):
+        """FTEs listing a CNAE code, under one agrupamento or all of them"""
+        key = cnae_key(code)
+        agrupamentos = [agrupamento] if agrupamento else self.agrupamentos
+        matches = []
+        for name in agrupamentos:
+            for fte in self.index.get(name, {}).get(key, ()):
+                if fte["latest"] or not latest_only:
+                    matches.append({**fte, "agrupamento": name})
+        return matches
+
+    def lookup_many(self, codes, agrupamento=None, latest_only=False):
+        """{code: lookup(code)} for many codes, e.g. every CNAE of a company register"""
+        return {code: self.lookup(code, agrupamento, latest_only) for code in codes}
@@ -0,0 +1,218 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from .frontier import Frontier
+
+# Maximum number of requests in flight per host
+DEFAULT_HOST_LIMITS = {
+    'www.gov.br': 4,
+    'sei.ibama.gov.br': 4,
+}
+DEFAULT_LIMIT = 2
+
+# Parse stage: one worker process per core; 0 parses in-process threads instead
+DEFAULT_PARSE_WORKERS = os.cpu_count() or 1
+# Items allowed to wait between two stages before the upstream stage blocks
+DEFAULT_QUEUE_DEPTH = 64
+
+
+class CrawlEngine:
+    """Staged crawl pipeline: fetch -> parse -> serialize.
+
+    Fetching runs in worker threads with bounded per-host concurrency.
+    Fetched FTE pages go through a bounded queue to a process pool for
+    parsing, and parsed entries through a second bounded queue to a single
+    serializer thread that feeds the sink. Full queues make the upstream
+    stage wait, so memory stays bounded whatever the relative stage speeds.
+    Document links go through a Frontier, so a document linked from several
+    listing pages is fetched and parsed once and its entry shared.
+    """
+
+    def __init__(self, host_limits=None, default_limit=DEFAULT_LIMIT,
+                 parse_workers=DEFAULT_PARSE_WORKERS, queue_depth=DEFAULT_QUEUE_DEPTH):
+        self.host_limits = dict(DEFAULT_HOST_LIMITS)
+        if host_limits:
+            self.host_limits.update(host_limits)
+        self.default_limit = default_limit
+        self.parse_workers = parse_workers
+        self.queue_depth = queue_depth
+        self._semaphores = {}
+        self._executor = None
+        self._sink = None
+        self._frontier = None
+        self._documents = {}
+
+    def _semaphore(self, host):
+        # Semaphores are created lazily so they bind to the running loop
+        if host not in self._semaphores:
+            limit = self.host_limits.get(host, self.default_limit)
+            self._semaphores[host] = asyncio.Semaphore(limit)
+        return self._semaphores[host]
+
+    async def submit(self, url, func, *args):
+        """Run a blocking func for url in a worker thread, inside its host's slot"""
+        host = urlparse(url).netloc
+        loop = asyncio.get_running_loop()
+        async with self._semaphore(host):
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _crawl_listing(self, index, url, stages, parse_queue, serialize_queue):
+        process_listing, fetch_fte = stages[0], stages[1]
+        fte_links, issue = await self.submit(url, process_listing, url)
+        loop = asyncio.get_running_loop()
+
+        async def crawl_fte(position, fte_link):
+            fte_link, key, first = self._frontier.claim(fte_link, url)
+            done = loop.create_future()
+            if not first:
+                # Fetched for another listing (or still being fetched): reuse its entry
+                entry = await self._documents[key]
+                if entry is not None:
+                    await serialize_queue.put((index, position, entry, done))
+                    await done
+                return
+
+            shared = self._documents[key] = loop.create_future()
+            try:
+                entry, parse_job = await self.submit(fte_link, fetch_fte, fte_link)
+                if parse_job is not None:
+                    await parse_queue.put((index, position, fte_link, parse_job, done))
+                else:
+                    await serialize_queue.put((index, position, entry, done))
+                # Resolved by the serializer, with the entry, once it is in the sink
+                entry = await done
+            except BaseException:
+                shared.set_result(None)
+                raise
+            shared.set_result(entry)
+
+        await asyncio.gather(
+            *(crawl_fte(position, fte_link) for position, fte_link in enumerate(fte_links))
+        )
+        # Only reached once every FTE of the listing has been handed to the sink
+        self._sink.complete_listing(index, url, issue)
+
+    async def _parse_stage(self, stages, parse_queue, serialize_queue, parse_executor):
+        parse_fte, finish_fte = stages[2], stages[3]
+        loop = asyncio.get_running_loop()
+        while True:
+            index, position, fte_link, parse_job, done = await parse_queue.get()
+            entry = None
+            try:
+                result = await loop.run_in_executor(parse_executor, parse_fte, *parse_job)
+                entry = finish_fte(fte_link, parse_job, result)
+            except Exception as e:
+                print(f"Error parsing {fte_link}: {str(e)}")
+            finally:
+                await serialize_queue.put((index, position, entry, done))
+
+    async def _serialize_stage(self, serialize_queue, serialize_executor):
+        loop = asyncio.get_running_loop()
+        while True:
+            index, position, entry, done = await serialize_queue.get()
+            try:
+                if entry is not None:
+                    await loop.run_in_executor(
+                        serialize_executor, self._sink.write_entry, index, position, entry
+                    )
+                done.set_result(entry)
+            except Exception as e:
+                done.set_exception(e)
+
+    async def crawl(self, listing_urls, process_listing, fetch_fte, parse_fte, finish_fte,
+                    sink, skip=(), frontier=None):
+        """Crawl every listing page and the FTE pages it links to.
+
+        process_listing(url) returns (fte_links, issue). fetch_fte(link)
+        returns (entry, parse_job): an entry that needs no parsing, or the
+        arguments for parse_fte, which runs in the parse pool and must be a
+        picklable module-level function. finish_fte(link, parse_job, result)
+        turns its result into the entry. Each entry is handed to sink tagged
+        with its listing index and link position, so the sink can restore the
+        order of a serial walk over the same pages. Listing indexes in skip
+        are not crawled. fetch_fte is called once per document of frontier
+        (a new Frontier when not given); a document's later links get the
+        entry of the first.
+        """
+        workers = sum(self.host_limits.values()) + self.default_limit
+        self._semaphores = {}
+        self._sink = sink
+        self._frontier = frontier if frontier is not None else Frontier()
+        self._documents = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        if self.parse_workers:
+            parse_executor = ProcessPoolExecutor(max_workers=self.parse_workers)
+        else:
+            parse_executor = ThreadPoolExecutor(max_workers=1)
+        serialize_executor = ThreadPoolExecutor(max_workers=1)
+
+        parse_queue = asyncio.Queue(maxsize=self.queue_depth)
+        serialize_queue = asyncio.Queue(maxsize=self.queue_depth)
+        stages = (process_listing, fetch_fte, parse_fte, finish_fte)
+        consumers = [
+            asyncio.ensure_future(
+                self._parse_stage(stages, parse_queue, serialize_queue, parse_executor)
+            )
+            for _ in range(max(self.parse_workers, 1))
+        ]
+        consumers.append(asyncio.ensure_future(
+            self._serialize_stage(serialize_queue, serialize_executor)
+        ))
+        try:
+            await asyncio.gather(*(
+                self._crawl_listing(index, url, stages, parse_queue, serialize_queue)
+                for index, url in enumerate(listing_urls)
+                if index not in skip
+            ))
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+            self._executor.shutdown(wait=True)
+            parse_executor.shutdown(wait=True)
+            serialize_executor.shutdown(wait=True)
+            self._executor = None
+            self._sink = None
+            self._documents = {}
+
+
+class MemorySink:
+    """Collect crawl results in memory, in serial-walk order"""
+
+    def __init__(self):
+        self._entries = {}
+        self._issues = {}
+
+    def write_entry(self, listing_index, position, entry):
+        self._entries.setdefault(listing_index, []).append((position, entry))
+
+    def complete_listing(self, listing_index, url, issue):
+        if issue:
+            self._issues[listing_index] = issue
+
+    def results(self):
+        """Return (all_fte_data, no_fte_links_urls)"""
+        all_fte_data = []
+        for listing_index in sorted(self._entries):
+            positioned = sorted(self._entries[listing_index], key=lambda item: item[0])
+            all_fte_data.extend(entry for _, entry in positioned)
+        no_fte_links_urls = [self._issues[index] for index in sorted(self._issues)]
+        return all_fte_data, no_fte_links_urls
+
+
+def run_crawl(listing_urls, process_listing, fetch_fte, parse_fte, finish_fte, sink=None,
+              skip=(), frontier=None, **engine_options):
+    """Synchronous entry point; returns (all_fte_data, no_fte_links_urls) when no sink is given"""
+    engine = CrawlEngine(**engine_options)
+    memory_sink = sink is None
+    if memory_sink:
+        sink = MemorySink()
+    asyncio.run(engine.crawl(
+        listing_urls, process_listing, fetch_fte, parse_fte, finish_fte, sink, skip=skip,
+        frontier=frontier
+    ))
+    if memory_sink:
+        return sink.results()
+    return None
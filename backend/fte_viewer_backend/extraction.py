@@ -0,0 +1,256 @@
+import re
+
+# Field mappings for the main FTE table (table[border=1]). Each row's first
+# cell is its key and its second cell its value; the rules below are compiled
+# into lookup tables so every row is visited once and each cell read once.
+
+CNAE_KEY = "Classificação Nacional de Atividades Econômicas"
+
+# Rows that open the CNAE block: a key containing the block title, or the
+# "Agrupamento: | Código:" column header row
+CNAE_HEADER = CNAE_KEY
+CNAE_HEADER_ROW = ("Agrupamento:", "Código:")
+
+# markdown_to_json: keys containing one of these words go to metadata,
+# every other row becomes a section
+METADATA_KEYWORDS = ('código', 'descrição', 'versão', 'data', 'categoria')
+
+# CNAE rows carry their agrupamento in one cell and the code in the other;
+# earlier types win when both appear in a row
+CNAE_TYPES = ('subclasse', 'descritor')
+
+# parse_fte_to_json: exact keys mapped to metadata names
+FIELD_RULES = {
+    "Código:": "codigo",
+    "Descrição:": "descricao",
+    "Versão FTE:": "versao",
+    "Data:": "data",
+}
+
+# parse_fte_to_json: keys that open a description section
+DESCRIPTION_SECTIONS = frozenset([
+    "A descrição compreende:",
+    "A descrição não compreende:",
+])
+
+_METADATA_RE = re.compile('|'.join(re.escape(keyword) for keyword in METADATA_KEYWORDS))
+
+
+def metadata_label(key):
+    """A metadata key with its non-breaking spaces turned into plain spaces"""
+    return key.replace("\xa0", " ")
+
+
+def metadata_value(metadata, label):
+    """Value of the metadata field labelled label, or None.
+
+    Keys come straight from the page, sometimes with a non-breaking space.
+    """
+    value = metadata.get(label)
+    if value is not None:
+        return value
+    for key, value in metadata.items():
+        if metadata_label(key) == label:
+            return value
+    return None
+
+
+def _cnae_row(key, value, key_lower, value_lower):
+    """Return (agrupamento, código) for a CNAE row, or None"""
+    for cnae_type in CNAE_TYPES:
+        if cnae_type in key_lower:
+            return cnae_type, value.strip()
+        if cnae_type in value_lower:
+            return cnae_type, key.strip()
+    return None
+
+
+class FTEExtraction:
+    """Everything the FTE views need, gathered in a single pass over the table rows"""
+
+    def __init__(self, soup):
+        self.soup = soup
+        self._raw_text = None
+        self.table_found = False
+
+        # markdown_to_json view
+        self.metadata = {}
+        self.sections = []
+        self.in_cnae_section = False
+        self.cnae_rows = []
+
+        # parse_fte_to_json view
+        self.fields = {}
+        self.description_sections = []
+
+        table = soup.find('table', {'border': '1'})
+        if table:
+            self.table_found = True
+            self._visit(table)
+
+    @property
+    def raw_text(self):
+        # Whole-page text, computed at most once per page
+        if self._raw_text is None:
+            self._raw_text = self.soup.get_text(separator='\n', strip=True)
+        return self._raw_text
+
+    def _visit(self, table):
+        metadata = self.metadata
+        sections = self.sections
+        cnae_rows = self.cnae_rows
+        fields = self.fields
+        description_sections = self.description_sections
+        sections_by_title = {}
+        in_description = False
+
+        for row in table.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            if len(cells) < 2:
+                continue
+            key = cells[0].get_text(strip=True)
+            value = cells[1].get_text(strip=True)
+            key_lower = key.lower()
+            value_lower = value.lower()
+
+            # CNAE rows are collected wherever they appear; they only count
+            # if a CNAE header shows up somewhere in the table
+            cnae = _cnae_row(key, value, key_lower, value_lower)
+            if cnae:
+                cnae_rows.append(cnae)
+
+            # markdown_to_json rules
+            if CNAE_HEADER in key or (key, value) == CNAE_HEADER_ROW:
+                self.in_cnae_section = True
+            elif _METADATA_RE.search(key_lower):
+                metadata[key] = value
+            else:
+                sections.append({
+                    "title": key,
+                    "content": value,
+                    "items": []
+                })
+
+            # parse_fte_to_json rules
+            field = FIELD_RULES.get(key)
+            if field:
+                fields[field] = value
+            elif key in DESCRIPTION_SECTIONS:
+                in_description = True
+                section = {
+                    "title": key,
+                    "items": []
+                }
+                description_sections.append(section)
+                sections_by_title.setdefault(key, []).append(section)
+            elif in_description:
+                for section in sections_by_title.get(key.replace(":", ""), ()):
+                    section["items"].append(value)
+
+    def cnae_entries(self, describe):
+        """Build the CNAE list, looking up each description with describe(code, cnae_type)"""
+        return [
+            {
+                "agrupamento": cnae_type,
+                "código": code,
+                "descricao": describe(code, cnae_type)
+            }
+            for cnae_type, code in self.cnae_rows
+        ]
+
+    def table_json(self, describe):
+        """The markdown_to_json structure"""
+        json_data = {
+            "metadata": self.metadata,
+            "sections": self.sections,
+            "raw_content": self.raw_text
+        }
+        if self.in_cnae_section:
+            json_data[CNAE_KEY] = self.cnae_entries(describe)
+        return json_data
+
+    def fte_json(self):
+        """The parse_fte_to_json structure"""
+        if not self.table_found:
+            return {"error": "No main table found in FTE content"}
+        return {
+            "metadata": self.fields,
+            "sections": self.description_sections
+        }
+
+
+def extract_fte_content(soup):
+    # Try to find the main content table
+    table = soup.find('table', {'border': '1'})
+    if table:
+        # Extract all text from the table
+        return table.get_text(separator='\n', strip=True)
+    return "Could not extract main content from FTE page"
+
+
+def fte_table_json(soup):
+    """The markdown_to_json record for an FTE page"""
+    extraction = FTEExtraction(soup)
+    # Page text is indexed once instead of rescanned for every CNAE row
+    return extraction.table_json(CnaeDescriptionIndex(extraction.raw_text).describe)
+
+
+class CnaeDescriptionIndex:
+    """Per-page index of CNAE descriptions keyed by (agrupamento, código).
+
+    The page text is tokenized once; the first "type line / code line /
+    description line" triple of each code is recorded, so a repeated code
+    gets the same description as extract_description_from_raw_text gives it.
+    The same code under both Descritor and Subclasse is kept apart.
+    """
+
+    def __init__(self, raw_text):
+        self.raw_text = raw_text
+        self._descriptions = {}
+
+        lines = [line.strip() for line in raw_text.split('\n')]
+        for i in range(len(lines) - 1):
+            line_lower = lines[i].lower()
+            for cnae_type in CNAE_TYPES:
+                if cnae_type not in line_lower:
+                    continue
+                description = lines[i + 2] if i + 2 < len(lines) else ""
+                if description.startswith("Subclasse") or description.startswith("Descritor"):
+                    description = ""
+                self._descriptions.setdefault((cnae_type, lines[i + 1]), description)
+
+    def describe(self, code, cnae_type):
+        """Description of the first entry with this code and agrupamento"""
+        description = self._descriptions.get((cnae_type.lower(), code))
+        if description is None:
+            # Code is not a whole line of the page text; fall back to the substring scan
+            return extract_description_from_raw_text(self.raw_text, code, cnae_type)
+        return description
+
+
+def extract_description_from_raw_text(raw_text, code, cnae_type):
+    """Extract description for a given CNAE code from raw text"""
+    # The format is:
+    # Line 1: Descritor/Subclasse
+    # Line 2: Code
+    # Line 3: Description
+
+    # Split the raw text into lines
+    lines = raw_text.split('\n')
+
+    for i, line in enumerate(lines):
+        line = line.strip()
+        # Look for the type (Descritor/Subclasse)
+        if cnae_type.lower() in line.lower():
+            # Check if the next line contains the code
+            if i + 1 < len(lines):
+                next_line = lines[i + 1].strip()
+                if code in next_line:
+                    # The description is on the line after the code
+                    if i + 2 < len(lines):
+                        description_line = lines[i + 2].strip()
+                        if description_line and not (description_line.startswith("Subclasse") or description_line.startswith("Descritor")):
+                            return description_line
+                    return ""
+
+    return ""
@@ -0,0 +1,252 @@
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import Retry, make_headers
+
+from .rate_limiter import THROTTLE_STATUSES, parse_retry_after
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_TIMEOUT = 30
+
+# Accept-Encoding built from the decoders urllib3 has available here
+# (gzip/deflate always, br when brotli is installed)
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+CHARSET_HEADER_RE = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+CHARSET_META_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+
+def decode_body(content, content_type=None, default='utf-8'):
+    """Decode response bytes using the declared charset (header first, then <meta>)"""
+    charset = None
+    if content_type:
+        match = CHARSET_HEADER_RE.search(content_type)
+        if match:
+            charset = match.group(1)
+    if not charset:
+        match = CHARSET_META_RE.search(content[:4096])
+        if match:
+            charset = match.group(1).decode('ascii', 'ignore')
+    try:
+        return content.decode(charset or default, errors='replace')
+    except LookupError:
+        # Unknown charset name declared by the server
+        return content.decode(default, errors='replace')
+
+
+# Phases of the fetch running on this thread, when it is traced
+_span = threading.local()
+
+
+def _add(field, amount):
+    span = getattr(_span, "fields", None)
+    if span is not None:
+        span[field] = span.get(field, 0) + amount
+
+
+def _note(field, value):
+    span = getattr(_span, "fields", None)
+    if span is not None:
+        span[field] = value
+
+
+class _TimedConnection:
+    """Adds the DNS + TCP connect time and the whole handshake time to the traced fetch"""
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _add("connect_s", time.perf_counter() - start)
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _add("handshake_s", time.perf_counter() - start)
+
+
+class _TimedHTTPConnection(_TimedConnection, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnection, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class PageFetcher:
+    """Long-lived HTTP session with pooled keep-alive connections per host"""
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, max_retries=3, timeout=DEFAULT_TIMEOUT, cache=None,
+                 rate_limiter=None, throttle_retries=3, archive=None, tracer=None):
+        self.timeout = timeout
+        # Optional ResponseCache used for conditional GETs
+        self.cache = cache
+        # Optional RawArchive keeping every body fetch_bytes returns
+        self.archive = archive
+        # Optional Tracer getting a "fetch" span for every fetch_bytes call
+        self.tracer = tracer
+        # Optional RateLimiter paced per host; throttled requests are retried
+        # up to throttle_retries times once the limiter lets them through
+        self.rate_limiter = rate_limiter
+        self.throttle_retries = throttle_retries
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive',
+        })
+        # With a rate limiter, 429/503 and read timeouts must reach get() so the
+        # limiter sees them; urllib3 would otherwise retry them on its own,
+        # sleeping through Retry-After outside the token bucket
+        retry = Retry(
+            total=max_retries,
+            read=False if rate_limiter is not None else None,
+            respect_retry_after_header=rate_limiter is None,
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        if tracer is not None:
+            # Connections that report how long connecting took
+            self.adapter.poolmanager.pool_classes_by_scheme = {
+                "http": _TimedHTTPConnectionPool,
+                "https": _TimedHTTPSConnectionPool,
+            }
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+    def get(self, url, headers=None):
+        """GET url and return the response, raising for HTTP error statuses"""
+        if self.rate_limiter is None:
+            response = self._send(url, headers)
+            response.raise_for_status()
+            return response
+
+        limiter = self.rate_limiter.for_url(url)
+        for attempt in range(self.throttle_retries + 1):
+            start = time.perf_counter()
+            limiter.acquire()
+            _add("wait_s", time.perf_counter() - start)
+            try:
+                response = self._send(url, headers)
+            except requests.exceptions.Timeout:
+                limiter.feedback(None, self.timeout)
+                if attempt == self.throttle_retries:
+                    raise
+                continue
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            limiter.feedback(response.status_code, response.elapsed.total_seconds(), retry_after)
+            if response.status_code not in THROTTLE_STATUSES:
+                break
+        response.raise_for_status()
+        return response
+
+    def _send(self, url, headers):
+        start = time.perf_counter()
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if getattr(_span, "fields", None) is not None:
+            # elapsed stops when the headers are in; the body is read after it
+            elapsed = response.elapsed.total_seconds()
+            _add("ttfb_s", elapsed)
+            _add("download_s", max(0.0, time.perf_counter() - start - elapsed))
+            _add("attempts", 1)
+            _note("status", response.status_code)
+        return response
+
+    def fetch_bytes(self, url):
+        """Return (body, content_type) for url, revalidating cached copies when possible"""
+        if self.tracer is None:
+            body, content_type = self._fetch_bytes(url)
+        else:
+            with self.tracer.span("fetch", url) as fields:
+                _span.fields = fields
+                try:
+                    body, content_type = self._fetch_bytes(url)
+                    fields["bytes"] = len(body)
+                finally:
+                    _span.fields = None
+                    # TLS is whatever the handshake took beyond the TCP connect
+                    handshake = fields.pop("handshake_s", None)
+                    if handshake is not None:
+                        fields["tls_s"] = max(0.0, handshake - fields.get("connect_s", 0.0))
+        if self.archive is not None:
+            self.archive.store(url, body, content_type)
+        return body, content_type
+
+    def _fetch_bytes(self, url):
+        if self.cache is None:
+            response = self.get(url)
+            return response.content, response.headers.get('Content-Type')
+
+        entry = self.cache.lookup(url)
+        if entry:
+            try:
+                if self.cache.is_fresh(entry):
+                    body = self.cache.read_body(url)
+                    self.cache.record("hits")
+                    _note("cache", "hit")
+                    return body, entry["content_type"]
+
+                response = self.get(url, headers=self.cache.conditional_headers(entry))
+                if response.status_code == 304:
+                    body = self.cache.read_body(url)
+                    self.cache.refresh(url)
+                    self.cache.record("not_modified")
+                    _note("cache", "revalidated")
+                    return body, entry["content_type"]
+            except FileNotFoundError:
+                # Evicted between lookup and read; fall back to a plain GET
+                response = self.get(url)
+        else:
+            response = self.get(url)
+
+        self.cache.record("misses")
+        _note("cache", "miss")
+        self.cache.store(url, response.content, response.headers)
+        return response.content, response.headers.get('Content-Type')
+
+    def fetch_text(self, url):
+        """GET url and return its body decoded with the declared charset"""
+        body, content_type = self.fetch_bytes(url)
+        return decode_body(body, content_type)
+
+    def connection_stats(self):
+        """Return how many connections were opened and how many requests reused one"""
+        opened = 0
+        requests_sent = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            requests_sent += pool.num_requests
+        return {
+            "requests": requests_sent,
+            "connections_opened": opened,
+            "connections_reused": max(requests_sent - opened, 0),
+        }
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.save()
+        if self.archive is not None:
+            self.archive.close()
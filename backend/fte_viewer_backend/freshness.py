@@ -0,0 +1,276 @@
+import math
+import os
+import threading
+import time
+
+from .analyze_versions import iter_fte_entries
+from .extraction import metadata_value
+from .frontier import canonical_document_url, canonical_listing_url
+from .incremental import content_hash, fte_key
+from .lineage import codigo_key
+from .serialization import dumps, loads, write_json
+
+DEFAULT_FRESHNESS_FILE = "fte_freshness.json"
+
+# Bumped when the state layout changes; an older state is started over
+FRESHNESS_VERSION = 1
+
+DAY = 24 * 60 * 60
+MIN_REVISIT_DAYS = 1
+MAX_REVISIT_DAYS = 90
+
+# Change rate assumed before anything has been observed: once a month
+DEFAULT_CHANGE_RATE = 1 / (30 * DAY)
+
+# Weight, in changes, of the rate a page starts from (its category's, or
+# DEFAULT_CHANGE_RATE): a couple of observed changes outweigh it
+PRIOR_CHANGES = 1.0
+
+# Share of a budget kept for documents first linked during the run
+DISCOVERY_RESERVE = 0.1
+
+
+def estimate_rate(changes, observed_seconds, prior_rate):
+    """Changes per second from `changes` seen over `observed_seconds` of fetches.
+
+    The mean of a Gamma posterior: prior_rate counts as PRIOR_CHANGES
+    changes, so a page fetched twice without changing is not taken to
+    never change, and a long history wins over the prior.
+    """
+    return (changes + PRIOR_CHANGES) / (observed_seconds + PRIOR_CHANGES / prior_rate)
+
+
+def revisit_interval(rate):
+    """Seconds between visits for a change rate, within MIN/MAX_REVISIT_DAYS"""
+    return min(max(1 / rate, MIN_REVISIT_DAYS * DAY), MAX_REVISIT_DAYS * DAY)
+
+
+def code_family(codigo):
+    """"21 – 5" and "21-47" are both family "21": CONAMA-related FTEs change together"""
+    key = codigo_key(codigo)
+    return key.split("-")[0] if key else ""
+
+
+def _links_hash(links, listing_url):
+    # A listing page changes when the documents it links do, not its markup
+    return content_hash("\n".join(fte_key(canonical_document_url(href, listing_url))
+                                  for href in links))
+
+
+class FreshnessState:
+    """When each listing page and FTE document was fetched and last changed.
+
+    Kept in fte_freshness.json across crawls. Each page records its first
+    and last fetch, last change, fetch and change counts and the hash
+    changes are detected with: the linked documents for a listing page,
+    the parsed record for a document (so markup-only edits do not count).
+    Listing pages also keep their links, so a crawl that skips them can
+    still reach their documents.
+    """
+
+    def __init__(self, path=DEFAULT_FRESHNESS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        state = {}
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                state = loads(f.read())
+        if state.get("version") != FRESHNESS_VERSION:
+            state = {}
+        self.listings = state.get("listings", {})
+        self.documents = state.get("documents", {})
+
+    def _observe(self, table, key, url, digest, now, **fields):
+        """Record a fetch of table[key]; returns True when its content changed"""
+        now = time.time() if now is None else now
+        with self._lock:
+            record = table.get(key)
+            if record is None:
+                record = table[key] = {"url": url, "first_fetched": now, "last_changed": now,
+                                       "fetches": 0, "changes": 0}
+                changed = False
+            else:
+                changed = record["hash"] != digest
+                if changed:
+                    record["changes"] += 1
+                    record["last_changed"] = now
+            record.update(url=url, hash=digest, last_fetched=now, **fields)
+            record["fetches"] += 1
+        return changed
+
+    def observe_listing(self, url, links, now=None):
+        url = canonical_listing_url(url)
+        return self._observe(self.listings, url, url, _links_hash(links, url), now,
+                             links=list(links))
+
+    def observe_document(self, url, data, now=None):
+        codigo = metadata_value(data.get("metadata", {}), "Código:")
+        return self._observe(self.documents, fte_key(url), url, content_hash(dumps(data)), now,
+                             codigo=codigo)
+
+    def _family_rates(self):
+        # Pooled over every document of a family, then over all documents
+        totals = {}
+        for record in self.documents.values():
+            observed = record["last_fetched"] - record["first_fetched"]
+            for family in {"", code_family(record.get("codigo"))}:
+                changes, seconds = totals.get(family, (0, 0.0))
+                totals[family] = (changes + record["changes"], seconds + observed)
+        overall = estimate_rate(*totals.get("", (0, 0.0)), DEFAULT_CHANGE_RATE)
+        return {family: estimate_rate(changes, seconds, overall) if family else overall
+                for family, (changes, seconds) in totals.items()}
+
+    def schedule(self, listing_urls, now=None):
+        """Every listing page of this crawl and every document they link, most urgent first.
+
+        Each item has its estimated change rate, revisit interval, age and
+        priority: the probability that it changed since it was last
+        fetched. Pages never fetched come first, listing pages before
+        documents since they lead to more documents.
+        """
+        now = time.time() if now is None else now
+        listing_rate = estimate_rate(
+            sum(record["changes"] for record in self.listings.values()),
+            sum(record["last_fetched"] - record["first_fetched"]
+                for record in self.listings.values()),
+            DEFAULT_CHANGE_RATE,
+        )
+        family_rates = self._family_rates()
+
+        items = []
+        documents = {}
+        for url in listing_urls:
+            url = canonical_listing_url(url)
+            record = self.listings.get(url)
+            items.append(self._item("listing", url, url, record, listing_rate, now))
+            for href in (record or {}).get("links", ()):
+                document_url = canonical_document_url(href, url)
+                documents.setdefault(fte_key(document_url), document_url)
+        for key, url in documents.items():
+            record = self.documents.get(key)
+            prior = family_rates.get(code_family((record or {}).get("codigo")),
+                                     family_rates.get("", DEFAULT_CHANGE_RATE))
+            items.append(self._item("document", key, url, record, prior, now))
+
+        items.sort(key=lambda item: (item["age_days"] is not None, -item["priority"],
+                                     item["kind"] != "listing", item["key"]))
+        return items
+
+    @staticmethod
+    def _item(kind, key, url, record, prior_rate, now):
+        item = {"kind": kind, "key": key, "url": url}
+        if record is None:
+            interval = revisit_interval(prior_rate)
+            return {**item, "rate_per_day": prior_rate * DAY, "interval_days": interval / DAY,
+                    "age_days": None, "priority": 1.0, "due": True}
+        rate = estimate_rate(record["changes"], record["last_fetched"] - record["first_fetched"],
+                             prior_rate)
+        interval = revisit_interval(rate)
+        age = max(0.0, now - record["last_fetched"])
+        return {
+            **item,
+            "rate_per_day": rate * DAY,
+            "interval_days": interval / DAY,
+            "age_days": age / DAY,
+            "priority": 1 - math.exp(-rate * age),
+            "due": age >= interval,
+        }
+
+    def plan(self, listing_urls, budget=None, now=None, reserve=DISCOVERY_RESERVE,
+             data_file="all_fte_data.json"):
+        """CrawlPlan spending at most `budget` requests on the pages due for a visit.
+
+        Pages are due once their revisit interval has passed, and the most
+        urgent come first. A `reserve` share of the budget is kept for
+        documents first linked during the run; what the plan leaves unused
+        goes to them as well. Without a budget every page is fetched.
+        """
+        items = self.schedule(listing_urls, now)
+        if budget is None:
+            planned, spare = items, None
+        else:
+            reserved = min(budget, int(budget * reserve))
+            planned = [item for item in items if item["due"]][:budget - reserved]
+            spare = budget - len(planned)
+        return CrawlPlan(self, items, planned, spare, data_file)
+
+    def prune(self, listing_urls):
+        """Forget documents no listing page of the crawl links any more"""
+        linked = set()
+        for url in listing_urls:
+            record = self.listings.get(canonical_listing_url(url))
+            for href in (record or {}).get("links", ()):
+                linked.add(fte_key(canonical_document_url(href, record["url"])))
+        with self._lock:
+            for key in [key for key in self.documents if key not in linked]:
+                del self.documents[key]
+
+    def save(self):
+        write_json(self.path, {"version": FRESHNESS_VERSION, "listings": self.listings,
+                               "documents": self.documents}, pretty=True)
+
+
+class CrawlPlan:
+    """Pages a budgeted crawl fetches; the rest is taken from the previous run.
+
+    A listing page left out is replayed from the links it had last time,
+    a document left out reuses its entry from the previous
+    all_fte_data.json. Documents first linked during the run are fetched
+    while the spare budget lasts and deferred to a later run after that.
+    """
+
+    def __init__(self, state, items, planned, spare, data_file="all_fte_data.json"):
+        self.state = state
+        self.items = items
+        self.planned = planned
+        self.spare = spare
+        self._lock = threading.Lock()
+        self._listings = {item["key"] for item in planned if item["kind"] == "listing"}
+        self._documents = {item["key"] for item in planned if item["kind"] == "document"}
+        self.previous = {}
+        if spare is not None and os.path.exists(data_file):
+            for entry in iter_fte_entries(data_file):
+                self.previous.setdefault(fte_key(entry["url"]), entry["data"])
+        self.stats = {"listings_fetched": 0, "listings_replayed": 0, "listings_deferred": 0,
+                      "documents_fetched": 0, "documents_reused": 0, "documents_deferred": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def listing_links(self, url):
+        """None if the listing page is to be fetched, else its links from the last run.
+
+        A listing page never fetched before and left out of the plan has no links yet.
+        """
+        url = canonical_listing_url(url)
+        if self.spare is None or url in self._listings:
+            self._count("listings_fetched")
+            return None
+        record = self.state.listings.get(url)
+        if record is None:
+            self._count("listings_deferred")
+            return []
+        self._count("listings_replayed")
+        return record["links"]
+
+    def document(self, url):
+        """Return (fetch, data): whether to fetch the document, and its previous data if not.
+
+        data is None when the document is deferred: it is left out of this run.
+        """
+        key = fte_key(url)
+        if self.spare is None or key in self._documents:
+            self._count("documents_fetched")
+            return True, None
+        data = self.previous.get(key)
+        if data is not None:
+            self._count("documents_reused")
+            return False, data
+        with self._lock:
+            if self.spare > 0:
+                self.spare -= 1
+                self.stats["documents_fetched"] += 1
+                return True, None
+            self.stats["documents_deferred"] += 1
+        return False, None
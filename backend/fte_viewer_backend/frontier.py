@@ -0,0 +1,124 @@
+import json
+import threading
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from .incremental import fte_key
+
+DEFAULT_REFERENCES_FILE = "fte_references.json"
+
+# Plone prefixes copies of a page with this; the copy lists the same FTEs
+COPY_PREFIX = "copy_of_"
+
+
+def canonical_listing_url(url):
+    """Listing page URL without query, fragment or trailing slash, host lowercased"""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, "", ""))
+
+
+def canonical_document_url(href, page_url=None):
+    """Absolute SEI document URL for a link found on page_url, without fragment.
+
+    The query (id_documento, id_acesso_externo, infra_hash) is kept as
+    linked, since SEI needs all of it; documents are told apart by fte_key.
+    """
+    url = urljoin(page_url, href.strip()) if page_url else href.strip()
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ""))
+
+
+def dedupe_listing_urls(urls):
+    """Canonical listing URLs in first-seen order, without repeats or copy_of_ variants.
+
+    A copy_of_<slug> page is dropped when <slug> is also listed; returns
+    (urls, dropped).
+    """
+    canonical = [canonical_listing_url(url) for url in urls]
+    present = set(canonical)
+    kept = []
+    dropped = []
+    seen = set()
+    for url in canonical:
+        parent, _, slug = url.rpartition("/")
+        original = f"{parent}/{slug[len(COPY_PREFIX):]}" if slug.startswith(COPY_PREFIX) else None
+        if url in seen or original in present:
+            dropped.append(url)
+            continue
+        seen.add(url)
+        kept.append(url)
+    return kept, dropped
+
+
+def listing_links(soup, index_url):
+    """Listing pages linked from the lista-de-todas-as-ftes index page, in page order.
+
+    Only links one path segment below the index are kept, which leaves out
+    navigation, breadcrumbs and links to other parts of gov.br.
+    """
+    base = canonical_listing_url(index_url) + "/"
+    urls = []
+    for link in soup.find_all('a'):
+        href = link.get('href')
+        if not href:
+            continue
+        url = canonical_listing_url(urljoin(base, href))
+        slug = url[len(base):] if url.startswith(base) else ""
+        if slug and "/" not in slug and not slug.startswith("@@"):
+            urls.append(url)
+    return dedupe_listing_urls(urls)[0]
+
+
+class Frontier:
+    """Documents reached in one crawl, keyed by SEI id_documento.
+
+    The crawl engine claims each document link: the first claim of a
+    document fetches it, later ones (from other listing pages, or with a
+    different infra_hash) reuse that fetch.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.documents = {}
+        self.links = 0
+
+    def claim(self, href, listing_url):
+        """Return (url, key, first) for a document link found on listing_url"""
+        url = canonical_document_url(href, listing_url)
+        key = fte_key(url)
+        with self._lock:
+            self.links += 1
+            first = key not in self.documents
+            if first:
+                self.documents[key] = url
+        return url, key, first
+
+    def stats(self):
+        return {
+            "links": self.links,
+            "documents": len(self.documents),
+            "duplicates": self.links - len(self.documents),
+        }
+
+
+def document_references(records, listing_urls):
+    """{id: {"url", "listings"}}: every listing page that linked each document.
+
+    records are the crawl's JSONL records, listing_urls the crawled pages
+    in listing-index order; listings are given in that order.
+    """
+    references = {}
+    for record in records:
+        if "entry" not in record:
+            continue
+        url = record["entry"]["url"]
+        reference = references.setdefault(fte_key(url), {"url": url, "listings": set()})
+        reference["listings"].add(record["listing"])
+    for reference in references.values():
+        reference["listings"] = [listing_urls[index] for index in sorted(reference["listings"])]
+    return references
+
+
+def write_references(references, output_path=DEFAULT_REFERENCES_FILE):
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(references, f, indent=2, ensure_ascii=False)
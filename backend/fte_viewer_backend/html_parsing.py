@@ -0,0 +1,23 @@
+import importlib.util
+
+PARSERS = ('lxml', 'html.parser')
+
+# lxml is the fast path; html.parser stays available as the pure-Python fallback.
+# Only the package's presence is checked here so importing this module stays cheap.
+DEFAULT_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+# Listing pages are only searched for FTE anchors (plus the title for debug info),
+# so the rest of the gov.br page is never turned into a tree
+LISTING_TAGS = ['a', 'title']
+
+
+def make_soup(html, parser=DEFAULT_PARSER, parse_only=None):
+    """Build a BeautifulSoup tree with the selected backend, optionally scoped"""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, parser, parse_only=parse_only)
+
+
+def listing_strainer():
+    """SoupStrainer keeping only what find_fte_links and the debug info read"""
+    from bs4 import SoupStrainer
+    return SoupStrainer(LISTING_TAGS)
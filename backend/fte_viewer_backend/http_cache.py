@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .frontier import canonical_document_url
+from .incremental import fte_key
+
+DEFAULT_CACHE_DIR = ".http_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+INDEX_FILE = "index.json"
+
+
+class ResponseCache:
+    """Persistent on-disk response cache with validators and LRU eviction.
+
+    Bodies live in one file per document; the index keeps the validators
+    (ETag / Last-Modified), sizes and access times used for eviction.
+    SEI documents are keyed by fte_key, so a link whose infra_hash changed
+    between crawls still finds (and revalidates) the cached copy.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, max_age=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # When set, entries younger than max_age seconds are served without
+        # touching the network (useful for offline replays)
+        self.max_age = max_age
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._index = self._load_index()
+
+    def _index_path(self):
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, key + ".body")
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def record(self, outcome):
+        """Count a cache outcome for the run summary"""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    @staticmethod
+    def key_for(url):
+        return hashlib.sha256(fte_key(canonical_document_url(url)).encode('utf-8')).hexdigest()
+
+    def lookup(self, url):
+        """Return the index entry for url, or None if it is not cached"""
+        key = self.key_for(url)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry and not os.path.exists(self._body_path(key)):
+                # Body was removed behind our back
+                del self._index[key]
+                entry = None
+            return dict(entry) if entry else None
+
+    def is_fresh(self, entry):
+        """True when max_age is set and the entry is young enough to skip revalidation"""
+        if self.max_age is None:
+            return False
+        return time.time() - entry["stored_at"] <= self.max_age
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read_body(self, url):
+        """Read the cached body for url and mark it as recently used"""
+        key = self.key_for(url)
+        with open(self._body_path(key), 'rb') as f:
+            body = f.read()
+        with self._lock:
+            if key in self._index:
+                self._index[key]["last_access"] = time.time()
+        return body
+
+    def store(self, url, body, headers):
+        """Save a 200 response body with its validators, evicting old entries if needed"""
+        key = self.key_for(url)
+        path = self._body_path(key)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        with self._lock:
+            self._index[key] = {
+                "url": url,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "content_type": headers.get("Content-Type"),
+                "size": len(body),
+                "stored_at": now,
+                "last_access": now,
+            }
+            self._evict()
+
+    def refresh(self, url):
+        """Record a successful revalidation (304) for url"""
+        key = self.key_for(url)
+        with self._lock:
+            if key in self._index:
+                self._index[key]["stored_at"] = time.time()
+
+    def _evict(self):
+        # Caller holds the lock
+        total = sum(entry["size"] for entry in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._body_path(key))
+            except FileNotFoundError:
+                pass
+            total -= entry["size"]
+            del self._index[key]
+            self.stats["evictions"] += 1
+
+    def save(self):
+        """Write the index to disk"""
+        with self._lock:
+            data = json.dumps(self._index)
+        tmp_path = self._index_path() + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self._index_path())
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import threading
+from urllib.parse import urlparse, parse_qs
+
+DEFAULT_STATE_FILE = "fte_content_hashes.json"
+DEFAULT_DELTA_FILE = "fte_delta.json"
+
+
+def fte_key(url):
+    """Stable key for an FTE document: its SEI id_documento, or the URL itself"""
+    query = parse_qs(urlparse(url).query)
+    id_documento = query.get('id_documento')
+    if id_documento and id_documento[0]:
+        return id_documento[0]
+    return url
+
+
+def content_hash(content):
+    """sha256 of a fetched page, given as raw bytes or decoded text"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+class IncrementalState:
+    """Previously parsed FTEs keyed by document, with the hash of the HTML they came from"""
+
+    def __init__(self, data_file="all_fte_data.json", state_file=DEFAULT_STATE_FILE):
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self.previous_hashes = _load_json(state_file, {})
+        self.previous_records = {}
+        self.previous_urls = {key: info["url"] for key, info in self.previous_hashes.items()}
+        for entry in _load_json(data_file, []):
+            key = fte_key(entry["url"])
+            self.previous_records[key] = entry["data"]
+            self.previous_urls.setdefault(key, entry["url"])
+        self.hashes = {}
+        # Documents reused without a fetch and without a previous hash
+        self.kept = set()
+        self.added = []
+        self.changed = []
+        self.reused = 0
+
+    def lookup(self, url, digest):
+        """Return the previously parsed data if the document's content is unchanged"""
+        key = fte_key(url)
+        if self.previous_hashes.get(key, {}).get("hash") != digest:
+            return None
+        data = self.previous_records.get(key)
+        if data is not None:
+            with self._lock:
+                self.hashes[key] = {"url": url, "hash": digest}
+                self.reused += 1
+        return data
+
+    def keep(self, url):
+        """Carry over a document reused without fetching it (crawl --budget), unchanged"""
+        key = fte_key(url)
+        with self._lock:
+            if key in self.hashes or key in self.kept:
+                return
+            previous = self.previous_hashes.get(key)
+            if previous is None:
+                self.kept.add(key)
+            else:
+                self.hashes[key] = {"url": url, "hash": previous["hash"]}
+            self.reused += 1
+
+    def record(self, url, digest, data):
+        """Register a freshly parsed document as added or changed"""
+        key = fte_key(url)
+        with self._lock:
+            if key in self.hashes:
+                return
+            self.hashes[key] = {"url": url, "hash": digest}
+            if key not in self.previous_urls:
+                self.added.append({"id": key, "url": url})
+            elif self.previous_records.get(key) != data:
+                # New HTML that parses to the same record is not a change
+                self.changed.append({"id": key, "url": url})
+
+    def delta(self):
+        seen = set(self.hashes) | self.kept
+        removed = [
+            {"id": key, "url": url}
+            for key, url in self.previous_urls.items()
+            if key not in seen
+        ]
+        return {
+            "added": self.added,
+            "changed": self.changed,
+            "removed": removed,
+        }
+
+    def save(self, delta_file=DEFAULT_DELTA_FILE):
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(self.hashes, f, indent=2, ensure_ascii=False)
+        delta = self.delta()
+        with open(delta_file, 'w', encoding='utf-8') as f:
+            json.dump(delta, f, indent=2, ensure_ascii=False)
+        return delta
+
+
+def _load_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return default
@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+
+from .serialization import dumps, loads
+
+DEFAULT_JSONL_FILE = "all_fte_data.jsonl"
+DEFAULT_CHECKPOINT_FILE = "crawl_checkpoint.jsonl"
+
+
+def load_checkpoint(checkpoint_path=DEFAULT_CHECKPOINT_FILE, listing_urls=None):
+    """Return {listing_index: url} for every listing recorded as done.
+
+    With listing_urls, a listing counts as done only if the URL at its
+    index is still the one checkpointed.
+    """
+    done = {}
+    for record in _read_jsonl(checkpoint_path):
+        done[record["listing"]] = record["url"]
+    if listing_urls is not None:
+        done = {index: url for index, url in done.items()
+                if index < len(listing_urls) and listing_urls[index] == url}
+    return done
+
+
+class JsonlSink:
+    """Append parsed FTEs to a JSONL file and checkpoint finished listing pages.
+
+    Every line carries the listing index and link position it came from, so
+    finalize() can restore the serial crawl order. A listing is recorded in
+    the checkpoint file (and fsync'd) only after all of its lines are on disk.
+
+    On resume, listings whose URL changed since they were checkpointed
+    (listing_urls given) are crawled again like unfinished ones.
+    """
+
+    def __init__(self, jsonl_path=DEFAULT_JSONL_FILE, checkpoint_path=DEFAULT_CHECKPOINT_FILE,
+                 resume=False, listing_urls=None):
+        self.jsonl_path = jsonl_path
+        self.checkpoint_path = checkpoint_path
+        self.entries_written = 0
+        self._lock = threading.Lock()
+        if resume:
+            # A line torn by the interrupted run would swallow the first line appended after it
+            for path in (jsonl_path, checkpoint_path):
+                _truncate_torn_tail(path)
+            self.done = load_checkpoint(checkpoint_path, listing_urls)
+            # Drop lines of listings that never reached the checkpoint, or whose
+            # URL changed since; they are crawled again
+            _filter_jsonl(checkpoint_path,
+                          lambda record: self.done.get(record["listing"]) == record["url"])
+            _filter_jsonl(jsonl_path, lambda record: record["listing"] in self.done)
+        else:
+            self.done = {}
+            for path in (jsonl_path, checkpoint_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        self._data_file = open(jsonl_path, 'a', encoding='utf-8')
+        self._checkpoint_file = open(checkpoint_path, 'a', encoding='utf-8')
+
+    def write_entry(self, listing_index, position, entry):
+        # entry may be an FTERecord; it is written as the plain entry
+        line = dumps({"listing": listing_index, "position": position, "entry": entry})
+        with self._lock:
+            self._data_file.write(line + "\n")
+            self._data_file.flush()
+            self.entries_written += 1
+
+    def complete_listing(self, listing_index, url, issue):
+        with self._lock:
+            if issue:
+                line = dumps({"listing": listing_index, "issue": issue})
+                self._data_file.write(line + "\n")
+            self._data_file.flush()
+            os.fsync(self._data_file.fileno())
+
+            self._checkpoint_file.write(json.dumps({"listing": listing_index, "url": url}) + "\n")
+            self._checkpoint_file.flush()
+            os.fsync(self._checkpoint_file.fileno())
+            self.done[listing_index] = url
+
+    def close(self):
+        self._data_file.close()
+        self._checkpoint_file.close()
+
+
+def finalize(jsonl_path=DEFAULT_JSONL_FILE, output_path="all_fte_data.json",
+             debug_path="no_fte_links_debug.json"):
+    """Compact the JSONL file into the all_fte_data.json array the frontend expects.
+
+    Only the sort keys and file offsets are held in memory; each record is
+    re-read and written straight to the output. The result is byte-identical
+    to json.dump(all_fte_data, f, indent=2, ensure_ascii=False).
+    Returns (entry_count, issues).
+    """
+    entry_offsets = []
+    issues = []
+    with open(jsonl_path, 'rb') as f:
+        offset = f.tell()
+        line = f.readline()
+        while line:
+            record = _parse_line(line)
+            if record is not None:
+                if "entry" in record:
+                    entry_offsets.append((record["listing"], record["position"], offset))
+                elif "issue" in record:
+                    issues.append((record["listing"], record["issue"]))
+            offset = f.tell()
+            line = f.readline()
+    entry_offsets.sort()
+
+    tmp_path = output_path + ".tmp"
+    with open(jsonl_path, 'rb') as source, open(tmp_path, 'w', encoding='utf-8') as out:
+        if not entry_offsets:
+            out.write("[]")
+        else:
+            out.write("[\n")
+            for i, (_, _, offset) in enumerate(entry_offsets):
+                source.seek(offset)
+                entry = loads(source.readline())["entry"]
+                dumped = dumps(entry, pretty=True)
+                if i:
+                    out.write(",\n")
+                out.write("  " + dumped.replace("\n", "\n  "))
+            out.write("\n]")
+    os.replace(tmp_path, output_path)
+
+    issues = [issue for _, issue in sorted(issues, key=lambda item: item[0])]
+    if issues:
+        with open(debug_path, 'w', encoding='utf-8') as f:
+            json.dump(issues, f, indent=2, ensure_ascii=False)
+    return len(entry_offsets), issues
+
+
+def read_records(jsonl_path=DEFAULT_JSONL_FILE):
+    """Yield the records of a JSONL file in completion order, skipping a torn last line"""
+    return _read_jsonl(jsonl_path)
+
+
+def read_entries(jsonl_path=DEFAULT_JSONL_FILE):
+    """Yield the FTE entries of a JSONL file one at a time, in completion order"""
+    for record in _read_jsonl(jsonl_path):
+        if "entry" in record:
+            yield record["entry"]
+
+
+def _parse_line(line):
+    try:
+        return loads(line)
+    except ValueError:
+        # Torn last line from an interrupted run
+        return None
+
+
+def _read_jsonl(path):
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        for line in f:
+            record = _parse_line(line)
+            if record is not None:
+                yield record
+
+
+def _truncate_torn_tail(path):
+    # Cut the file after its last newline: a write interrupted mid-line leaves a partial record
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        while end:
+            start = max(0, end - 65536)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        if end != size:
+            f.truncate(end)
+
+
+def _filter_jsonl(path, keep):
+    if not os.path.exists(path):
+        return
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        for record in _read_jsonl(path):
+            if keep(record):
+                out.write(dumps(record) + "\n")
+    os.replace(tmp_path, path)
@@ -0,0 +1,147 @@
+import json
+import re
+
+from .extraction import CNAE_KEY, metadata_label, metadata_value
+from .incremental import fte_key
+
+DEFAULT_LINEAGE_FILE = "fte_lineage.json"
+
+# Bumped when the artifact layout changes, so the viewer can ignore a
+# lineage it does not understand and fall back to grouping the index itself
+LINEAGE_VERSION = 1
+
+_NUMBER_RE = re.compile(r"\d+")
+
+
+def codigo_key(codigo):
+    """"18 – 13", "18-13" and "18.13" all become "18-13\""""
+    if not codigo:
+        return None
+    return "-".join(_NUMBER_RE.findall(codigo)) or None
+
+
+def version_key(versao):
+    """Sort key for a version such as "1.10": its numbers, so 1.9 < 1.10 < 2.0.
+
+    Versions without a number sort first.
+    """
+    if not versao:
+        return ()
+    return tuple(int(number) for number in _NUMBER_RE.findall(versao))
+
+
+def versao_key(versao):
+    """version_key as text that sorts the same way (for SQL): each number zero padded"""
+    if not versao:
+        return None
+    return ".".join(f"{number:06d}" for number in version_key(versao)) or None
+
+
+def diff_entries(previous, current):
+    """Field-level changes between two versions' data, empty parts left out.
+
+    Metadata fields are named, sections are matched by title and CNAE
+    entries by code; the version number itself and raw_content are not compared.
+    """
+    changes = {}
+
+    # Keys are compared as labels, so 'Versão\xa0FTE:' and 'Versão FTE:' are one field
+    old_metadata = {metadata_label(key): value
+                    for key, value in previous.get("metadata", {}).items()}
+    new_metadata = {metadata_label(key): value
+                    for key, value in current.get("metadata", {}).items()}
+    changed = [key for key in {**old_metadata, **new_metadata}
+               if key != "Versão FTE:" and old_metadata.get(key) != new_metadata.get(key)]
+    if changed:
+        changes["metadata"] = changed
+
+    old_sections = {section.get("title", ""): section for section in previous.get("sections", [])}
+    new_sections = {section.get("title", ""): section for section in current.get("sections", [])}
+    sections = {
+        "added": [title for title in new_sections if title not in old_sections],
+        "removed": [title for title in old_sections if title not in new_sections],
+        "changed": [title for title, section in new_sections.items()
+                    if title in old_sections and old_sections[title] != section],
+    }
+    sections = {kind: titles for kind, titles in sections.items() if titles}
+    if sections:
+        changes["sections"] = sections
+
+    old_cnae = {cnae.get("código"): cnae for cnae in previous.get(CNAE_KEY, [])}
+    new_cnae = {cnae.get("código"): cnae for cnae in current.get(CNAE_KEY, [])}
+    cnae = {
+        "added": [code for code in new_cnae if code not in old_cnae],
+        "removed": [code for code in old_cnae if code not in new_cnae],
+        "changed": [code for code, item in new_cnae.items()
+                    if code in old_cnae and old_cnae[code] != item],
+    }
+    cnae = {kind: codes for kind, codes in cnae.items() if codes}
+    if cnae:
+        changes["cnae"] = cnae
+    return changes
+
+
+def build_lineage(entries):
+    """código -> its versions, oldest first, with a latest pointer and the changes of each version.
+
+    Codes are grouped by codigo_key, so "10–4" and "10 – 4" are one code;
+    a document linked from several listing pages counts once. Each version
+    records its position in fte_index.json (the first, for repeated
+    documents) so the viewer can find its summary without a lookup table.
+    """
+    codes = {}
+    seen = set()
+    for position, entry in enumerate(entries):
+        fte_id = fte_key(entry["url"])
+        if fte_id in seen:
+            continue
+        seen.add(fte_id)
+        metadata = entry.get("data", {}).get("metadata", {})
+        key = codigo_key(metadata_value(metadata, "Código:"))
+        if key is None:
+            continue
+        codes.setdefault(key, []).append((position, entry))
+
+    lineage = {}
+    for key, versions in codes.items():
+        versions.sort(key=lambda version: (version_key(_versao(version[1])),
+                                           fte_key(version[1]["url"])))
+        records = []
+        previous = None
+        for position, entry in versions:
+            data = entry.get("data", {})
+            metadata = data.get("metadata", {})
+            record = {
+                "id": fte_key(entry["url"]),
+                "version": metadata_value(metadata, "Versão FTE:"),
+                "position": position,
+                "url": entry["url"],
+                "descricao": metadata_value(metadata, "Descrição:"),
+            }
+            if previous is not None:
+                record["changes"] = diff_entries(previous, data)
+            records.append(record)
+            previous = data
+        first_metadata = versions[0][1].get("data", {}).get("metadata", {})
+        lineage[key] = {
+            "codigo": metadata_value(first_metadata, "Código:"),
+            "latest": records[-1]["id"],
+            "versions": records,
+        }
+    return {
+        "version": LINEAGE_VERSION,
+        "codes": dict(sorted(lineage.items(), key=lambda item: version_key(item[0]))),
+    }
+
+
+def load_lineage(path=DEFAULT_LINEAGE_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        lineage = json.load(f)
+    if lineage.get("version") != LINEAGE_VERSION:
+        raise ValueError(f"{path} has lineage version {lineage.get('version')}, "
+                         f"expected {LINEAGE_VERSION}")
+    return lineage
+
+
+def _versao(entry):
+    return metadata_value(entry.get("data", {}).get("metadata", {}), "Versão FTE:")
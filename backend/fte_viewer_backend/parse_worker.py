@@ -0,0 +1,83 @@
+import os
+import time
+
+from .archive import read_object
+from .extraction import extract_fte_content, fte_table_json
+from .fetcher import decode_body
+from .html_parsing import make_soup, DEFAULT_PARSER
+
+# cProfile profiler of this worker process, while the parse stage is profiled,
+# and the directory its stats are written to
+_profiler = None
+_profile_dir = None
+
+
+def parse_fte_page(body, content_type=None, parser=DEFAULT_PARSER):
+    """Parse raw FTE page bytes into the markdown_to_json record.
+
+    Runs in the parse process pool, so it only takes and returns plain,
+    picklable values: the table text used for display and the record.
+    """
+    soup = make_soup(decode_body(body, content_type), parser)
+    return {
+        "content": extract_fte_content(soup),
+        "data": fte_table_json(soup),
+    }
+
+
+def traced_parse_fte_page(body, content_type=None, parser=DEFAULT_PARSER, profile_dir=None):
+    """parse_fte_page that also returns how long each step took, under "timing".
+
+    With profile_dir, the parse runs under cProfile and each worker process
+    writes its cumulated stats to profile_dir/parse-<pid>.prof when it exits
+    (or when dump_profile() is called).
+    """
+    global _profiler, _profile_dir
+
+    if profile_dir is not None and _profiler is None:
+        import cProfile
+        from multiprocessing.util import Finalize
+        _profiler = cProfile.Profile()
+        _profile_dir = profile_dir
+        # Pool workers run their finalizers when the pool shuts them down
+        Finalize(None, dump_profile, exitpriority=10)
+    profiler = _profiler if profile_dir is not None else None
+
+    if profiler is not None:
+        profiler.enable()
+    try:
+        start = time.perf_counter()
+        soup = make_soup(decode_body(body, content_type), parser)
+        built = time.perf_counter()
+        content = extract_fte_content(soup)
+        extracted = time.perf_counter()
+        data = fte_table_json(soup)
+        done = time.perf_counter()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    return {
+        "content": content,
+        "data": data,
+        "timing": {
+            "seconds": done - start,
+            "soup_s": built - start,
+            "content_s": extracted - built,
+            "table_s": done - extracted,
+        },
+    }
+
+
+def dump_profile():
+    """Write this process's parse profile, once; the crawl calls it when parsing in-process"""
+    global _profiler
+
+    if _profiler is None:
+        return
+    profiler, _profiler = _profiler, None
+    profiler.dump_stats(os.path.join(_profile_dir, f"parse-{os.getpid()}.prof"))
+
+
+def parse_archived_page(path, content_type=None, parser=DEFAULT_PARSER):
+    """parse_fte_page for a body in the raw archive; the worker reads and decompresses it"""
+    return parse_fte_page(read_object(path), content_type, parser)
@@ -0,0 +1,153 @@
+import os
+
+from .cnae_index import build_cnae_index, DEFAULT_CNAE_FILE
+from .extraction import CNAE_KEY
+from .incremental import fte_key
+from .lineage import build_lineage, DEFAULT_LINEAGE_FILE
+from .search_index import build_search_index, DEFAULT_SEARCH_FILE
+from .serialization import dumps, loads
+
+DEFAULT_INDEX_FILE = "fte_index.json"
+DEFAULT_DETAIL_DIR = "fte"
+
+# Mirrors FTE_CODE_CATEGORIES in src/App.js, with codes written "18-5"
+# instead of "18 – 5"; the first category listing a code wins, as in getFteCategory.
+# Not published: the viewer categorizes codes itself, the service filters with it
+FTE_CODE_CATEGORIES = {
+    "Abastecimento de combustíveis": ["18-5", "18-6"],
+    "Agrotóxicos": ["15-11", "17-61", "18-66", "18-80", "21-5", "21-47", "21-66"],
+    "Biotecnologia": ["20-5", "20-35", "20-37", "21-51", "21-66"],
+    "Criação amadorista de passeriformes": ["21-60"],
+    "Convenção de Basileia": ["18-79", "21-40"],
+    "Energia Elétrica": ["17-1", "21-34", "21-35", "21-36", "21-37", "21-46"],
+    "Empreendimentos - Instalação": [
+        "21-75", "22-1", "22-2", "22-3", "22-4", "22-5", "22-6", "22-7", "22-8",
+    ],
+    "Fauna": [
+        "10-1", "10-2", "16-15", "20-5", "20-21", "20-23", "20-25", "20-81", "21-52", "21-53",
+        "21-55", "21-56", "21-60", "21-71", "21-72",
+    ],
+    "Fauna doméstica": ["10-1", "10-2", "16-2", "21-74"],
+    "Fauna sinantrópica": ["21-59"],
+    "Fauna invasora": ["20-26", "21-58"],
+    "Fauna - Recursos pesqueiros": ["16-4", "20-5", "20-6", "20-54", "21-69", "21-70"],
+    "Flora e madeira": ["7-1", "7-2", "7-3", "7-4", "15-2", "15-4", "20-2", "20-5"],
+    "Importação / Exportação": [
+        "18-8", "18-10", "18-13", "18-17", "18-66", "18-81", "20-21", "20-22", "20-26", "20-63",
+        "20-81", "21-41", "21-42", "21-43", "21-44", "21-45", "21-46", "21-48", "21-49", "21-57",
+        "21-64", "21-67", "21-68", "21-92", "21-93",
+    ],
+    "Logística Reversa": ["15-11", "17-61", "18-66", "18-80", "21-5", "21-47", "21-66"],
+    "Pilhas e baterias": ["5-1", "17-62", "18-74", "18-80"],
+    "Pneumáticos": ["9-6", "17-63", "21-45"],
+    "Óleo lubrificante usado ou contaminado": ["15-2", "15-23", "18-13", "18-14", "18-80"],
+    "Lâmpadas fluorescentes, de vapor de sódio e mercúrio e de luz mista": [
+        "5-4", "18-74", "21-41",
+    ],
+    "Eletroeletrônicos": ["18-74", "18-80"],
+    "Mercúrio metálico": ["1-7", "1-12", "15-20", "18-8"],
+    "Mineração": [
+        "1-1", "1-2", "1-3", "1-4", "1-7", "17-58", "17-59", "18-2", "18-4", "22-2", "22-8",
+    ],
+    "Pesticidas": ["15-11", "17-61", "18-66", "18-80", "21-5", "21-47", "21-66"],
+}
+NO_CATEGORY = "Sem categoria"
+
+_CATEGORY_BY_CODE = {}
+for _category, _codes in FTE_CODE_CATEGORIES.items():
+    for _code in _codes:
+        _CATEGORY_BY_CODE.setdefault(_code, _category)
+
+# Everything is written compact (serialization.dumps): the index is downloaded on first paint
+
+
+def fte_category(codigo):
+    """Category of an FTE code such as "18 – 5", as the frontend names it"""
+    if not codigo:
+        return NO_CATEGORY
+    return _CATEGORY_BY_CODE.get(codigo.replace(" – ", "-"), NO_CATEGORY)
+
+
+def summarize(entry):
+    """Slim index record: what the list view and its filters read.
+
+    Keeps the all_fte_data.json shape (url, data.metadata and the CNAE list)
+    so records can be used as-is until their detail file is loaded. CNAE
+    entries keep their agrupamento and código only; descriptions, sections
+    and raw_content only live in the detail file.
+    """
+    data = entry.get("data", {})
+    metadata = data.get("metadata", {})
+    summary_data = {"metadata": metadata}
+    if CNAE_KEY in data:
+        summary_data[CNAE_KEY] = [{"agrupamento": cnae.get("agrupamento"),
+                                   "código": cnae.get("código")}
+                                  for cnae in data[CNAE_KEY]]
+    return {
+        "id": fte_key(entry["url"]),
+        "url": entry["url"],
+        "data": summary_data,
+    }
+
+
+def detail_file_name(fte_id):
+    """File name of an FTE's detail JSON; URLs used as keys are made path-safe"""
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in fte_id)
+    return f"{safe}.json"
+
+
+def publish(data_file="all_fte_data.json", output_dir="public", index_file=DEFAULT_INDEX_FILE,
+            detail_dir=DEFAULT_DETAIL_DIR, search_file=DEFAULT_SEARCH_FILE,
+            lineage_file=DEFAULT_LINEAGE_FILE, cnae_file=DEFAULT_CNAE_FILE):
+    """Write the summary index, the search, lineage and CNAE indexes and one detail file per FTE.
+
+    Detail files are only rewritten when their content changed, and files
+    of FTEs no longer in the data are removed. Returns (summaries, details_written).
+    """
+    with open(data_file, 'rb') as f:
+        entries = loads(f.read())
+
+    details_path = os.path.join(output_dir, detail_dir)
+    os.makedirs(details_path, exist_ok=True)
+
+    summaries = []
+    published = set()
+    written = 0
+    for entry in entries:
+        summary = summarize(entry)
+        name = detail_file_name(summary["id"])
+        summary["detail"] = f"{detail_dir}/{name}"
+        summaries.append(summary)
+        if name in published:
+            continue
+        published.add(name)
+        if _write_if_changed(os.path.join(details_path, name),
+                             dumps(entry)):
+            written += 1
+
+    for name in os.listdir(details_path):
+        if name.endswith(".json") and name not in published:
+            os.remove(os.path.join(details_path, name))
+
+    _write_if_changed(os.path.join(output_dir, index_file), dumps(summaries))
+    # Postings refer to positions in the summary index, which has the same order as entries
+    _write_if_changed(os.path.join(output_dir, search_file),
+                      dumps(build_search_index(entries)))
+    lineage = build_lineage(entries)
+    _write_if_changed(os.path.join(output_dir, lineage_file), dumps(lineage))
+    _write_if_changed(os.path.join(output_dir, cnae_file),
+                      dumps(build_cnae_index(entries, lineage)))
+    return summaries, written
+
+
+def _write_if_changed(path, text):
+    # Unchanged files keep their mtime, so static hosting keeps serving them from cache
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    return True
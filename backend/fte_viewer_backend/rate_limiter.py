@@ -0,0 +1,146 @@
+import datetime
+import email.utils
+import threading
+import time
+from urllib.parse import urlparse
+
+# Starting request rates (requests per second), matching the old fixed sleeps
+DEFAULT_HOST_RATES = {
+    'www.gov.br': 0.5,
+    'sei.ibama.gov.br': 1.0,
+}
+DEFAULT_RATE = 0.5
+DEFAULT_MIN_RATE = 0.1
+DEFAULT_MAX_RATE = 5.0
+# Responses slower than this (EWMA, seconds) count as the server pushing back
+DEFAULT_MAX_LATENCY = 2.0
+
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value):
+    """Return the Retry-After delay in seconds, or None if absent or unparseable"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max((retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
+
+
+class HostRateLimiter:
+    """Token bucket for one host whose rate adapts with AIMD.
+
+    The rate grows additively while responses are fast and is cut
+    multiplicatively on 429/503 or when the smoothed latency climbs past
+    max_latency. Retry-After pauses the host entirely.
+    """
+
+    def __init__(self, host, rate, min_rate=DEFAULT_MIN_RATE, max_rate=DEFAULT_MAX_RATE,
+                 max_latency=DEFAULT_MAX_LATENCY, increase=0.05, decrease=0.5, burst=1.0,
+                 cooldown=5.0):
+        self.host = host
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.max_latency = max_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = burst
+        # Minimum time between two rate cuts, so one slow burst is not punished repeatedly
+        self.cooldown = cooldown
+        self.latency = None
+        self.throttle_events = 0
+        self.lowest_rate = self.rate
+        self.highest_rate = self.rate
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request to this host is allowed"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = max(now - self._last, 0.0)
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._last = max(self._last, now)
+            self._tokens -= 1
+            # Wait out any Retry-After pause, then any token debt
+            wait = max(self._last - now, 0.0) + max(-self._tokens, 0.0) / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+    def feedback(self, status, latency, retry_after=None):
+        """Adjust the rate from the outcome of one request"""
+        with self._lock:
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency = 0.8 * self.latency + 0.2 * latency
+
+            throttled = status in THROTTLE_STATUSES
+            if throttled or self.latency > self.max_latency:
+                now = time.monotonic()
+                if throttled or now - self._last_decrease >= self.cooldown:
+                    self._decrease(now, status, retry_after)
+            else:
+                self.rate = min(self.rate + self.increase, self.max_rate)
+                self.highest_rate = max(self.highest_rate, self.rate)
+
+    def _decrease(self, now, status, retry_after):
+        # Caller holds the lock
+        old_rate = self.rate
+        self.rate = max(self.rate * self.decrease, self.min_rate)
+        self.lowest_rate = min(self.lowest_rate, self.rate)
+        self._last_decrease = now
+        self.throttle_events += 1
+        reason = f"HTTP {status}" if status in THROTTLE_STATUSES else f"latency {self.latency:.2f}s"
+        message = f"Throttling {self.host} ({reason}): {old_rate:.2f} -> {self.rate:.2f} req/s"
+        if retry_after:
+            # Nothing goes out before the server's Retry-After, and the bucket
+            # starts refilling only afterwards
+            self._last = max(self._last, now + retry_after)
+            self._tokens = min(self._tokens, 0.0)
+            message += f", pausing {retry_after:.1f}s (Retry-After)"
+        print(message)
+
+    def stats(self):
+        return {
+            "rate": self.rate,
+            "lowest_rate": self.lowest_rate,
+            "highest_rate": self.highest_rate,
+            "latency": self.latency,
+            "throttle_events": self.throttle_events,
+        }
+
+
+class RateLimiter:
+    """One adaptive token bucket per host"""
+
+    def __init__(self, host_rates=None, default_rate=DEFAULT_RATE, **limiter_options):
+        self.host_rates = dict(DEFAULT_HOST_RATES)
+        if host_rates:
+            self.host_rates.update(host_rates)
+        self.default_rate = default_rate
+        self.limiter_options = limiter_options
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                rate = self.host_rates.get(host, self.default_rate)
+                self._hosts[host] = HostRateLimiter(host, rate, **self.limiter_options)
+            return self._hosts[host]
+
+    def stats(self):
+        with self._lock:
+            return {host: limiter.stats() for host, limiter in self._hosts.items()}
@@ -0,0 +1,137 @@
+import sys
+
+from .analyze_versions import iter_fte_entries
+from .extraction import CNAE_KEY
+
+# Key order of the markdown_to_json data, without and with a CNAE block
+_DATA_LAYOUTS = (
+    ("metadata", "sections", "raw_content"),
+    ("metadata", "sections", "raw_content", CNAE_KEY),
+)
+
+# Section contents up to this length are interned: they are mostly the same
+# few values ("Médio", "Sim", CNAE codes) repeated across every FTE
+INTERN_MAX_LENGTH = 64
+
+
+def _intern(value):
+    if isinstance(value, str) and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+class Section:
+    """A titled row of the FTE table: {"title", "content", "items"}"""
+
+    __slots__ = ("title", "content", "items")
+    KEYS = ("title", "content", "items")
+
+    def __init__(self, title, content, items=()):
+        self.title = _intern(title)
+        self.content = _intern(content)
+        self.items = list(items)
+
+    @classmethod
+    def from_dict(cls, section):
+        return cls(section["title"], section["content"], section["items"])
+
+    def to_dict(self):
+        return {"title": self.title, "content": self.content, "items": self.items}
+
+
+class CNAEEntry:
+    """A CNAE row: {"agrupamento", "código", "descricao"}"""
+
+    __slots__ = ("agrupamento", "codigo", "descricao")
+    KEYS = ("agrupamento", "código", "descricao")
+
+    def __init__(self, agrupamento, codigo, descricao):
+        self.agrupamento = _intern(agrupamento)
+        self.codigo = _intern(codigo)
+        self.descricao = _intern(descricao)
+
+    @classmethod
+    def from_dict(cls, cnae):
+        return cls(cnae["agrupamento"], cnae["código"], cnae["descricao"])
+
+    def to_dict(self):
+        return {"agrupamento": self.agrupamento, "código": self.codigo,
+                "descricao": self.descricao}
+
+
+def _record(cls, item):
+    # Items of another shape (parse_fte_to_json sections have no "content")
+    # stay dicts, so they are written back exactly as read
+    if tuple(item) == cls.KEYS:
+        return cls.from_dict(item)
+    return item
+
+
+def _plain(item):
+    return item.to_dict() if isinstance(item, (Section, CNAEEntry)) else item
+
+
+class FTERecord:
+    """One all_fte_data.json entry, {"url", "data"}, as slotted objects.
+
+    Metadata keys, section titles, CNAE agrupamentos and other short
+    repeated values are interned, so a loaded dataset holds one copy of
+    each. to_entry() gives back the entry with its keys in the original
+    order; serialization.dumps() writes records as they are, so the
+    nested dicts are never rebuilt.
+    """
+
+    __slots__ = ("url", "metadata", "sections", "raw_content", "cnae")
+
+    def __init__(self, url, metadata, sections, raw_content, cnae=None):
+        self.url = url
+        self.metadata = {sys.intern(key): _intern(value) for key, value in metadata.items()}
+        self.sections = sections
+        self.raw_content = raw_content
+        # None when the page had no CNAE block, which leaves the key out
+        self.cnae = cnae
+
+    @classmethod
+    def from_data(cls, url, data):
+        """Record for a markdown_to_json result; data of another layout gives a plain entry"""
+        if tuple(data) not in _DATA_LAYOUTS:
+            return {"url": url, "data": data}
+        cnae = data.get(CNAE_KEY)
+        return cls(
+            url,
+            data["metadata"],
+            [_record(Section, section) for section in data["sections"]],
+            data["raw_content"],
+            None if cnae is None else [_record(CNAEEntry, item) for item in cnae],
+        )
+
+    @classmethod
+    def from_entry(cls, entry):
+        return cls.from_data(entry["url"], entry["data"])
+
+    def data(self):
+        data = {
+            "metadata": self.metadata,
+            "sections": self.sections,
+            "raw_content": self.raw_content,
+        }
+        if self.cnae is not None:
+            data[CNAE_KEY] = self.cnae
+        return data
+
+    def to_dict(self):
+        """The entry as all_fte_data.json has it; sections and CNAE rows stay records"""
+        return {"url": self.url, "data": self.data()}
+
+    def to_entry(self):
+        """The entry as plain dicts and lists"""
+        data = self.data()
+        data["sections"] = [_plain(section) for section in self.sections]
+        if self.cnae is not None:
+            data[CNAE_KEY] = [_plain(cnae) for cnae in self.cnae]
+        return {"url": self.url, "data": data}
+
+
+def load_records(data_file):
+    """FTERecords of a crawl output (JSON array or JSONL), read one entry at a time"""
+    return [FTERecord.from_entry(entry) for entry in iter_fte_entries(data_file)]
@@ -0,0 +1,1046 @@
+import argparse
+import datetime
+import json
+import os
+import sys
+
+# Only light, stdlib-backed modules are imported here so the CLI starts fast;
+# requests, BeautifulSoup, IPython and orjson (records, serialization) are
+# imported where they are first needed
+from .extraction import FTEExtraction, extract_fte_content, fte_table_json
+from .html_parsing import make_soup, listing_strainer, DEFAULT_PARSER, PARSERS
+from .archive import DEFAULT_ARCHIVE_DIR
+from .http_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from .incremental import content_hash, DEFAULT_DELTA_FILE
+
+# Listing pages to process, as slugs relative to baseUrl
+baseUrl = "https://www.gov.br/ibama/pt-br/servicos/cadastros/ctf/ctf-app/ftes/lista-de-todas-as-ftes/"
+LISTING_URLS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "listing_urls.txt")
+
+# Crawl state, configured by the crawl command
+# Tree builder used for every page; switched with --parser
+html_parser = DEFAULT_PARSER
+# Shared PageFetcher so connections are kept alive and reused; created on first use
+fetcher = None
+rate_limiter = None
+incremental_state = None
+# Fetch history of every page, and the pages a --budget crawl fetches
+freshness_state = None
+crawl_plan = None
+# Tracer recording a span per page and stage (crawl --trace)
+tracer = None
+# Render each FTE's table text with IPython (crawl --notebook)
+show_content = False
+
+def load_listing_urls(path=LISTING_URLS_FILE, base_url=None):
+    """Full listing page URLs from a file of slugs, one per line"""
+    base_url = baseUrl if base_url is None else base_url
+    with open(path, 'r', encoding='utf-8') as f:
+        slugs = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    return [base_url + slug for slug in slugs]
+
+def discover_listing_urls(index_url=None, get_soup=None):
+    """Listing page URLs linked from the lista-de-todas-as-ftes index page ([] if unreachable)
+
+    get_soup(url) returns the page's soup; by default the page is fetched.
+    """
+    from .frontier import listing_links
+
+    index_url = baseUrl if index_url is None else index_url
+    if get_soup is None:
+        soup = get_page_content(index_url, parse_only=listing_strainer())
+    else:
+        soup = get_soup(index_url)
+    if not soup:
+        return []
+    return listing_links(soup, index_url)
+
+def resolve_listing_urls(args, get_soup=None):
+    """Listing pages to crawl (or reparse) for the crawl options, deduplicated"""
+    from .frontier import dedupe_listing_urls
+
+    listing_urls = []
+    if args.discover:
+        listing_urls = discover_listing_urls(args.base_url, get_soup)
+        print(f"Discovered {len(listing_urls)} listing pages from {args.base_url}")
+    if not listing_urls:
+        listing_urls = load_listing_urls(args.urls_file, args.base_url)
+    # Repeated slugs and copy_of_ pages would fetch the same documents again
+    listing_urls, dropped = dedupe_listing_urls(listing_urls)
+    if dropped:
+        print(f"Skipping {len(dropped)} duplicate listing pages")
+    return listing_urls
+
+def markdown_to_json(soup):
+    """Convert HTML table content to structured JSON using table rows"""
+    return fte_table_json(soup)
+
+def parse_fte_to_json(soup):
+    # soup is already a BeautifulSoup object
+    print(f"\n{'='*80}\nProcessing soup content\n{'='*80}")
+
+    return FTEExtraction(soup).fte_json()
+
+def get_fetcher():
+    global fetcher
+    if fetcher is None:
+        from .fetcher import PageFetcher
+        fetcher = PageFetcher()
+    return fetcher
+
+def get_page_bytes(url):
+    """Return (body, content_type) for url, or None if it could not be fetched"""
+    import requests
+
+    try:
+        # Retries and connection pooling are handled by the shared fetcher
+        return get_fetcher().fetch_bytes(url)
+    except requests.exceptions.Timeout:
+        print(f"Timeout accessing {url}")
+        return None
+    except requests.exceptions.ConnectionError:
+        print(f"Connection error accessing {url}")
+        return None
+    except Exception as e:
+        print(f"Error accessing {url}: {str(e)}")
+        return None
+
+def get_page_html(url):
+    from .fetcher import decode_body
+
+    page = get_page_bytes(url)
+    if page is None:
+        return None
+    return decode_body(*page)
+
+def get_page_content(url, parse_only=None):
+    html = get_page_html(url)
+    if html is None:
+        return None
+    if tracer is None:
+        return make_soup(html, html_parser, parse_only=parse_only)
+    with tracer.span("soup", url, chars=len(html)):
+        return make_soup(html, html_parser, parse_only=parse_only)
+
+def find_fte_links(soup):
+    # Collect links using three methods and deduplicate, keeping page order
+    # so the crawl output order does not depend on string hashing
+    links_set = {}
+
+    # 1) By class: "plgBotao external-link"
+    for link in soup.select('a.plgBotao.external-link'):
+        href = link.get('href')
+        if href:
+            links_set[href] = None
+
+    # 2) By anchor text exactly "Acesse a FTE"
+    # 3) By anchor text exactly "FTE"
+    for link in soup.find_all('a'):
+        text = link.get_text(strip=True)
+        if not text:
+            continue
+        normalized = text.lower()
+        if normalized == 'acesse a fte' or normalized == 'fte':
+            href = link.get('href')
+            if href:
+                links_set[href] = None
+
+    fte_links = list(links_set)
+    return fte_links
+
+class FTEScraper:
+    """Object interface to the page helpers, for scripts (see example.py).
+
+    Each scraper has its own PageFetcher; its requests session is exposed
+    as .session so headers can be customized. The crawl itself is
+    `fte-scraper crawl`.
+    """
+
+    def __init__(self, base_url=None, timeout=None):
+        from .fetcher import PageFetcher
+
+        self.base_url = baseUrl if base_url is None else base_url
+        self.fetcher = PageFetcher() if timeout is None else PageFetcher(timeout=timeout)
+        self.session = self.fetcher.session
+
+    def get_page_content(self, url, timeout=None, parse_only=None):
+        """Parsed page at url, or None if it could not be fetched"""
+        import requests
+        from .fetcher import decode_body
+
+        default_timeout = self.fetcher.timeout
+        if timeout is not None:
+            self.fetcher.timeout = timeout
+        try:
+            body, content_type = self.fetcher.fetch_bytes(url)
+        except requests.exceptions.RequestException as e:
+            print(f"Error accessing {url}: {e}")
+            return None
+        finally:
+            self.fetcher.timeout = default_timeout
+        return make_soup(decode_body(body, content_type), html_parser, parse_only=parse_only)
+
+    def find_fte_links(self, soup):
+        return find_fte_links(soup)
+
+    def extract_fte_content(self, soup):
+        return extract_fte_content(soup)
+
+    def markdown_to_json(self, soup):
+        return markdown_to_json(soup)
+
+    def scrape_ftes(self, urls, output_file="all_fte_data.json"):
+        """Parse the FTE pages at urls into output_file (all_fte_data.json format).
+
+        Returns {"total_ftes", "failed_urls", "output_file"}.
+        """
+        from .serialization import write_json
+
+        entries = []
+        failed_urls = []
+        for url in urls:
+            soup = self.get_page_content(url)
+            if soup is None:
+                failed_urls.append(url)
+                continue
+            entries.append({"url": url, "data": markdown_to_json(soup)})
+        write_json(output_file, entries, pretty=True)
+        return {"total_ftes": len(entries), "failed_urls": failed_urls, "output_file": output_file}
+
+    def close(self):
+        self.fetcher.close()
+
+def process_listing(url):
+    """Fetch a listing page and return (fte_links, debug_info_or_None)"""
+    print(f"\n{'='*80}\nProcessing URL: {url}\n{'='*80}")
+    print(f"URL: {url}")
+    if crawl_plan is not None:
+        links = crawl_plan.listing_links(url)
+        if links is not None:
+            print(f"Not due for a visit, using the {len(links)} FTE links of the last run")
+            return links, None
+    if rate_limiter is not None:
+        print(f"Current rate: {rate_limiter.for_url(url).rate:.2f} req/s")
+
+    # Get the main page; only its anchors and title are parsed
+    soup = get_page_content(url, parse_only=listing_strainer())
+    if not soup:
+        # Save information about inaccessible pages
+        return [], {
+            "url": url,
+            "timestamp": str(datetime.datetime.now()),
+            "status": "Page not accessible",
+            "page_title": "N/A",
+            "page_accessible": False,
+            "total_links_on_page": 0,
+            "links_with_plgBotao_class": 0,
+            "sample_links": []
+        }
+
+    # Find FTE links
+    if tracer is None:
+        fte_links = find_fte_links(soup)
+    else:
+        with tracer.span("links", url) as fields:
+            fte_links = find_fte_links(soup)
+            fields["links"] = len(fte_links)
+    if freshness_state is not None:
+        freshness_state.observe_listing(url, fte_links)
+
+    if not fte_links:
+        print("No FTE links found on this page")
+        # Save this URL for debugging with more details
+        page_info = {
+            "url": url,
+            "timestamp": str(datetime.datetime.now()),
+            "status": "No FTE links found",
+            "page_title": soup.title.string if soup.title else "No title",
+            "page_accessible": True,
+            "total_links_on_page": len(soup.find_all('a')),
+            "links_with_plgBotao_class": len(soup.find_all('a', class_='plgBotao')),
+            "sample_links": []
+        }
+        
+        # Add some sample links to help debug
+        for link in soup.find_all('a')[:10]:  # First 10 links
+            if link.get('href') and link.get_text(strip=True):
+                page_info["sample_links"].append({
+                    "text": link.get_text(strip=True)[:100],  # First 100 chars
+                    "href": link.get('href'),
+                    "class": link.get('class')
+                })
+        
+        return [], page_info
+
+    return fte_links, None
+
+def fetch_fte(fte_link):
+    """Fetch stage for one FTE page: returns (entry, parse_job)
+
+    entry is set when the document can be reused without parsing, parse_job
+    holds the arguments for parse_fte_page otherwise; both are None when the
+    page could not be fetched.
+    """
+    from .records import FTERecord
+
+    print(f"\n{'='*80}\nFollowing FTE link: {fte_link}\n{'='*80}")
+
+    if crawl_plan is not None:
+        fetch, json_data = crawl_plan.document(fte_link)
+        if not fetch:
+            if json_data is None:
+                print("Out of request budget, left for a later run")
+                return None, None
+            print("Not due for a visit, reusing the record of the last run")
+            if incremental_state is not None:
+                incremental_state.keep(fte_link)
+            return FTERecord.from_data(fte_link, json_data), None
+
+    # Get the FTE page content
+    print(f"Attempting to retrieve content from: {fte_link}")
+    page = get_page_bytes(fte_link)
+    if page is None:
+        print(f"Could not retrieve content from {fte_link}. Skipping parsing.")
+        return None, None
+    body, content_type = page
+
+    # In incremental mode, unchanged documents reuse their previous record
+    if incremental_state is not None:
+        json_data = incremental_state.lookup(fte_link, content_hash(body))
+        if json_data is not None:
+            print("Content unchanged since last run, reusing parsed record")
+            if freshness_state is not None:
+                freshness_state.observe_document(fte_link, json_data)
+            return FTERecord.from_data(fte_link, json_data), None
+
+    # FTE pages are parsed whole: raw_content is the text of the entire page
+    return None, (body, content_type, html_parser)
+
+def finish_fte(fte_link, parse_job, result):
+    """Turn a parse_fte_page result into the FTE entry"""
+    from .records import FTERecord
+
+    if show_content:
+        # Display content extracted by the parse worker (notebook rendering)
+        from IPython.display import display, Markdown
+        display(Markdown(f"**FTE Content:**\n\n```\n{result['content']}\n```"))
+
+    json_data = result["data"]
+    cnae_rows = len(json_data.get('Classificação Nacional de Atividades Econômicas', []))
+    print(f"Found {cnae_rows} CNAE entries")
+    if tracer is not None and "timing" in result:
+        # Timed in the parse worker; the span ends now, when its result is back
+        timing = dict(result["timing"])
+        tracer.record("parse", fte_link, timing.pop("seconds"), bytes=len(parse_job[0]),
+                      cnae_rows=cnae_rows, sections=len(json_data.get("sections", [])), **timing)
+
+    if incremental_state is not None:
+        incremental_state.record(fte_link, content_hash(parse_job[0]), json_data)
+    if freshness_state is not None:
+        freshness_state.observe_document(fte_link, json_data)
+
+    # Slotted record: the crawl keeps every entry until it ends, to share
+    # documents linked from several listing pages
+    return FTERecord.from_data(fte_link, json_data)
+
+def parse_host_rate(value):
+    """Parse a HOST=REQUESTS_PER_SECOND command line value"""
+    host, sep, rate = value.partition("=")
+    try:
+        if not sep:
+            raise ValueError
+        return host, float(rate)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected HOST=REQUESTS_PER_SECOND, got {value!r}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="fte-scraper",
+        description="Scrape and analyze IBAMA FTE (Ficha Técnica de Enquadramento) pages",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.required = True
+
+    crawl_parser = commands.add_parser(
+        "crawl", help="Crawl the listing pages and write all_fte_data.json")
+    crawl_parser.add_argument("--urls-file", default=LISTING_URLS_FILE,
+                              help="File of listing page slugs, one per line")
+    crawl_parser.add_argument("--base-url", default=baseUrl,
+                              help="URL the listing page slugs are relative to")
+    crawl_parser.add_argument("--discover", action="store_true",
+                              help="Take the listing pages from the index page at --base-url "
+                                   "instead of --urls-file (which is used if none are found)")
+    crawl_parser.add_argument("--notebook", action="store_true",
+                              help="Render each FTE's extracted content with IPython")
+    crawl_parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                              help="Directory of the on-disk HTTP response cache")
+    crawl_parser.add_argument("--cache-size-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                              help="Evict least recently used responses beyond this size")
+    crawl_parser.add_argument("--max-age", type=float, default=None,
+                              help="Serve cached responses younger than this many seconds "
+                                   "without revalidating (offline replays)")
+    crawl_parser.add_argument("--no-cache", action="store_true",
+                              help="Disable the HTTP response cache")
+    crawl_parser.add_argument("--archive-dir", default=DEFAULT_ARCHIVE_DIR,
+                              help="Directory of the compressed archive of fetched pages")
+    crawl_parser.add_argument("--no-archive", action="store_true",
+                              help="Do not archive fetched pages for reparse")
+    crawl_parser.add_argument("--timeout", type=float, default=None,
+                              help="Seconds to wait for a server response (default: 30)")
+    crawl_parser.add_argument("--rate", type=parse_host_rate, action="append", default=[],
+                              metavar="HOST=RPS",
+                              help="Starting request rate for a host (repeatable)")
+    # Defaults of the limiter, tracing and freshness options live in their modules,
+    # which are only imported by the commands using them
+    crawl_parser.add_argument("--min-rate", type=float, default=None,
+                              help="Lowest rate (req/s) the adaptive limiter backs off to "
+                                   "(default: 0.1)")
+    crawl_parser.add_argument("--max-rate", type=float, default=None,
+                              help="Highest rate (req/s) the adaptive limiter ramps up to "
+                                   "(default: 5)")
+    crawl_parser.add_argument("--max-latency", type=float, default=None,
+                              help="Back off when a host's smoothed latency exceeds this many "
+                                   "seconds (default: 2)")
+    crawl_parser.add_argument("--parser", choices=PARSERS, default=DEFAULT_PARSER,
+                              help="HTML tree builder (html.parser is the slow pure-Python fallback)")
+    # Defaults for the engine options live in crawler, which is only imported by crawl
+    crawl_parser.add_argument("--parse-workers", type=int, default=None,
+                              help="Processes parsing FTE pages (0 parses in the main process; "
+                                   "default: one per CPU)")
+    crawl_parser.add_argument("--queue-depth", type=int, default=None,
+                              help="Pages allowed to wait between pipeline stages (default: 64)")
+    crawl_parser.add_argument("--resume", action="store_true",
+                              help="Continue an interrupted crawl, skipping checkpointed listing pages")
+    crawl_parser.add_argument("--finalize-only", action="store_true",
+                              help="Only compact the existing JSONL output into all_fte_data.json")
+    crawl_parser.add_argument("--db", default=None, metavar="PATH",
+                              help="After finalizing, sync all_fte_data.json into this SQLite store")
+    crawl_parser.add_argument("--incremental", action="store_true",
+                              help="Only re-parse FTEs whose HTML changed since the last run "
+                                   "and write a delta file")
+    crawl_parser.add_argument("--budget", type=int, default=None, metavar="REQUESTS",
+                              help="Only fetch the pages most likely to have changed, up to this "
+                                   "many; the rest is reused from the last run")
+    crawl_parser.add_argument("--freshness-file", default=None,
+                              help="Fetch and change history of every page "
+                                   "(default: fte_freshness.json)")
+    crawl_parser.add_argument("--trace", nargs="?", const="", default=None, metavar="FILE",
+                              help="Record connect, TTFB, download and parse spans per URL "
+                                   "(default file: crawl_trace.jsonl) and report them")
+    crawl_parser.add_argument("--profile-parse", default=None, metavar="DIR",
+                              help="Run the parse stage under cProfile, with stats in DIR")
+    crawl_parser.set_defaults(func=crawl)
+
+    plan_parser = commands.add_parser(
+        "plan", help="Show which pages a crawl with --budget would fetch, most urgent first")
+    plan_parser.add_argument("--urls-file", default=LISTING_URLS_FILE,
+                             help="File of listing page slugs, one per line")
+    plan_parser.add_argument("--base-url", default=baseUrl,
+                             help="URL the listing page slugs are relative to")
+    plan_parser.add_argument("--budget", type=int, default=None, metavar="REQUESTS",
+                             help="Request budget of the crawl (default: pages due, all of them)")
+    plan_parser.add_argument("--freshness-file", default=None,
+                             help="Fetch history written by crawl (default: fte_freshness.json)")
+    plan_parser.add_argument("--limit", type=int, default=20,
+                             help="Pages to list (0 for all)")
+    plan_parser.add_argument("--json", action="store_true",
+                             help="Print the whole schedule as JSON")
+    plan_parser.set_defaults(func=plan, discover=False)
+
+    trace_parser = commands.add_parser(
+        "trace-report", help="Percentiles per stage and host, and the slowest URLs, of a trace")
+    trace_parser.add_argument("trace_file", nargs="?", default=None,
+                              help="Trace written by crawl --trace (default: crawl_trace.jsonl)")
+    trace_parser.add_argument("--top", type=int, default=10, help="Slowest spans to list")
+    trace_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    trace_parser.set_defaults(func=report_trace)
+
+    discover_parser = commands.add_parser(
+        "discover", help="List the listing page slugs linked from the index page")
+    discover_parser.add_argument("--base-url", default=baseUrl,
+                                 help="URL of the lista-de-todas-as-ftes index page")
+    discover_parser.add_argument("-o", "--output", default=None,
+                                 help="Write the slugs here (a --urls-file) instead of stdout")
+    discover_parser.set_defaults(func=discover)
+
+    parse_parser = commands.add_parser(
+        "parse", help="Parse saved FTE HTML files without any network access")
+    parse_parser.add_argument("files", nargs="+", metavar="FILE",
+                              help="Saved FTE page (HTML)")
+    parse_parser.add_argument("-o", "--output", default="-",
+                              help="Write the parsed entries here instead of stdout")
+    parse_parser.add_argument("--parser", choices=PARSERS, default=DEFAULT_PARSER,
+                              help="HTML tree builder")
+    parse_parser.set_defaults(func=parse_files)
+
+    reparse_parser = commands.add_parser(
+        "reparse", help="Rebuild all_fte_data.json from the archive of fetched pages, offline")
+    reparse_parser.add_argument("--archive-dir", default=DEFAULT_ARCHIVE_DIR,
+                                help="Archive written by crawl")
+    reparse_parser.add_argument("--urls-file", default=LISTING_URLS_FILE,
+                                help="File of listing page slugs, one per line")
+    reparse_parser.add_argument("--base-url", default=baseUrl,
+                                help="URL the listing page slugs are relative to")
+    reparse_parser.add_argument("--discover", action="store_true",
+                                help="Take the listing pages from the archived index page")
+    reparse_parser.add_argument("-o", "--output", default="all_fte_data.json")
+    reparse_parser.add_argument("--parser", choices=PARSERS, default=DEFAULT_PARSER,
+                                help="HTML tree builder")
+    reparse_parser.add_argument("--parse-workers", type=int, default=None,
+                                help="Parse processes (default: one per core; 0 parses in-process)")
+    reparse_parser.set_defaults(func=reparse)
+
+    analyze_parser = commands.add_parser(
+        "analyze", help="Report FTE codes published in more than one version")
+    analyze_parser.add_argument("data_file", nargs="?", default="all_fte_data.json",
+                                help="Crawl output to analyze (the JSON array or the .jsonl file), "
+                                     "read incrementally")
+    analyze_parser.add_argument("-o", "--output", default=None,
+                                help="Where to write the report, '-' for stdout "
+                                     "(default: multi_version_codes.json or .csv)")
+    analyze_parser.add_argument("--format", choices=("json", "csv"), default="json",
+                                help="Report format")
+    analyze_parser.add_argument("--all", action="store_true",
+                                help="Include codes published in a single version")
+    analyze_parser.add_argument("--lineage", metavar="FILE", default=None,
+                                help="Read the fte_lineage.json written by publish "
+                                     "instead of the crawl output")
+    analyze_parser.add_argument("--verbose", action="store_true",
+                                help="Also print the full human-readable report")
+    analyze_parser.set_defaults(func=analyze)
+
+    publish_parser = commands.add_parser(
+        "publish", help="Write the frontend's summary index and per-FTE detail files")
+    publish_parser.add_argument("data_file", nargs="?", default="all_fte_data.json",
+                                help="Crawl output to publish")
+    publish_parser.add_argument("-o", "--output-dir", default="public",
+                                help="Directory served by the frontend")
+    publish_parser.set_defaults(func=publish)
+
+    store_parser = commands.add_parser(
+        "store", help="Sync, query or export the SQLite store")
+    store_parser.add_argument("--db", default="fte.sqlite3", help="SQLite database file")
+    store_commands = store_parser.add_subparsers(dest="store_command", metavar="ACTION")
+    store_commands.required = True
+    sync_parser = store_commands.add_parser("sync", help="Upsert a crawl output into the store")
+    sync_parser.add_argument("data_file", nargs="?", default="all_fte_data.json")
+    export_parser = store_commands.add_parser("export", help="Rebuild all_fte_data.json from the store")
+    export_parser.add_argument("-o", "--output", default="all_fte_data.json")
+    query_parser = store_commands.add_parser("query", help="Look FTEs up in the store")
+    query = query_parser.add_mutually_exclusive_group(required=True)
+    query.add_argument("--cnae", metavar="CODE", help="FTEs listing a CNAE code, e.g. 4681-8/01")
+    query.add_argument("--latest", metavar="CODIGO", help="Newest version of an FTE code, e.g. 18-13")
+    query.add_argument("--versions", metavar="CODIGO", help="Every version of an FTE code")
+    query.add_argument("--search", metavar="TEXT", help="Full-text search over descriptions")
+    store_parser.set_defaults(func=store)
+
+    cnae_parser = commands.add_parser(
+        "cnae", help="FTEs that apply to CNAE codes, from the published CNAE index")
+    cnae_parser.add_argument("codes", nargs="*", metavar="CODE",
+                             help="CNAE codes such as 4681-8/01 (any punctuation)")
+    cnae_parser.add_argument("--file", default=None,
+                             help="Also look up the codes in this file, one per line ('-' for stdin)")
+    cnae_parser.add_argument("--index", default=os.path.join("public", "fte_cnae.json"),
+                             help="fte_cnae.json written by publish")
+    cnae_parser.add_argument("--agrupamento", choices=("subclasse", "descritor"), default=None,
+                             help="Only match this agrupamento")
+    cnae_parser.add_argument("--latest", action="store_true",
+                             help="Only the latest version of each FTE code")
+    cnae_parser.set_defaults(func=cnae)
+
+    serve_parser = commands.add_parser(
+        "serve", help="Serve read-only FTE, CNAE and search queries over HTTP")
+    serve_parser.add_argument("data_file", nargs="?", default="all_fte_data.json",
+                              help="Crawl output to serve")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument("--watch", type=float, default=None, metavar="SECONDS",
+                              help="Reload the data file when it changes, checking this often "
+                                   "(SIGHUP always reloads)")
+    serve_parser.set_defaults(func=serve)
+    return parser
+
+def crawl(args):
+    global html_parser, fetcher, rate_limiter, incremental_state, show_content
+    global freshness_state, crawl_plan, tracer
+
+    import functools
+    from .archive import RawArchive
+    from .crawler import run_crawl
+    from .fetcher import PageFetcher
+    from .freshness import FreshnessState, DEFAULT_FRESHNESS_FILE
+    from .http_cache import ResponseCache
+    from .incremental import IncrementalState
+    from .jsonl_output import JsonlSink, finalize, DEFAULT_JSONL_FILE
+    from .parse_worker import dump_profile, parse_fte_page, traced_parse_fte_page
+    from .rate_limiter import RateLimiter
+    from .tracing import (Tracer, clear_profiles, format_report, merge_profiles, read_spans,
+                          trace_report, DEFAULT_TRACE_FILE)
+
+    html_parser = args.parser
+    show_content = args.notebook
+
+    from .frontier import Frontier, document_references, write_references
+    from .frontier import DEFAULT_REFERENCES_FILE
+    from .jsonl_output import load_checkpoint, read_records
+
+    frontier = Frontier()
+    connection_stats = None
+
+    if args.finalize_only:
+        # Nothing is fetched: the listing pages are the ones the checkpoint recorded
+        listing_urls = load_checkpoint()
+    else:
+        cache = None
+        if not args.no_cache:
+            cache = ResponseCache(
+                directory=args.cache_dir,
+                max_bytes=args.cache_size_mb * 1024 * 1024,
+                max_age=args.max_age,
+            )
+        # Per-host token buckets replace the fixed sleeps between requests
+        limiter_options = {name: getattr(args, name)
+                           for name in ("min_rate", "max_rate", "max_latency")
+                           if getattr(args, name) is not None}
+        rate_limiter = RateLimiter(host_rates=dict(args.rate), **limiter_options)
+        fetcher_options = {}
+        if args.timeout is not None:
+            fetcher_options["timeout"] = args.timeout
+        # Every fetched page is kept for fte-scraper reparse
+        archive = None if args.no_archive else RawArchive(args.archive_dir)
+        tracer = None
+        if args.trace is not None:
+            tracer = Tracer(args.trace or DEFAULT_TRACE_FILE)
+        parse_fte = parse_fte_page
+        if tracer is not None or args.profile_parse:
+            parse_fte = functools.partial(traced_parse_fte_page, profile_dir=args.profile_parse)
+        if args.profile_parse:
+            os.makedirs(args.profile_parse, exist_ok=True)
+            clear_profiles(args.profile_parse)
+        fetcher = PageFetcher(cache=cache, rate_limiter=rate_limiter, archive=archive,
+                              tracer=tracer, **fetcher_options)
+
+        # Loaded before the crawl because all_fte_data.json is overwritten afterwards
+        incremental_state = IncrementalState() if args.incremental else None
+
+        listing_urls = resolve_listing_urls(args)
+
+        # Planned before the crawl: pages left out reuse the current all_fte_data.json
+        freshness_state = FreshnessState(args.freshness_file or DEFAULT_FRESHNESS_FILE)
+        if args.budget is not None:
+            crawl_plan = freshness_state.plan(listing_urls, args.budget)
+            print(f"Request budget {args.budget}: {len(crawl_plan.planned)} pages due, "
+                  f"{crawl_plan.spare} requests left for newly linked documents")
+
+        sink = JsonlSink(resume=args.resume, listing_urls=listing_urls)
+        # On --resume, listing pages already checkpointed (with the same URL) are skipped
+        skip = set(sink.done)
+        if skip:
+            print(f"Resuming: skipping {len(skip)} listing pages already completed")
+
+        engine_options = {}
+        if args.parse_workers is not None:
+            engine_options["parse_workers"] = args.parse_workers
+        if args.queue_depth is not None:
+            engine_options["queue_depth"] = args.queue_depth
+
+        # Listing pages and FTE documents are fetched concurrently, bounded per host,
+        # parsed in a process pool and streamed to the JSONL file as soon as parsed
+        try:
+            run_crawl(
+                listing_urls, process_listing, fetch_fte, parse_fte, finish_fte,
+                sink=sink, skip=skip, frontier=frontier, **engine_options
+            )
+        finally:
+            sink.close()
+            freshness_state.prune(listing_urls)
+            freshness_state.save()
+            if tracer is not None:
+                tracer.close()
+            # Read before closing: closing the session drops its connection pools
+            connection_stats = fetcher.connection_stats()
+            fetcher.close()
+
+    # Compact the JSONL stream into the all_fte_data.json array, in serial crawl order
+    fte_count, no_fte_links_urls = finalize(
+        DEFAULT_JSONL_FILE, "all_fte_data.json", "no_fte_links_debug.json"
+    )
+
+    records = read_records(DEFAULT_JSONL_FILE)
+    if args.finalize_only:
+        # Lines of listing pages never checkpointed have no listing URL to refer to
+        records = (record for record in records if record["listing"] in listing_urls)
+    write_references(document_references(records, listing_urls))
+    print(f"Listing pages referencing each document saved to: {DEFAULT_REFERENCES_FILE}")
+
+    if incremental_state is not None:
+        delta = incremental_state.save()
+        print(f"\nDelta saved to: {DEFAULT_DELTA_FILE}")
+        print(f"Added: {len(delta['added'])}, changed: {len(delta['changed'])}, "
+              f"removed: {len(delta['removed'])}, reused: {incremental_state.reused}")
+
+    if args.db:
+        from .store import FTEStore
+
+        with open("all_fte_data.json", 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        with FTEStore(args.db) as fte_store:
+            upserted, removed = fte_store.sync(entries)
+        print(f"\nStore {args.db}: {upserted} FTEs upserted, {removed} removed")
+
+    # Report URLs where no FTE links were found
+    if no_fte_links_urls:
+        print(f"\nDebug info saved to: no_fte_links_debug.json")
+        print(f"URLs with no FTE links: {len(no_fte_links_urls)}")
+
+        # Show summary of issues
+        print("\nSummary of issues found:")
+        for i, issue in enumerate(no_fte_links_urls):
+            print(f"  {i+1}. {issue['url']}")
+            print(f"     Status: {issue['status']}")
+            if issue['page_accessible']:
+                print(f"     Page title: {issue['page_title']}")
+                print(f"     Total links: {issue['total_links_on_page']}")
+                print(f"     Links with plgBotao class: {issue['links_with_plgBotao_class']}")
+            print()
+
+    print(f"\nAll FTE data saved to: all_fte_data.json")
+    print(f"Total FTE entries processed: {fte_count}")
+    print(f"Total URLs processed: {len(listing_urls)}")
+    print(f"Successful FTE extractions: {fte_count}")
+    print(f"Failed/No FTE links: {len(no_fte_links_urls)}")
+    if frontier.links:
+        frontier_stats = frontier.stats()
+        print(f"FTE links found: {frontier_stats['links']} "
+              f"({frontier_stats['documents']} documents, "
+              f"{frontier_stats['duplicates']} fetched once for several listing pages)")
+    if connection_stats is not None:
+        print(f"HTTP requests sent: {connection_stats['requests']}")
+        print(f"Connections opened: {connection_stats['connections_opened']}")
+        print(f"Connections reused: {connection_stats['connections_reused']}")
+    if fetcher is not None and fetcher.cache is not None:
+        cache_stats = fetcher.cache.stats
+        print(f"Cache hits: {cache_stats['hits']}")
+        print(f"Cache misses: {cache_stats['misses']}")
+        print(f"Cache revalidated (304): {cache_stats['not_modified']}")
+        print(f"Cache evictions: {cache_stats['evictions']}")
+    if crawl_plan is not None:
+        plan_stats = crawl_plan.stats
+        print(f"Listing pages fetched: {plan_stats['listings_fetched']}, "
+              f"from the last run: {plan_stats['listings_replayed']}, "
+              f"deferred: {plan_stats['listings_deferred']}")
+        print(f"Documents fetched: {plan_stats['documents_fetched']}, "
+              f"from the last run: {plan_stats['documents_reused']}, "
+              f"deferred: {plan_stats['documents_deferred']}")
+    if freshness_state is not None:
+        print(f"Fetch history saved to: {freshness_state.path}")
+    if fetcher is not None and fetcher.archive is not None:
+        archive_stats = fetcher.archive.stats
+        print(f"Pages archived in {fetcher.archive.directory}: {archive_stats['stored']} new "
+              f"({archive_stats['bytes'] / 1024:.0f} KiB), "
+              f"{archive_stats['deduplicated']} already archived")
+    for host, host_stats in (rate_limiter.stats() if rate_limiter is not None else {}).items():
+        print(f"Rate {host}: {host_stats['rate']:.2f} req/s "
+              f"(range {host_stats['lowest_rate']:.2f}-{host_stats['highest_rate']:.2f}, "
+              f"throttle events: {host_stats['throttle_events']})")
+    if tracer is not None:
+        print(f"\nTrace saved to: {tracer.path}")
+        print(format_report(trace_report(read_spans(tracer.path))))
+    if args.profile_parse:
+        # Pool workers wrote their profiles when the pool shut down; in-process parsing writes now
+        dump_profile()
+        stats = merge_profiles(args.profile_parse)
+        if stats is not None:
+            print(f"\nParse stage profile saved to: {os.path.join(args.profile_parse, 'parse.prof')}")
+            stats.sort_stats("cumulative").print_stats(15)
+    print("\nProcessing complete!")
+    return 0
+
+def report_trace(args):
+    from .serialization import dumps
+    from .tracing import format_report, read_spans, trace_report, DEFAULT_TRACE_FILE
+
+    report = trace_report(read_spans(args.trace_file or DEFAULT_TRACE_FILE), top=args.top)
+    if args.json:
+        sys.stdout.write(dumps(report, pretty=True) + "\n")
+    else:
+        print(format_report(report))
+    return 0
+
+def plan(args):
+    from .freshness import FreshnessState, DEFAULT_FRESHNESS_FILE
+    from .serialization import dumps
+
+    freshness_file = args.freshness_file or DEFAULT_FRESHNESS_FILE
+    state = FreshnessState(freshness_file)
+    listing_urls = resolve_listing_urls(args)
+    schedule = state.plan(listing_urls, args.budget)
+    planned = {(item["kind"], item["key"]) for item in schedule.planned}
+
+    if args.json:
+        items = [{**item, "planned": (item["kind"], item["key"]) in planned}
+                 for item in schedule.items]
+        sys.stdout.write(dumps(items, pretty=True) + "\n")
+        return 0
+
+    if not state.listings:
+        print(f"No fetch history in {freshness_file} yet: every page is due")
+    for kind, label in (("listing", "Listing pages"), ("document", "Documents")):
+        items = [item for item in schedule.items if item["kind"] == kind]
+        due = sum(item["due"] for item in items)
+        print(f"{label}: {len(items)}, due: {due}")
+    if args.budget is None:
+        print("Without a budget every page is fetched")
+    else:
+        print(f"Budget {args.budget}: {len(schedule.planned)} pages due, "
+              f"{schedule.spare} requests left for newly linked documents")
+
+    shown = schedule.planned if args.limit == 0 else schedule.planned[:args.limit]
+    if shown:
+        print(f"\n{'kind':<9} {'priority':>8} {'every':>7} {'age':>7}  url")
+    for item in shown:
+        age = "new" if item["age_days"] is None else f"{item['age_days']:.1f}d"
+        print(f"{item['kind']:<9} {item['priority']:>8.2f} {item['interval_days']:>6.1f}d "
+              f"{age:>7}  {item['url']}")
+    if len(shown) < len(schedule.planned):
+        print(f"... {len(schedule.planned) - len(shown)} more")
+    return 0
+
+def discover(args):
+    listing_urls = discover_listing_urls(args.base_url)
+    if not listing_urls:
+        print(f"No listing pages found at {args.base_url}", file=sys.stderr)
+        return 1
+    base = args.base_url.rstrip("/") + "/"
+    slugs = [url[len(base):] if url.startswith(base) else url for url in listing_urls]
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write("\n".join(slugs) + "\n")
+        print(f"Wrote {len(slugs)} listing slugs to: {args.output}")
+    else:
+        print("\n".join(slugs))
+    return 0
+
+def parse_files(args):
+    """Parse saved FTE pages into the all_fte_data.json entry format"""
+    from .parse_worker import parse_fte_page
+    from .records import FTERecord
+    from .serialization import dumps, write_json
+
+    entries = []
+    for path in args.files:
+        with open(path, 'rb') as f:
+            result = parse_fte_page(f.read(), parser=args.parser)
+        entries.append(FTERecord.from_data(path, result["data"]))
+
+    if args.output == "-":
+        sys.stdout.write(dumps(entries, pretty=True) + "\n")
+    else:
+        write_json(args.output, entries, pretty=True)
+        print(f"Parsed {len(entries)} FTE pages into: {args.output}")
+    return 0
+
+def reparse(args):
+    import time
+    from .archive import RawArchive
+    from .crawler import DEFAULT_PARSE_WORKERS
+    from .fetcher import decode_body
+    from .frontier import Frontier
+    from .incremental import fte_key
+    from .parse_worker import parse_archived_page
+    from .records import FTERecord
+    from .serialization import write_json
+
+    start = time.monotonic()
+    archive = RawArchive(args.archive_dir)
+    manifest = archive.manifest()
+    if not manifest:
+        print(f"Error: no archived pages in {args.archive_dir}. Please run the crawler first.",
+              file=sys.stderr)
+        return 1
+    # Documents are looked up by id_documento, whatever infra_hash they were fetched
+    # with; the most recent fetch of a document wins
+    documents = {}
+    for url, record in manifest.items():
+        key = fte_key(url)
+        previous = documents.get(key)
+        if previous is None or record["fetched_at"] >= previous["fetched_at"]:
+            documents[key] = record
+
+    def archived_soup(url):
+        record = manifest.get(url) or manifest.get(url.rstrip('/') + '/')
+        if record is None:
+            return None
+        html = decode_body(archive.read(record["hash"]), record["content_type"])
+        return make_soup(html, args.parser, parse_only=listing_strainer())
+
+    listing_urls = resolve_listing_urls(args, archived_soup)
+
+    # Walk the archived listing pages like the crawl does: one job per document
+    frontier = Frontier()
+    occurrences = []
+    jobs = {}
+    missing_listings = []
+    for index, listing_url in enumerate(listing_urls):
+        soup = archived_soup(listing_url)
+        if soup is None:
+            missing_listings.append(listing_url)
+            continue
+        for position, href in enumerate(find_fte_links(soup)):
+            url, key, first = frontier.claim(href, listing_url)
+            occurrences.append(key)
+            record = documents.get(key)
+            if first and record is not None:
+                path = archive.object_path(record["hash"])
+                if path is not None:
+                    jobs[key] = (url, path, record["content_type"])
+
+    workers = DEFAULT_PARSE_WORKERS if args.parse_workers is None else args.parse_workers
+    keys = list(jobs)
+    job_args = ([jobs[key][1] for key in keys], [jobs[key][2] for key in keys],
+                [args.parser] * len(keys))
+    if workers:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(keys) // (workers * 4))
+            results = list(executor.map(parse_archived_page, *job_args, chunksize=chunksize))
+    else:
+        results = list(map(parse_archived_page, *job_args))
+    parsed = {key: FTERecord.from_data(jobs[key][0], result["data"])
+              for key, result in zip(keys, results)}
+
+    entries = [parsed[key] for key in occurrences if key in parsed]
+    write_json(args.output, entries, pretty=True)
+
+    print(f"Reparsed {len(parsed)} archived documents into {len(entries)} FTE entries: "
+          f"{args.output}")
+    not_archived = len({key for key in occurrences if key not in parsed})
+    if missing_listings:
+        print(f"Listing pages not in the archive: {len(missing_listings)}")
+    if not_archived:
+        print(f"Documents not in the archive: {not_archived}")
+    print(f"Time: {time.monotonic() - start:.2f} s ({workers or 'no'} parse workers)")
+    return 0
+
+def analyze(args):
+    from .analyze_versions import (analyze_fte_versions, collect_versions, groups_from_lineage,
+                                   iter_fte_entries, write_version_report)
+
+    source = args.lineage or args.data_file
+    if args.verbose and not args.lineage:
+        analyze_fte_versions(args.data_file)
+    try:
+        if args.lineage:
+            codigo_groups, entry_count = groups_from_lineage(args.lineage)
+        else:
+            codigo_groups, entry_count = collect_versions(iter_fte_entries(args.data_file))
+    except FileNotFoundError:
+        print(f"Error: {source} not found. Please run the scraper first.", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"Error: could not read {source}: {e}", file=sys.stderr)
+        return 1
+
+    output = args.output or f"multi_version_codes.{args.format}"
+    written = write_version_report(codigo_groups, output, args.format, multi_only=not args.all)
+    # Keep stdout clean for the report itself
+    summary = sys.stderr if output == '-' else sys.stdout
+    multi = sum(1 for versions in codigo_groups.values() if len(versions) > 1)
+    print(f"{entry_count} entries, {len(codigo_groups)} codes, {multi} with multiple versions",
+          file=summary)
+    if output != '-':
+        print(f"Wrote {written} codes to: {output}", file=summary)
+    return 0
+
+def publish(args):
+    from .publish import publish as publish_data, DEFAULT_INDEX_FILE, DEFAULT_DETAIL_DIR
+    from .search_index import DEFAULT_SEARCH_FILE
+    from .lineage import DEFAULT_LINEAGE_FILE
+    from .cnae_index import DEFAULT_CNAE_FILE
+
+    summaries, written = publish_data(args.data_file, args.output_dir)
+    print(f"Summary index saved to: {os.path.join(args.output_dir, DEFAULT_INDEX_FILE)}")
+    print(f"Search index saved to: {os.path.join(args.output_dir, DEFAULT_SEARCH_FILE)}")
+    print(f"Version lineage saved to: {os.path.join(args.output_dir, DEFAULT_LINEAGE_FILE)}")
+    print(f"CNAE index saved to: {os.path.join(args.output_dir, DEFAULT_CNAE_FILE)}")
+    print(f"FTE entries published: {len(summaries)}")
+    print(f"Detail files updated in {os.path.join(args.output_dir, DEFAULT_DETAIL_DIR)}: {written}")
+    return 0
+
+def store(args):
+    from .store import FTEStore
+
+    with FTEStore(args.db) as fte_store:
+        if args.store_command == "sync":
+            with open(args.data_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            upserted, removed = fte_store.sync(entries)
+            print(f"Store {args.db}: {upserted} FTEs upserted, {removed} removed, "
+                  f"{fte_store.count()} stored")
+        elif args.store_command == "export":
+            count = fte_store.export_json(args.output)
+            print(f"Exported {count} FTE entries to: {args.output}")
+        else:
+            if args.cnae:
+                result = fte_store.ftes_for_cnae(args.cnae)
+            elif args.latest:
+                result = fte_store.latest_version(args.latest)
+            elif args.versions:
+                result = fte_store.versions(args.versions)
+            else:
+                import sqlite3
+                try:
+                    result = fte_store.search(args.search)
+                except sqlite3.OperationalError as e:
+                    # FTS5 query syntax: quote codes such as "4681-8/01"
+                    print(f"Invalid search query: {e}")
+                    return 2
+            json.dump(result, sys.stdout, indent=2, ensure_ascii=False)
+            sys.stdout.write("\n")
+            if not result:
+                return 1
+    return 0
+
+def cnae(args):
+    from .cnae_index import CnaeIndex
+
+    codes = list(args.codes)
+    if args.file:
+        source = sys.stdin if args.file == '-' else open(args.file, 'r', encoding='utf-8')
+        with source:
+            codes.extend(line.strip() for line in source if line.strip())
+    if not codes:
+        print("No CNAE codes given", file=sys.stderr)
+        return 2
+    try:
+        index = CnaeIndex.load(args.index)
+    except FileNotFoundError:
+        print(f"Error: {args.index} not found. Please run fte-scraper publish first.",
+              file=sys.stderr)
+        return 2
+
+    result = index.lookup_many(codes, args.agrupamento, args.latest)
+    json.dump(result, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0 if any(result.values()) else 1
+
+def serve(args):
+    import asyncio
+    from .service import serve as run_service
+
+    try:
+        asyncio.run(run_service(args.data_file, args.host, args.port, args.watch))
+    except FileNotFoundError:
+        print(f"Error: {args.data_file} not found. Please run the scraper first.", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import re
+import unicodedata
+
+from .extraction import CNAE_KEY
+
+DEFAULT_SEARCH_FILE = "fte_search.json"
+
+# Bumped when the artifact layout or the tokenizer changes, so the viewer
+# can ignore an index it does not understand and fall back to scanning
+SEARCH_INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold(text):
+    """Lowercase text without accents, so "Código" and "codigo" match.
+
+    Uses NFD like the viewer's String.prototype.normalize("NFD"), so both
+    sides fold the same characters.
+    """
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(fold(text))
+
+
+def entry_text(entry):
+    """Everything the search box matched in an all_fte_data.json entry"""
+    data = entry.get("data", {})
+    yield entry.get("url", "")
+    for value in data.get("metadata", {}).values():
+        yield value
+    for section in data.get("sections", []):
+        yield section.get("title", "")
+        yield section.get("content", "")
+    for cnae in data.get(CNAE_KEY, []):
+        yield cnae.get("código", "")
+        yield cnae.get("descricao", "")
+
+
+def build_search_index(entries):
+    """Token -> positions (in fte_index.json order) postings for entries.
+
+    Tokens are sorted so the viewer can binary search the range of tokens
+    starting with what is being typed; postings are sorted position lists.
+    """
+    postings = {}
+    for position, entry in enumerate(entries):
+        for text in entry_text(entry):
+            if not text:
+                continue
+            for token in tokenize(text):
+                positions = postings.setdefault(token, [])
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+    tokens = sorted(postings)
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "count": len(entries),
+        "tokens": tokens,
+        "postings": [postings[token] for token in tokens],
+    }
+
+
+def search(index, query):
+    """Positions matching every query token as a prefix; mirrors the viewer's lookup"""
+    from bisect import bisect_left
+
+    tokens = index["tokens"]
+    result = None
+    for term in tokenize(query):
+        matches = set()
+        i = bisect_left(tokens, term)
+        while i < len(tokens) and tokens[i].startswith(term):
+            matches.update(index["postings"][i])
+            i += 1
+        result = matches if result is None else result & matches
+        if not result:
+            return set()
+    return result if result is not None else set(range(index["count"]))
@@ -0,0 +1,61 @@
+import json
+
+try:
+    # Optional (pip install -e ".[fast]"); the json module gives the same bytes
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    # FTERecord, Section and CNAEEntry
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+def dump_bytes(obj, pretty=False):
+    """UTF-8 JSON for obj, records included.
+
+    Compact by default, with the separators publish uses; pretty gives the
+    indent=2 layout of all_fte_data.json. Both are byte-identical to
+    json.dumps(..., ensure_ascii=False) with those options.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default,
+                            option=orjson.OPT_INDENT_2 if pretty else 0)
+    return dumps(obj, pretty).encode("utf-8")
+
+
+def dumps(obj, pretty=False):
+    """dump_bytes as text"""
+    if orjson is not None:
+        return dump_bytes(obj, pretty).decode("utf-8")
+    if pretty:
+        return json.dumps(obj, default=_default, indent=2, ensure_ascii=False)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(data):
+    """json.loads, through orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json(path, obj, pretty=False):
+    """Write obj like dump_bytes; a list is written one item at a time"""
+    with open(path, 'wb') as f:
+        if not isinstance(obj, list) or not obj:
+            f.write(dump_bytes(obj, pretty))
+            return
+        # Only one serialized item is held in memory, not the whole file
+        f.write(b"[\n" if pretty else b"[")
+        for i, item in enumerate(obj):
+            if i:
+                f.write(b",\n" if pretty else b",")
+            dumped = dump_bytes(item, pretty)
+            # JSON strings cannot contain a raw newline, so every one starts a line
+            f.write(b"  " + dumped.replace(b"\n", b"\n  ") if pretty else dumped)
+        f.write(b"\n]" if pretty else b"]")
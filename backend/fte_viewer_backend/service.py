@@ -0,0 +1,416 @@
+"""Read-only HTTP query service over the crawl output.
+
+Loads all_fte_data.json into memory-resident indexes (the same summary,
+lineage, CNAE and search indexes publish writes) and answers lookups
+without clients downloading the whole dataset:
+
+    GET  /fte/<id>                       all_fte_data.json entry of a document
+    GET  /codes/<codigo>                 lineage of an FTE code ("18-13", "18 – 13")
+    GET  /codes/<codigo>/latest          entry of its newest version
+    GET  /codes/<codigo>/versions/<v>    entry of one version
+    GET  /cnae/<code>                    FTEs listing a CNAE code
+    GET  /cnae?codes=A,B  POST /cnae     batch CNAE lookup ({"codes": [...]})
+    GET  /ftes?q=&codigo=&category=&cnae_type=&page=&per_page=
+                                         filtered, paginated summaries
+    GET  /search?q=&limit=               full-text search over the summaries
+    GET  /metrics                        per-endpoint latency and dataset info
+    GET  /healthz
+
+GET responses carry an ETag derived from the dataset and the request, and
+If-None-Match is answered with 304. The dataset is swapped atomically on
+SIGHUP or when --watch sees the data file change: requests in flight finish
+on the snapshot they started with.
+"""
+import asyncio
+import hashlib
+import os
+import signal
+import time
+from collections import deque
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .cnae_index import CnaeIndex, build_cnae_index
+from .extraction import CNAE_KEY, metadata_value
+from .lineage import build_lineage, codigo_key, version_key
+from .publish import fte_category, summarize
+from .search_index import build_search_index, search
+from .serialization import dump_bytes, loads
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+# Latencies kept per endpoint for the percentiles in /metrics
+LATENCY_WINDOW = 2048
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 4 * 1024 * 1024
+
+_REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Dataset:
+    """Immutable snapshot of a crawl output and the indexes built from it"""
+
+    def __init__(self, data_file):
+        with open(data_file, 'rb') as f:
+            raw = f.read()
+        self.data_file = data_file
+        self.digest = hashlib.sha256(raw).hexdigest()
+        self.loaded_at = time.time()
+        self.entries = loads(raw)
+        self.summaries = [summarize(entry) for entry in self.entries]
+
+        self.by_id = {}
+        for summary, entry in zip(self.summaries, self.entries):
+            self.by_id.setdefault(summary["id"], entry)
+        self.lineage = build_lineage(self.entries)
+        self.cnae = CnaeIndex(build_cnae_index(self.entries, self.lineage))
+        self.search_index = build_search_index(self.entries)
+
+    def code(self, codigo):
+        code = self.lineage["codes"].get(codigo_key(codigo))
+        if code is None:
+            raise HTTPError(404, f"FTE code {codigo!r} not found")
+        return code
+
+    def info(self):
+        return {
+            "data_file": self.data_file,
+            "sha256": self.digest,
+            "entries": len(self.entries),
+            "documents": len(self.by_id),
+            "codes": len(self.lineage["codes"]),
+            "loaded_at": self.loaded_at,
+        }
+
+
+def _matches(summary, codigo=None, category=None, cnae_type=None):
+    """The viewer's filteredData conditions other than the search box"""
+    data = summary["data"]
+    code = metadata_value(data.get("metadata", {}), "Código:") or ""
+    if codigo:
+        needle = codigo.lower()
+        if needle not in code.lower() and needle not in code.replace(" – ", ".").lower():
+            return False
+    # Categorized like getFteCategory, from the code
+    if category and fte_category(code) != category:
+        return False
+    if cnae_type and not any(cnae.get("agrupamento") == cnae_type
+                             for cnae in data.get(CNAE_KEY, [])):
+        return False
+    return True
+
+
+def _int_param(params, name, default, low, high):
+    value = params.get(name, [None])[0]
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an integer")
+    return max(low, min(high, number))
+
+
+class Metrics:
+    """Request counts, errors and recent latencies per endpoint"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.endpoints = {}
+
+    def record(self, endpoint, status, seconds):
+        stats = self.endpoints.setdefault(endpoint, {
+            "requests": 0, "errors": 0, "not_modified": 0,
+            "latencies": deque(maxlen=LATENCY_WINDOW),
+        })
+        stats["requests"] += 1
+        if status >= 400:
+            stats["errors"] += 1
+        elif status == 304:
+            stats["not_modified"] += 1
+        stats["latencies"].append(seconds)
+
+    def report(self):
+        endpoints = {}
+        for endpoint, stats in sorted(self.endpoints.items()):
+            latencies = sorted(stats["latencies"])
+
+            def percentile(fraction):
+                index = min(len(latencies) - 1, int(fraction * len(latencies)))
+                return round(latencies[index] * 1000, 3)
+
+            endpoints[endpoint] = {
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "not_modified": stats["not_modified"],
+                "latency_ms": {
+                    "p50": percentile(0.50),
+                    "p95": percentile(0.95),
+                    "p99": percentile(0.99),
+                    "max": round(latencies[-1] * 1000, 3),
+                },
+            }
+        return {"uptime_seconds": round(time.time() - self.started_at, 3),
+                "endpoints": endpoints}
+
+
+class QueryService:
+    """Route requests to the current Dataset and reload it without downtime"""
+
+    def __init__(self, data_file):
+        self.data_file = data_file
+        self.dataset = Dataset(data_file)
+        self.metrics = Metrics()
+        self.reloads = 0
+        self._reload_lock = None
+
+    async def reload(self):
+        """Build a new snapshot off the event loop, then swap it in; returns True if swapped"""
+        if self._reload_lock is None:
+            self._reload_lock = asyncio.Lock()
+        async with self._reload_lock:
+            loop = asyncio.get_running_loop()
+            try:
+                dataset = await loop.run_in_executor(None, Dataset, self.data_file)
+            except (OSError, ValueError) as e:
+                print(f"Reload of {self.data_file} failed, still serving the previous data: {e}")
+                return False
+            if dataset.digest == self.dataset.digest:
+                return False
+            # A single reference swap: requests hold on to the snapshot they started with
+            self.dataset = dataset
+            self.reloads += 1
+            print(f"Reloaded {self.data_file}: {len(dataset.entries)} entries")
+            return True
+
+    async def watch(self, interval):
+        """Reload whenever the data file's mtime or size changes"""
+        def signature():
+            try:
+                stat = os.stat(self.data_file)
+            except OSError:
+                return None
+            return stat.st_mtime_ns, stat.st_size
+
+        last = signature()
+        while True:
+            await asyncio.sleep(interval)
+            current = signature()
+            if current is not None and current != last:
+                last = current
+                await self.reload()
+
+    def route(self, method, path, params, body, dataset):
+        """Return (endpoint name, payload, cacheable)"""
+        parts = [unquote(part) for part in path.strip("/").split("/") if part]
+        if not parts:
+            raise HTTPError(404, "Not found")
+        head = parts[0]
+
+        if method == "POST":
+            if parts == ["cnae"]:
+                try:
+                    request = loads(body or b"{}")
+                    codes = request["codes"]
+                except (ValueError, KeyError, TypeError):
+                    raise HTTPError(400, 'expected a JSON body {"codes": [...]}')
+                if not isinstance(codes, list):
+                    raise HTTPError(400, "codes must be a list")
+                return "cnae_batch", self._cnae_batch(dataset, codes, params), False
+            raise HTTPError(405, "Only GET is supported here")
+
+        if head == "healthz" and len(parts) == 1:
+            return "healthz", {"status": "ok"}, False
+        if head == "metrics" and len(parts) == 1:
+            report = self.metrics.report()
+            report["dataset"] = dataset.info()
+            report["reloads"] = self.reloads
+            return "metrics", report, False
+        if head == "fte" and len(parts) == 2:
+            entry = dataset.by_id.get(parts[1])
+            if entry is None:
+                raise HTTPError(404, f"FTE {parts[1]!r} not found")
+            return "fte", entry, True
+        if head == "codes" and len(parts) == 2:
+            return "code", dataset.code(parts[1]), True
+        if head == "codes" and len(parts) == 3 and parts[2] == "latest":
+            code = dataset.code(parts[1])
+            return "code_latest", dataset.by_id[code["latest"]], True
+        if head == "codes" and len(parts) == 4 and parts[2] == "versions":
+            code = dataset.code(parts[1])
+            wanted = version_key(parts[3])
+            for version in reversed(code["versions"]):
+                if version_key(version["version"]) == wanted:
+                    return "code_version", dataset.by_id[version["id"]], True
+            raise HTTPError(404, f"Version {parts[3]!r} of {parts[1]!r} not found")
+        if head == "cnae" and len(parts) >= 2:
+            # Codes such as 4681-8/01 may arrive with their slash unescaped
+            code = "/".join(parts[1:])
+            return "cnae", self._cnae_batch(dataset, [code], params)[code], True
+        if head == "cnae" and len(parts) == 1:
+            codes = [code for value in params.get("codes", []) for code in value.split(",")
+                     if code.strip()]
+            if not codes:
+                raise HTTPError(400, "codes is required")
+            return "cnae_batch", self._cnae_batch(dataset, codes, params), True
+        if head == "ftes" and len(parts) == 1:
+            return "ftes", self._list(dataset, params), True
+        if head == "search" and len(parts) == 1:
+            query = params.get("q", [""])[0]
+            if not query.strip():
+                raise HTTPError(400, "q is required")
+            limit = _int_param(params, "limit", DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+            positions = sorted(search(dataset.search_index, query))
+            return "search", {
+                "total": len(positions),
+                "items": [dataset.summaries[position] for position in positions[:limit]],
+            }, True
+        raise HTTPError(404, "Not found")
+
+    @staticmethod
+    def _cnae_batch(dataset, codes, params):
+        agrupamento = params.get("agrupamento", [None])[0]
+        latest = params.get("latest", ["0"])[0] in ("1", "true", "yes")
+        return dataset.cnae.lookup_many([str(code) for code in codes], agrupamento, latest)
+
+    @staticmethod
+    def _list(dataset, params):
+        """Summaries filtered like the viewer's filteredData, one page at a time"""
+        page = _int_param(params, "page", 1, 1, 10 ** 9)
+        per_page = _int_param(params, "per_page", DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+        query = params.get("q", [""])[0]
+        positions = (sorted(search(dataset.search_index, query)) if query.strip()
+                     else range(len(dataset.summaries)))
+        filters = {
+            "codigo": params.get("codigo", [None])[0],
+            "category": params.get("category", [None])[0],
+            "cnae_type": params.get("cnae_type", [None])[0],
+        }
+        matches = [dataset.summaries[position] for position in positions
+                   if _matches(dataset.summaries[position], **filters)]
+        start = (page - 1) * per_page
+        return {
+            "total": len(matches),
+            "page": page,
+            "per_page": per_page,
+            "items": matches[start:start + per_page],
+        }
+
+    def respond(self, method, target, headers, body):
+        """Return (status, response headers, body bytes) for one request"""
+        start = time.perf_counter()
+        # Everything below reads this one snapshot, even if a reload swaps it meanwhile
+        dataset = self.dataset
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        endpoint = "unknown"
+        response_headers = {"Content-Type": "application/json; charset=utf-8"}
+        try:
+            if method not in ("GET", "POST"):
+                raise HTTPError(405, f"{method} is not supported")
+            endpoint, payload, cacheable = self.route(method, url.path, params, body, dataset)
+            status, content = 200, None
+            if cacheable and method == "GET":
+                # Responses are a function of the dataset and the request target
+                target_hash = hashlib.sha256(target.encode("utf-8")).hexdigest()
+                etag = f'"{dataset.digest[:16]}-{target_hash[:16]}"'
+                response_headers["ETag"] = etag
+                response_headers["Cache-Control"] = "no-cache"
+                if etag in _etag_list(headers.get("if-none-match", "")):
+                    status, content = 304, b""
+            if content is None:
+                content = dump_bytes(payload)
+        except HTTPError as e:
+            status = e.status
+            content = dump_bytes({"error": e.message})
+        except Exception as e:
+            status = 500
+            content = dump_bytes({"error": str(e)})
+        self.metrics.record(endpoint, status, time.perf_counter() - start)
+        return status, response_headers, content
+
+    async def handle_connection(self, reader, writer):
+        """HTTP/1.1 with keep-alive; one request at a time per connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await _write_response(writer, 400, {}, b'{"error": "Bad request line"}', False)
+                    break
+                headers = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    await _write_response(writer, 413, {}, b'{"error": "Body too large"}', False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1")
+                status, response_headers, content = self.respond(method, target, headers, body)
+                await _write_response(writer, status, response_headers, content, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # Client went away, or sent a malformed Content-Length
+            pass
+        finally:
+            writer.close()
+
+
+def _etag_list(header):
+    return {tag.strip() for tag in header.split(",") if tag.strip()} if header else set()
+
+
+async def _write_response(writer, status, headers, content, keep_alive):
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+    headers = dict(headers)
+    headers.setdefault("Content-Type", "application/json; charset=utf-8")
+    headers["Content-Length"] = str(len(content))
+    headers["Connection"] = "keep-alive" if keep_alive else "close"
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + content)
+    await writer.drain()
+
+
+async def serve(data_file, host=DEFAULT_HOST, port=DEFAULT_PORT, watch_interval=None):
+    """Run the service until cancelled; SIGHUP reloads the data file"""
+    service = QueryService(data_file)
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    loop = asyncio.get_running_loop()
+    tasks = set()
+
+    def schedule_reload():
+        task = loop.create_task(service.reload())
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if hasattr(signal, "SIGHUP"):
+        loop.add_signal_handler(signal.SIGHUP, schedule_reload)
+    if watch_interval:
+        tasks.add(loop.create_task(service.watch(watch_interval)))
+
+    address = server.sockets[0].getsockname()
+    print(f"Serving {len(service.dataset.entries)} FTE entries from {data_file} "
+          f"on http://{address[0]}:{address[1]}/")
+    async with server:
+        await server.serve_forever()
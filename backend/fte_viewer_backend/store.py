@@ -0,0 +1,266 @@
+import json
+import sqlite3
+
+from .cnae_index import cnae_key
+from .extraction import CNAE_KEY, metadata_value
+from .incremental import fte_key
+from .lineage import codigo_key, versao_key
+from .records import FTERecord
+from .serialization import write_json
+
+DEFAULT_DB_FILE = "fte.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fte (
+    id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    codigo TEXT,
+    codigo_key TEXT,
+    versao TEXT,
+    versao_key TEXT,
+    descricao TEXT,
+    raw_content TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fte_codigo ON fte (codigo_key, versao_key);
+
+CREATE TABLE IF NOT EXISTS section (
+    fte_id TEXT NOT NULL REFERENCES fte (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT,
+    content TEXT,
+    items TEXT,
+    PRIMARY KEY (fte_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS cnae (
+    fte_id TEXT NOT NULL REFERENCES fte (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    agrupamento TEXT,
+    codigo TEXT,
+    codigo_key TEXT,
+    descricao TEXT,
+    PRIMARY KEY (fte_id, position)
+);
+CREATE INDEX IF NOT EXISTS cnae_codigo_key ON cnae (codigo_key);
+
+-- Crawl order of all_fte_data.json; a document linked from several listing
+-- pages appears once per link
+CREATE TABLE IF NOT EXISTS occurrence (
+    position INTEGER PRIMARY KEY,
+    fte_id TEXT NOT NULL REFERENCES fte (id) ON DELETE CASCADE
+);
+
+-- FTE descriptions, section texts and CNAE descriptions, accent-insensitive
+CREATE VIRTUAL TABLE IF NOT EXISTS description_fts USING fts5 (
+    fte_id UNINDEXED,
+    field UNINDEXED,
+    body,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+class FTEStore:
+    """Normalized SQLite copy of the crawl output, queried without loading it all.
+
+    The store is derived, not the source of truth: the crawl (and the
+    viewer, publish and service) keep reading and writing
+    all_fte_data.json, and sync() folds that file into the database after
+    each crawl, only rewriting documents whose record changed.
+    export_json() rebuilds the same array from the database, to check the
+    copy or recover the file.
+    """
+
+    def __init__(self, path=DEFAULT_DB_FILE):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self._add_cnae_key()
+        self.connection.executescript(SCHEMA)
+
+    def _add_cnae_key(self):
+        # Stores written before CNAE codes were looked up by cnae_key
+        columns = [row["name"] for row in self.connection.execute("PRAGMA table_info(cnae)")]
+        if not columns or "codigo_key" in columns:
+            return
+        with self.connection:
+            self.connection.execute("ALTER TABLE cnae ADD COLUMN codigo_key TEXT")
+            self.connection.execute("DROP INDEX IF EXISTS cnae_codigo")
+            self.connection.executemany(
+                "UPDATE cnae SET codigo_key = ? WHERE rowid = ?",
+                [(cnae_key(row["codigo"]), row["rowid"])
+                 for row in self.connection.execute("SELECT rowid, codigo FROM cnae").fetchall()],
+            )
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Writing
+
+    def upsert(self, entry):
+        """Insert or replace one all_fte_data.json entry; returns False when unchanged"""
+        data = entry["data"]
+        fte_id = fte_key(entry["url"])
+        serialized = json.dumps(data, ensure_ascii=False)
+        row = self.connection.execute("SELECT url, data FROM fte WHERE id = ?", (fte_id,)).fetchone()
+        if row is not None and row["data"] == serialized and row["url"] == entry["url"]:
+            return False
+
+        metadata = data.get("metadata", {})
+        codigo = metadata_value(metadata, "Código:")
+        versao = metadata_value(metadata, "Versão FTE:")
+        descricao = metadata_value(metadata, "Descrição:")
+        connection = self.connection
+        connection.execute(
+            """INSERT INTO fte (id, url, codigo, codigo_key, versao, versao_key, descricao,
+                                raw_content, data)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (id) DO UPDATE SET
+                   url = excluded.url, codigo = excluded.codigo,
+                   codigo_key = excluded.codigo_key, versao = excluded.versao,
+                   versao_key = excluded.versao_key, descricao = excluded.descricao,
+                   raw_content = excluded.raw_content, data = excluded.data""",
+            (fte_id, entry["url"], codigo, codigo_key(codigo), versao, versao_key(versao),
+             descricao, data.get("raw_content"), serialized),
+        )
+        connection.execute("DELETE FROM section WHERE fte_id = ?", (fte_id,))
+        connection.execute("DELETE FROM cnae WHERE fte_id = ?", (fte_id,))
+        connection.execute("DELETE FROM description_fts WHERE fte_id = ?", (fte_id,))
+
+        sections = data.get("sections", [])
+        connection.executemany(
+            "INSERT INTO section (fte_id, position, title, content, items) VALUES (?, ?, ?, ?, ?)",
+            [(fte_id, position, section.get("title"), section.get("content"),
+              json.dumps(section.get("items", []), ensure_ascii=False))
+             for position, section in enumerate(sections)],
+        )
+        cnae_entries = data.get(CNAE_KEY, [])
+        connection.executemany(
+            """INSERT INTO cnae (fte_id, position, agrupamento, codigo, codigo_key, descricao)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [(fte_id, position, cnae.get("agrupamento"), cnae.get("código"),
+              cnae_key(cnae.get("código")), cnae.get("descricao"))
+             for position, cnae in enumerate(cnae_entries)],
+        )
+
+        texts = [("descricao", descricao)]
+        texts.extend(("section", section.get("content")) for section in sections)
+        texts.extend(("cnae", cnae.get("descricao")) for cnae in cnae_entries)
+        connection.executemany(
+            "INSERT INTO description_fts (fte_id, field, body) VALUES (?, ?, ?)",
+            [(fte_id, field, body) for field, body in texts if body],
+        )
+        return True
+
+    def sync(self, entries):
+        """Make the store match a crawl output; returns (upserted, removed).
+
+        Unchanged documents are skipped, so syncing after an incremental
+        crawl only touches what the crawl added or changed.
+        """
+        upserted = 0
+        seen = set()
+        with self.connection:
+            for entry in entries:
+                fte_id = fte_key(entry["url"])
+                if fte_id in seen:
+                    continue
+                seen.add(fte_id)
+                if self.upsert(entry):
+                    upserted += 1
+
+            self.connection.execute("DELETE FROM occurrence")
+            self.connection.executemany(
+                "INSERT INTO occurrence (position, fte_id) VALUES (?, ?)",
+                [(position, fte_key(entry["url"])) for position, entry in enumerate(entries)],
+            )
+
+            stale = [row["id"] for row in self.connection.execute("SELECT id FROM fte")
+                     if row["id"] not in seen]
+            for fte_id in stale:
+                self.connection.execute("DELETE FROM description_fts WHERE fte_id = ?", (fte_id,))
+                self.connection.execute("DELETE FROM fte WHERE id = ?", (fte_id,))
+        return upserted, len(stale)
+
+    # Reading
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM fte").fetchone()[0]
+
+    def get(self, fte_id):
+        """The all_fte_data.json entry for a document id, or None"""
+        row = self.connection.execute("SELECT url, data FROM fte WHERE id = ?", (fte_id,)).fetchone()
+        return _entry(row) if row else None
+
+    def versions(self, codigo):
+        """Every stored version of an FTE code, oldest first, as summary dicts"""
+        rows = self.connection.execute(
+            """SELECT id, url, codigo, versao, descricao FROM fte
+               WHERE codigo_key = ? ORDER BY versao_key, id""",
+            (codigo_key(codigo),),
+        )
+        return [dict(row) for row in rows]
+
+    def latest_version(self, codigo):
+        """The all_fte_data.json entry of the newest version of an FTE code, or None"""
+        row = self.connection.execute(
+            """SELECT url, data FROM fte WHERE codigo_key = ?
+               ORDER BY versao_key DESC, id DESC LIMIT 1""",
+            (codigo_key(codigo),),
+        ).fetchone()
+        return _entry(row) if row else None
+
+    def ftes_for_cnae(self, code):
+        """FTEs listing a CNAE code such as "4681-8/01", with the agrupamento it appears under.
+
+        Codes are compared by cnae_key, so "4681801" finds "4681-8/01".
+        """
+        rows = self.connection.execute(
+            """SELECT DISTINCT fte.id, fte.url, fte.codigo, fte.versao, cnae.agrupamento
+               FROM cnae JOIN fte ON fte.id = cnae.fte_id
+               WHERE cnae.codigo_key = ? ORDER BY fte.codigo_key, fte.versao_key""",
+            (cnae_key(code),),
+        )
+        return [dict(row) for row in rows]
+
+    def search(self, query, limit=20):
+        """Full-text search over descriptions; FTS5 query syntax, accents ignored"""
+        rows = self.connection.execute(
+            """SELECT fte.id, fte.url, fte.codigo, fte.versao, description_fts.field,
+                      snippet(description_fts, 2, '[', ']', '…', 12) AS snippet
+               FROM description_fts JOIN fte ON fte.id = description_fts.fte_id
+               WHERE description_fts MATCH ? ORDER BY rank LIMIT ?""",
+            (query, limit),
+        )
+        return [dict(row) for row in rows]
+
+    def iter_entries(self):
+        """all_fte_data.json entries in crawl order"""
+        rows = self.connection.execute(
+            """SELECT fte.url, fte.data FROM occurrence JOIN fte ON fte.id = occurrence.fte_id
+               ORDER BY occurrence.position"""
+        )
+        for row in rows:
+            yield _entry(row)
+
+    def export_json(self, output_path="all_fte_data.json"):
+        """Rebuild all_fte_data.json from the store; returns the entry count"""
+        entries = [FTERecord.from_entry(entry) for entry in self.iter_entries()]
+        write_json(output_path, entries, pretty=True)
+        return len(entries)
+
+
+def _entry(row):
+    return {
+        "url": row["url"],
+        "data": json.loads(row["data"]),
+    }
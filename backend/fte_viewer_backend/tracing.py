@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from .serialization import dumps, loads
+
+DEFAULT_TRACE_FILE = "crawl_trace.jsonl"
+
+# Span fields summarized per host: where the time of a fetch went
+FETCH_PHASES = ("wait_s", "connect_s", "tls_s", "ttfb_s", "download_s")
+# Span fields summarized for the parse stage
+PARSE_PHASES = ("soup_s", "content_s", "table_s")
+
+
+class Tracer:
+    """Write one JSON line per span: a stage of the crawl for one URL.
+
+    Every span has its stage, URL, host, start time and duration in
+    seconds, plus whatever the stage measured (bytes, row counts, the
+    phases of a fetch). Lines are buffered and written under a lock, so
+    spans can be recorded from any thread at the cost of a dumps() call.
+    """
+
+    def __init__(self, path=DEFAULT_TRACE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def record(self, stage, url, seconds, start=None, **fields):
+        span = {
+            "stage": stage,
+            "url": url,
+            "host": urlsplit(url).netloc,
+            "start": time.time() - seconds if start is None else start,
+            "seconds": seconds,
+            **fields,
+        }
+        line = dumps(span)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
+
+    @contextmanager
+    def span(self, stage, url, **fields):
+        """Time the block as a span; fields added to the yielded dict are recorded with it"""
+        start_time = time.time()
+        start = time.perf_counter()
+        try:
+            yield fields
+        except Exception as e:
+            fields["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.record(stage, url, time.perf_counter() - start, start_time, **fields)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_spans(path=DEFAULT_TRACE_FILE):
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                yield loads(line)
+            except ValueError:
+                # Torn last line of an interrupted crawl
+                continue
+
+
+def latency_summary(values):
+    """count, p50/p95/p99/max and total of durations given in seconds, in ms"""
+    values = sorted(values)
+    if not values:
+        return {"count": 0}
+
+    def percentile(fraction):
+        return round(values[min(len(values) - 1, int(fraction * len(values)))] * 1000, 3)
+
+    return {
+        "count": len(values),
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": round(values[-1] * 1000, 3),
+        "total": round(sum(values) * 1000, 3),
+    }
+
+
+def trace_report(spans, top=10):
+    """Percentiles per stage and per host, and the slowest URLs, from trace spans"""
+    stages = {}
+    hosts = {}
+    parse_phases = {phase: [] for phase in PARSE_PHASES}
+    slowest = []
+    for span in spans:
+        stages.setdefault(span["stage"], []).append(span["seconds"])
+        slowest.append(span)
+        if span["stage"] == "fetch":
+            host = hosts.setdefault(span["host"], {
+                "requests": 0, "bytes": 0, "errors": 0, "retries": 0, "new_connections": 0,
+                "statuses": {}, "cache": {}, "seconds": [],
+                **{phase: [] for phase in FETCH_PHASES},
+            })
+            host["requests"] += 1
+            host["bytes"] += span.get("bytes", 0)
+            host["seconds"].append(span["seconds"])
+            if "error" in span:
+                host["errors"] += 1
+            host["retries"] += max(0, span.get("attempts", 1) - 1)
+            if span.get("connect_s"):
+                host["new_connections"] += 1
+            for field, counts in (("status", host["statuses"]), ("cache", host["cache"])):
+                if span.get(field) is not None:
+                    value = str(span[field])
+                    counts[value] = counts.get(value, 0) + 1
+            for phase in FETCH_PHASES:
+                if phase in span:
+                    host[phase].append(span[phase])
+        elif span["stage"] == "parse":
+            for phase in PARSE_PHASES:
+                if phase in span:
+                    parse_phases[phase].append(span[phase])
+
+    slowest.sort(key=lambda span: span["seconds"], reverse=True)
+    return {
+        "stages": {stage: latency_summary(values) for stage, values in sorted(stages.items())},
+        "parse_phases": {phase: latency_summary(values)
+                         for phase, values in parse_phases.items() if values},
+        "hosts": {
+            name: {
+                **{key: host[key] for key in ("requests", "bytes", "errors", "retries",
+                                              "new_connections", "statuses", "cache")},
+                "seconds": latency_summary(host["seconds"]),
+                **{phase: latency_summary(host[phase]) for phase in FETCH_PHASES if host[phase]},
+            }
+            for name, host in sorted(hosts.items())
+        },
+        "slowest": [{key: span[key] for key in span if key not in ("host", "start")}
+                    for span in slowest[:top]],
+    }
+
+
+def format_report(report):
+    """trace_report as text, one table per section"""
+    lines = []
+
+    def table(title, rows):
+        lines.append(f"\n{title}")
+        lines.append(f"  {'':<28} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+                     f"{'max ms':>9}")
+        for name, summary in rows:
+            if summary.get("count"):
+                lines.append(f"  {name:<28} {summary['count']:>7} {summary['p50']:>9.1f} "
+                             f"{summary['p95']:>9.1f} {summary['p99']:>9.1f} "
+                             f"{summary['max']:>9.1f}")
+
+    table("Stages", report["stages"].items())
+    if report["parse_phases"]:
+        table("Parse phases", report["parse_phases"].items())
+    for name, host in report["hosts"].items():
+        statuses = ", ".join(f"{status}: {count}"
+                             for status, count in sorted(host["statuses"].items()))
+        cache = ", ".join(f"{outcome}: {count}" for outcome, count in sorted(host["cache"].items()))
+        table(f"Host {name}: {host['requests']} fetches, {host['bytes'] / 1024:.0f} KiB, "
+              f"{host['new_connections']} new connections, {host['retries']} retries, "
+              f"{host['errors']} errors",
+              [("total", host["seconds"])] + [(phase[:-2], host[phase]) for phase in FETCH_PHASES
+                                              if phase in host])
+        if statuses:
+            lines.append(f"  statuses: {statuses}")
+        if cache:
+            lines.append(f"  cache: {cache}")
+    if report["slowest"]:
+        lines.append("\nSlowest spans")
+        for span in report["slowest"]:
+            lines.append(f"  {span['seconds'] * 1000:>9.1f} ms  {span['stage']:<6} {span['url']}")
+    return "\n".join(lines).lstrip("\n")
+
+
+def clear_profiles(profile_dir):
+    """Remove the per-process parse profiles of an earlier run"""
+    for name in os.listdir(profile_dir):
+        if name.startswith("parse-") and name.endswith(".prof"):
+            os.remove(os.path.join(profile_dir, name))
+
+
+def merge_profiles(profile_dir):
+    """pstats.Stats of every parse worker, also saved as profile_dir/parse.prof; None if none ran"""
+    import pstats
+
+    paths = [os.path.join(profile_dir, name) for name in sorted(os.listdir(profile_dir))
+             if name.startswith("parse-") and name.endswith(".prof")]
+    if not paths:
+        return None
+    stats = pstats.Stats(*paths)
+    stats.dump_stats(os.path.join(profile_dir, "parse.prof"))
+    return stats
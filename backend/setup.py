@@ -53,6 +53,16 @@ setup(
     python_requires=">=3.8",
     install_requires=read_requirements(),
     extras_require={
+        "notebook": [
+            "ipython>=8.0.0",
+            "jupyter>=1.0.0",
+        ],
+        "archive": [
+            "zstandard>=0.21.0",
+        ],
+        "fast": [
+            "orjson>=3.8.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
@@ -0,0 +1,41 @@
+import pytest
+
+SEI_URL = "https://sei.ibama.gov.br/documento_consulta_externa.php?id_documento={}"
+
+
+class EntryFactory:
+    """Builds all_fte_data.json entries for SEI documents"""
+
+    def url(self, id_documento):
+        return SEI_URL.format(id_documento)
+
+    def __call__(self, id_documento, metadata=None, cnae=None, sections=()):
+        """Entry with this metadata; cnae is a list of (agrupamento, código[, descricao])"""
+        data = {
+            "metadata": dict(metadata or {}),
+            "sections": list(sections),
+            "raw_content": "",
+        }
+        if cnae is not None:
+            data["Classificação Nacional de Atividades Econômicas"] = [
+                {"agrupamento": row[0], "código": row[1],
+                 "descricao": row[2] if len(row) > 2 else ""}
+                for row in cnae
+            ]
+        return {"url": self.url(id_documento), "data": data}
+
+
+@pytest.fixture
+def fte_entry():
+    return EntryFactory()
+
+
+@pytest.fixture
+def mock_site():
+    """(site, listing_base_url) of benchmarks.mock_server on two local hosts, without latency"""
+    from benchmarks.mock_server import MockSite, start_servers, stop_servers
+
+    site = MockSite(categories=3, latency=0, jitter=0)
+    servers, listing_base_url = start_servers(site)
+    yield site, listing_base_url
+    stop_servers(servers)
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from fte_viewer_backend.analyze_versions import collect_versions, iter_fte_entries
+from fte_viewer_backend.jsonl_output import JsonlSink
+
+
+def crawl_output(fte_entry):
+    return [fte_entry(n, {"Código:": "18 – 13", "Descrição:": "Importação de álcool"},
+                      cnae=[("subclasse", "4681-8/01", "Comércio atacadista")])
+            for n in range(3)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_entries_stream_across_chunk_boundaries(tmp_path, fte_entry, chunk_size):
+    entries = crawl_output(fte_entry)
+    data_file = tmp_path / "all_fte_data.json"
+    data_file.write_text(json.dumps(entries, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    assert list(iter_fte_entries(str(data_file), chunk_size)) == entries
+
+
+def test_entries_stream_from_the_jsonl_output(tmp_path, fte_entry):
+    entries = crawl_output(fte_entry)
+    sink = JsonlSink(str(tmp_path / "all_fte_data.jsonl"), str(tmp_path / "checkpoint.jsonl"))
+    for position, entry in enumerate(entries):
+        sink.write_entry(0, position, entry)
+    sink.close()
+
+    assert list(iter_fte_entries(str(tmp_path / "all_fte_data.jsonl"))) == entries
+
+
+@pytest.mark.parametrize("text, message", [
+    ('{"url": "x"}', "does not contain a JSON array"),
+    ('[{"url": "x"}, {"url": "y"}', "ends before its closing"),
+])
+def test_malformed_data_files(tmp_path, text, message):
+    data_file = tmp_path / "all_fte_data.json"
+    data_file.write_text(text, encoding="utf-8")
+
+    with pytest.raises(ValueError, match=message):
+        list(iter_fte_entries(str(data_file), chunk_size=4))
+
+
+def test_empty_data_files(tmp_path):
+    for text in ("", "[]", "[\n]"):
+        data_file = tmp_path / "all_fte_data.json"
+        data_file.write_text(text, encoding="utf-8")
+        assert list(iter_fte_entries(str(data_file))) == []
+
+
+def test_version_label_with_non_breaking_space(fte_entry):
+    entries = [
+        fte_entry(1, {"Código:": "11 – 2", "Versão FTE:": "1.1", "Descrição:": "Antiga"}),
+        fte_entry(2, {"Código:": "11 – 2", "Versão\xa0FTE:": "1.2"}),
+    ]
+    codigo_groups, entry_count = collect_versions(entries)
+
+    assert entry_count == 2
+    assert codigo_groups["11 – 2"] == [
+        {"version": "1.1", "url": fte_entry.url(1), "descricao": "Antiga"},
+        {"version": "1.2", "url": fte_entry.url(2), "descricao": "N/A"},
+    ]
@@ -0,0 +1,26 @@
+import pytest
+
+from fte_viewer_backend import archive as archive_module
+from fte_viewer_backend.archive import RawArchive
+
+URL = "https://sei.ibama.gov.br/documento_consulta_externa.php?id_documento=1"
+
+
+@pytest.mark.parametrize("zstd", [False, True])
+def test_bodies_are_stored_once_and_read_back(tmp_path, monkeypatch, zstd):
+    if zstd:
+        pytest.importorskip("zstandard")
+    else:
+        # Installs without the archive extra fall back to gzip
+        monkeypatch.setattr(archive_module, "_zstandard", lambda: None)
+    archive = RawArchive(str(tmp_path))
+    body = "<html>FTE 18 – 13</html>".encode("utf-8")
+
+    digest = archive.store(URL, body, "text/html")
+    assert archive.store(URL + "&infra_hash=x", body, "text/html") == digest
+    archive.close()
+
+    assert archive.object_path(digest).endswith(".zst" if zstd else ".gz")
+    assert archive.read(digest) == body
+    assert archive.stats["stored"] == 1 and archive.stats["deduplicated"] == 1
+    assert set(archive.manifest()) == {URL, URL + "&infra_hash=x"}
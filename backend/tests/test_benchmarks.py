@@ -0,0 +1,25 @@
+import requests
+
+from benchmarks import load_test
+from benchmarks.mock_server import LISTING_PATH, MockSite
+
+
+def test_load_test_crawls_every_document(tmp_path, capsys):
+    # A complete crawl of the discovered listing pages exits 0
+    assert load_test.main(["--categories", "3", "--latency", "0", "--jitter", "0",
+                           "--discover", "--keep", str(tmp_path)]) == 0
+    assert "FTE entries written: 12 of 12" in capsys.readouterr().out
+
+
+def test_mock_site_pages_and_faults(mock_site):
+    site, listing_base_url = mock_site
+
+    index = requests.get(listing_base_url, timeout=5)
+    assert all(f"{LISTING_PATH}{slug}" in index.text for slug in site.slugs())
+    listing = requests.get(listing_base_url + site.slugs()[1], timeout=5)
+    assert site.document_url(4).replace("&", "&amp;") in listing.text
+    assert requests.get(site.document_url(99), timeout=5).status_code == 404
+
+    faulty = MockSite(categories=1, error_rate=1.0)
+    assert faulty.fault()[0] in (429, 503)
+    assert MockSite(categories=1, hang_rate=1.0, hang_seconds=3).fault() == ("hang", 3)
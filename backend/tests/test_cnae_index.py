@@ -0,0 +1,22 @@
+from fte_viewer_backend.cnae_index import CnaeIndex, build_cnae_index, cnae_key
+
+
+def test_cnae_codes_are_normalized():
+    assert cnae_key("4681-8/01") == cnae_key("4681801") == cnae_key("4681.8-01")
+
+
+def test_version_label_with_non_breaking_space(fte_entry):
+    entries = [
+        fte_entry(1, {"Código:": "11 – 2", "Versão FTE:": "1.1"},
+                  cnae=[("subclasse", "4681-8/01")]),
+        fte_entry(2, {"Código:": "11 – 2", "Versão\xa0FTE:": "1.2"},
+                  cnae=[("subclasse", "4681-8/01")]),
+    ]
+    index = CnaeIndex(build_cnae_index(entries))
+
+    matches = index.lookup("4681-8/01")
+    assert [(fte["id"], fte["versao"], fte["latest"]) for fte in matches] == [
+        ("1", "1.1", False), ("2", "1.2", True),
+    ]
+    assert [fte["id"] for fte in index.lookup("4681801", latest_only=True)] == ["2"]
+    assert index.lookup("4681-8/01", agrupamento="descritor") == []
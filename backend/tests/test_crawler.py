@@ -0,0 +1,94 @@
+import threading
+import time
+
+from fte_viewer_backend.crawler import run_crawl
+
+LISTING = "https://www.gov.br/ftes/{}"
+DOCUMENT = "https://sei.ibama.gov.br/documento_consulta_externa.php?id_documento={}"
+
+# Documents linked from each listing page; document 2 is linked twice
+LINKS = {
+    LISTING.format(0): [DOCUMENT.format(1), DOCUMENT.format(2)],
+    LISTING.format(1): [],
+    LISTING.format(2): [DOCUMENT.format(3), DOCUMENT.format(2)],
+}
+
+
+def parse_upper(text):
+    # Module level: the parse stage may run in a process pool
+    return text.upper()
+
+
+class Site:
+    """Stage callbacks over LINKS, counting fetches and the requests in flight per host"""
+
+    def __init__(self):
+        self.fetches = []
+        self.in_flight = {}
+        self.peak = {}
+        self._lock = threading.Lock()
+
+    def _request(self, host, seconds):
+        with self._lock:
+            self.in_flight[host] = self.in_flight.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.in_flight[host])
+        time.sleep(seconds)
+        with self._lock:
+            self.in_flight[host] -= 1
+
+    def process_listing(self, url):
+        # Later listing pages answer first, so completion order differs from crawl order
+        self._request("www.gov.br", 0.02 * (len(LINKS) - int(url[-1])))
+        links = LINKS[url]
+        return links, None if links else {"url": url, "status": "No FTE links found"}
+
+    def fetch_fte(self, url):
+        self._request("sei.ibama.gov.br", 0.01)
+        with self._lock:
+            self.fetches.append(url)
+        return None, (f"fte {url[-1]}",)
+
+    def finish_fte(self, url, parse_job, result):
+        return {"url": url, "data": result}
+
+
+def crawl(site, **options):
+    return run_crawl(list(LINKS), site.process_listing, site.fetch_fte, parse_upper,
+                     site.finish_fte, **options)
+
+
+def test_entries_come_back_in_serial_order():
+    site = Site()
+    all_fte_data, issues = crawl(site, parse_workers=0)
+
+    assert all_fte_data == [
+        {"url": DOCUMENT.format(1), "data": "FTE 1"},
+        {"url": DOCUMENT.format(2), "data": "FTE 2"},
+        {"url": DOCUMENT.format(3), "data": "FTE 3"},
+        {"url": DOCUMENT.format(2), "data": "FTE 2"},
+    ]
+    assert issues == [{"url": LISTING.format(1), "status": "No FTE links found"}]
+    # The document linked twice is fetched once
+    assert sorted(site.fetches) == [DOCUMENT.format(n) for n in (1, 2, 3)]
+
+
+def test_requests_in_flight_stay_within_host_limits():
+    site = Site()
+    crawl(site, parse_workers=0, host_limits={"www.gov.br": 1, "sei.ibama.gov.br": 2})
+
+    assert site.peak == {"www.gov.br": 1, "sei.ibama.gov.br": 2}
+
+
+def test_skipped_listings_are_not_crawled():
+    site = Site()
+    all_fte_data, issues = crawl(site, parse_workers=0, skip={0, 1})
+
+    assert [entry["url"] for entry in all_fte_data] == [DOCUMENT.format(3), DOCUMENT.format(2)]
+    assert issues == []
+
+
+def test_parse_stage_runs_in_a_process_pool():
+    site = Site()
+    all_fte_data, _ = crawl(site, parse_workers=2, queue_depth=1)
+
+    assert [entry["data"] for entry in all_fte_data] == ["FTE 1", "FTE 2", "FTE 3", "FTE 2"]
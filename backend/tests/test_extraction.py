@@ -0,0 +1,111 @@
+from bs4 import BeautifulSoup
+
+from fte_viewer_backend.extraction import (
+    CNAE_KEY, CnaeDescriptionIndex, FTEExtraction, extract_description_from_raw_text,
+    fte_table_json, metadata_value,
+)
+
+
+def fte_page(rows):
+    cells = "".join(f"<tr><td>{key}</td><td>{value}</td></tr>" for key, value in rows)
+    return BeautifulSoup(f"<html><body><table border='1'>{cells}</table></body></html>", "lxml")
+
+
+def test_repeated_code_gets_first_description():
+    raw_text = "\n".join([
+        "Subclasse", "4681-8/01", "Comércio atacadista de álcool carburante",
+        "Subclasse", "4681-8/01", "Outra descrição do mesmo código",
+    ])
+    index = CnaeDescriptionIndex(raw_text)
+
+    first = extract_description_from_raw_text(raw_text, "4681-8/01", "Subclasse")
+    assert first == "Comércio atacadista de álcool carburante"
+    assert index.describe("4681-8/01", "Subclasse") == first
+    assert index.describe("4681-8/01", "Subclasse") == first
+
+
+def test_descritor_and_subclasse_kept_apart():
+    raw_text = "\n".join([
+        "Descritor", "0220-9", "Produção florestal",
+        "Subclasse", "0220-9", "Extração de madeira",
+    ])
+    index = CnaeDescriptionIndex(raw_text)
+
+    assert index.describe("0220-9", "Descritor") == "Produção florestal"
+    assert index.describe("0220-9", "Subclasse") == "Extração de madeira"
+
+
+def test_code_followed_by_another_entry_has_no_description():
+    raw_text = "\n".join(["Subclasse", "4681-8/01", "Subclasse", "4681-8/02", "Comércio"])
+    index = CnaeDescriptionIndex(raw_text)
+
+    assert index.describe("4681-8/01", "Subclasse") == ""
+    assert index.describe("4681-8/02", "Subclasse") == "Comércio"
+
+
+def test_code_not_on_its_own_line_falls_back_to_substring_scan():
+    raw_text = "\n".join(["Subclasse", "CNAE 4681-8/01", "Comércio atacadista"])
+
+    assert CnaeDescriptionIndex(raw_text).describe("4681-8/01", "Subclasse") == "Comércio atacadista"
+
+
+def test_table_rows_with_repeated_code_match_baseline_scan():
+    soup = fte_page([
+        ("Código:", "18 – 13"),
+        (CNAE_KEY, ""),
+        ("Subclasse", "4681-8/01"),
+        ("Comércio atacadista de álcool carburante", ""),
+        ("Subclasse", "4681-8/01"),
+        ("Repetição", ""),
+        ("Descritor", "4681-8/01"),
+        ("Comércio de combustíveis", ""),
+    ])
+    data = fte_table_json(soup)
+
+    assert data[CNAE_KEY] == [
+        {"agrupamento": "subclasse", "código": "4681-8/01",
+         "descricao": "Comércio atacadista de álcool carburante"},
+        {"agrupamento": "subclasse", "código": "4681-8/01",
+         "descricao": "Comércio atacadista de álcool carburante"},
+        {"agrupamento": "descritor", "código": "4681-8/01",
+         "descricao": "Comércio de combustíveis"},
+    ]
+    for entry in data[CNAE_KEY]:
+        assert entry["descricao"] == extract_description_from_raw_text(
+            data["raw_content"], entry["código"], entry["agrupamento"])
+
+
+def test_one_pass_fills_both_views():
+    extraction = FTEExtraction(fte_page([
+        ("Código:", "18 – 13"),
+        ("Versão\xa0FTE:", "1.0"),
+        ("Descrição:", "Importação de combustíveis"),
+        ("A descrição compreende:", ""),
+        ("A descrição compreende", "Importação de álcool"),
+        ("Observações:", "Ver IN 12/2018"),
+    ]))
+
+    assert extraction.table_json(lambda code, cnae_type: "") == {
+        "metadata": {"Código:": "18 – 13", "Versão\xa0FTE:": "1.0",
+                     "Descrição:": "Importação de combustíveis",
+                     "A descrição compreende:": "", "A descrição compreende": "Importação de álcool"},
+        "sections": [{"title": "Observações:", "content": "Ver IN 12/2018", "items": []}],
+        "raw_content": extraction.raw_text,
+    }
+    fte_json = extraction.fte_json()
+    assert fte_json["metadata"] == {"codigo": "18 – 13", "descricao": "Importação de combustíveis"}
+    assert [section["title"] for section in fte_json["sections"]] == ["A descrição compreende:"]
+    assert metadata_value(extraction.metadata, "Versão FTE:") == "1.0"
+
+
+def test_cnae_rows_without_a_cnae_header_are_left_out():
+    data = fte_table_json(fte_page([("Código:", "18 – 13"), ("Subclasse", "4681-8/01")]))
+
+    assert CNAE_KEY not in data
+
+
+def test_page_without_the_main_table():
+    extraction = FTEExtraction(BeautifulSoup("<html><body><p>Erro</p></body></html>", "lxml"))
+
+    assert extraction.fte_json() == {"error": "No main table found in FTE content"}
+    assert extraction.table_json(None) == {"metadata": {}, "sections": [], "raw_content": "Erro"}
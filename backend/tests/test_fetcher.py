@@ -0,0 +1,28 @@
+from fte_viewer_backend.fetcher import PageFetcher, decode_body
+
+
+def test_requests_share_one_keep_alive_connection(mock_site):
+    site, _ = mock_site
+    fetcher = PageFetcher(pool_size=2)
+    for document_id in range(5):
+        body, content_type = fetcher.fetch_bytes(site.document_url(document_id))
+        assert body == site.document_page(document_id)
+
+    assert content_type == "text/html; charset=iso-8859-1"
+    assert fetcher.connection_stats() == {"requests": 5, "connections_opened": 1,
+                                          "connections_reused": 4}
+    fetcher.close()
+
+
+def test_fetch_text_decodes_the_declared_charset(mock_site):
+    site, _ = mock_site
+    fetcher = PageFetcher()
+    assert "Ficha Técnica de Enquadramento" in fetcher.fetch_text(site.document_url(0))
+    fetcher.close()
+
+
+def test_decode_body_prefers_the_header_then_meta():
+    body = '<meta charset="iso-8859-1"><p>Código</p>'.encode("iso-8859-1")
+    assert "Código" in decode_body(body)
+    assert "Código" in decode_body(body, "text/html; charset=ISO-8859-1")
+    assert "Código" in decode_body("Código".encode("utf-8"), "text/html; charset=bogus")
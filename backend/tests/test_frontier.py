@@ -0,0 +1,21 @@
+from fte_viewer_backend.frontier import Frontier, dedupe_listing_urls
+
+BASE = "https://www.gov.br/ftes/"
+SEI = "https://sei.ibama.gov.br/documento_consulta_externa.php?id_documento=7&infra_hash={}"
+
+
+def test_repeated_and_copied_listing_pages_are_dropped():
+    urls, dropped = dedupe_listing_urls([
+        BASE + "atividades", BASE + "atividades/", BASE + "copy_of_atividades", BASE + "outras",
+    ])
+
+    assert urls == [BASE + "atividades", BASE + "outras"]
+    assert dropped == [BASE + "atividades", BASE + "copy_of_atividades"]
+
+
+def test_document_is_claimed_once_whatever_its_infra_hash():
+    frontier = Frontier()
+
+    assert frontier.claim(SEI.format("a"), BASE + "atividades")[1:] == ("7", True)
+    assert frontier.claim(SEI.format("b"), BASE + "outras")[1:] == ("7", False)
+    assert frontier.stats() == {"links": 2, "documents": 1, "duplicates": 1}
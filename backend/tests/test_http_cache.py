@@ -0,0 +1,67 @@
+from fte_viewer_backend.fetcher import PageFetcher
+from fte_viewer_backend.http_cache import ResponseCache
+
+URL = "https://sei.ibama.gov.br/documento_consulta_externa.php?id_documento=1&infra_hash={}"
+BODY = b"<html><body>FTE 18 - 13</body></html>"
+
+
+class Response:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class Server:
+    """PageFetcher.get stand-in answering 304 once the client sends the ETag"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append((url, headers))
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return Response(304)
+        return Response(200, BODY, {"ETag": '"v1"', "Content-Type": "text/html; charset=utf-8"})
+
+
+def cached_fetcher(tmp_path, monkeypatch, **cache_options):
+    fetcher = PageFetcher(cache=ResponseCache(str(tmp_path / "cache"), **cache_options))
+    server = Server()
+    monkeypatch.setattr(fetcher, "get", server.get)
+    return fetcher, server
+
+
+def test_not_modified_serves_the_cached_body(tmp_path, monkeypatch):
+    fetcher, server = cached_fetcher(tmp_path, monkeypatch)
+
+    assert fetcher.fetch_bytes(URL.format("a")) == (BODY, "text/html; charset=utf-8")
+    # The next crawl links the same document with a rotated infra_hash
+    assert fetcher.fetch_bytes(URL.format("b")) == (BODY, "text/html; charset=utf-8")
+
+    assert server.requests[1] == (URL.format("b"), {"If-None-Match": '"v1"'})
+    assert fetcher.cache.stats == {"hits": 0, "misses": 1, "not_modified": 1, "evictions": 0}
+
+
+def test_fresh_entries_skip_the_network(tmp_path, monkeypatch):
+    fetcher, server = cached_fetcher(tmp_path, monkeypatch, max_age=60)
+
+    fetcher.fetch_bytes(URL.format("a"))
+    assert fetcher.fetch_bytes(URL.format("a"))[0] == BODY
+
+    assert len(server.requests) == 1
+    assert fetcher.cache.stats["hits"] == 1
+
+
+def test_index_survives_restarts_and_evicts_least_recently_used(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache"), max_bytes=len(BODY) * 2)
+    for id_documento in (1, 2):
+        cache.store(URL.replace("=1&", f"={id_documento}&").format("a"), BODY, {})
+    cache.read_body(URL.format("a"))
+    cache.store(URL.replace("=1&", "=3&").format("a"), BODY, {})
+    cache.save()
+
+    reloaded = ResponseCache(str(tmp_path / "cache"))
+    assert reloaded.lookup(URL.format("b")) is not None
+    assert reloaded.lookup(URL.replace("=1&", "=2&").format("b")) is None
+    assert cache.stats["evictions"] == 1
@@ -0,0 +1,73 @@
+import json
+
+from fte_viewer_backend import scrapper
+from fte_viewer_backend.incremental import IncrementalState, content_hash
+from fte_viewer_backend.records import FTERecord
+
+URL = "https://sei.ibama.gov.br/documento_consulta_externa.php?id_documento={}&infra_hash=x"
+DATA = {"metadata": {"Código:": "18 – 13"}, "sections": [], "raw_content": ""}
+
+
+def previous_run(tmp_path, hashes):
+    """all_fte_data.json and fte_content_hashes.json of a run that found documents 1 and 2"""
+    data_file = tmp_path / "all_fte_data.json"
+    state_file = tmp_path / "fte_content_hashes.json"
+    data_file.write_text(json.dumps([{"url": URL.format(1), "data": DATA},
+                                     {"url": URL.format(2), "data": DATA}]), encoding="utf-8")
+    state_file.write_text(json.dumps(hashes), encoding="utf-8")
+    return IncrementalState(str(data_file), str(state_file))
+
+
+def test_documents_reused_without_fetching_are_not_removed(tmp_path):
+    state = previous_run(tmp_path, {
+        "1": {"url": URL.format(1), "hash": "h1"},
+        "2": {"url": URL.format(2), "hash": "h2"},
+    })
+    state.keep(URL.format(1))
+    state.record(URL.format(2), "h2-new", DATA)
+
+    delta = state.save(str(tmp_path / "fte_delta.json"))
+    assert delta == {"added": [], "changed": [], "removed": []}
+    assert state.reused == 1
+    hashes = json.loads((tmp_path / "fte_content_hashes.json").read_text(encoding="utf-8"))
+    assert hashes["1"] == {"url": URL.format(1), "hash": "h1"}
+
+    # The next run still knows the reused document: unchanged, not added
+    next_run = IncrementalState(str(tmp_path / "all_fte_data.json"),
+                                str(tmp_path / "fte_content_hashes.json"))
+    assert next_run.lookup(URL.format(1), "h1") == DATA
+
+
+def test_reused_document_without_previous_hash_is_not_removed(tmp_path):
+    state = previous_run(tmp_path, {})
+    state.keep(URL.format(1))
+
+    assert state.delta()["removed"] == [{"id": "2", "url": URL.format(2)}]
+
+
+class ReusePlan:
+    """crawl_plan stand-in that reuses every document from the last run"""
+
+    def document(self, url):
+        return False, DATA
+
+
+def test_fetch_fte_records_planned_reuse(tmp_path, monkeypatch):
+    state = previous_run(tmp_path, {"1": {"url": URL.format(1), "hash": "h1"}})
+    monkeypatch.setattr(scrapper, "crawl_plan", ReusePlan())
+    monkeypatch.setattr(scrapper, "incremental_state", state)
+
+    entry, parse_job = scrapper.fetch_fte(URL.format(1))
+    assert isinstance(entry, FTERecord) and parse_job is None
+    assert "1" in state.hashes and state.reused == 1
+
+
+def test_fetch_fte_unchanged_content_returns_record(tmp_path, monkeypatch):
+    body = b"<html>FTE</html>"
+    state = previous_run(tmp_path, {"1": {"url": URL.format(1), "hash": content_hash(body)}})
+    monkeypatch.setattr(scrapper, "incremental_state", state)
+    monkeypatch.setattr(scrapper, "get_page_bytes", lambda url: (body, "text/html"))
+
+    entry, parse_job = scrapper.fetch_fte(URL.format(1))
+    assert isinstance(entry, FTERecord) and parse_job is None
+    assert entry.to_entry() == {"url": URL.format(1), "data": DATA}
@@ -0,0 +1,71 @@
+import json
+
+from fte_viewer_backend.jsonl_output import JsonlSink, finalize, load_checkpoint, read_entries
+
+LISTING = "https://www.ibama.gov.br/ftes/{}"
+
+
+def crawl(tmp_path, listing_urls, fte_entry, resume=False):
+    """One sink run writing an entry per listing page, as the crawl engine would"""
+    sink = JsonlSink(str(tmp_path / "data.jsonl"), str(tmp_path / "checkpoint.jsonl"),
+                     resume=resume, listing_urls=listing_urls)
+    done_before = dict(sink.done)
+    for index, url in enumerate(listing_urls):
+        if index in done_before:
+            continue
+        sink.write_entry(index, 0, fte_entry(f"{url[-1]}{index}"))
+        sink.complete_listing(index, url, None)
+    sink.close()
+    return done_before
+
+
+def test_resume_recrawls_listings_whose_url_changed(tmp_path, fte_entry):
+    crawl(tmp_path, [LISTING.format("a"), LISTING.format("b")], fte_entry)
+
+    done = crawl(tmp_path, [LISTING.format("a"), LISTING.format("c")], fte_entry, resume=True)
+
+    assert done == {0: LISTING.format("a")}
+    urls = [entry["url"] for entry in read_entries(str(tmp_path / "data.jsonl"))]
+    # The entry of the replaced listing page "b" is gone, not finalized twice
+    assert urls == [fte_entry.url("a0"), fte_entry.url("c1")]
+    assert load_checkpoint(str(tmp_path / "checkpoint.jsonl")) == {
+        0: LISTING.format("a"), 1: LISTING.format("c"),
+    }
+
+
+def test_resume_truncates_torn_tail(tmp_path, fte_entry):
+    listing_urls = [LISTING.format("a"), LISTING.format("b")]
+    crawl(tmp_path, listing_urls[:1], fte_entry)
+    with open(tmp_path / "data.jsonl", 'a', encoding='utf-8') as f:
+        f.write('{"listing": 1, "position": 0, "ent')
+    with open(tmp_path / "checkpoint.jsonl", 'a', encoding='utf-8') as f:
+        f.write('{"listing": 1, "u')
+
+    crawl(tmp_path, listing_urls, fte_entry, resume=True)
+
+    # Lines appended after the torn ones are whole records again
+    assert load_checkpoint(str(tmp_path / "checkpoint.jsonl")) == {
+        0: LISTING.format("a"), 1: LISTING.format("b"),
+    }
+    urls = [entry["url"] for entry in read_entries(str(tmp_path / "data.jsonl"))]
+    assert urls == [fte_entry.url("a0"), fte_entry.url("b1")]
+
+
+def test_finalize_restores_crawl_order(tmp_path, fte_entry):
+    sink = JsonlSink(str(tmp_path / "data.jsonl"), str(tmp_path / "checkpoint.jsonl"))
+    sink.write_entry(1, 0, fte_entry(3))
+    sink.complete_listing(1, LISTING.format("b"), None)
+    sink.write_entry(0, 1, fte_entry(2))
+    sink.write_entry(0, 0, fte_entry(1))
+    issue = {"url": LISTING.format("a"), "status": "No FTE links found"}
+    sink.complete_listing(0, LISTING.format("a"), issue)
+    sink.close()
+
+    count, issues = finalize(str(tmp_path / "data.jsonl"), str(tmp_path / "out.json"),
+                             str(tmp_path / "debug.json"))
+
+    entries = [fte_entry(1), fte_entry(2), fte_entry(3)]
+    assert count == 3
+    assert issues == [issue]
+    text = (tmp_path / "out.json").read_text(encoding="utf-8")
+    assert text == json.dumps(entries, indent=2, ensure_ascii=False)
@@ -0,0 +1,34 @@
+from fte_viewer_backend.lineage import build_lineage, diff_entries, version_key
+
+
+def test_versions_sort_numerically():
+    assert sorted(["1.10", "1.9", "2.0", None], key=version_key) == [None, "1.9", "1.10", "2.0"]
+
+
+def test_version_label_with_non_breaking_space(fte_entry):
+    entries = [
+        fte_entry(2, {"Código:": "11 – 2", "Versão\xa0FTE:": "1.2", "Descrição:": "Nova"}),
+        fte_entry(1, {"Código:": "11 – 2", "Versão FTE:": "1.1", "Descrição:": "Antiga"}),
+    ]
+    code = build_lineage(entries)["codes"]["11-2"]
+
+    assert [version["version"] for version in code["versions"]] == ["1.1", "1.2"]
+    assert code["latest"] == "2"
+    assert code["versions"][1]["changes"] == {"metadata": ["Descrição:"]}
+
+
+def test_diff_ignores_how_the_version_label_is_spaced():
+    previous = {"metadata": {"Código:": "11 – 2", "Versão FTE:": "1.1"}}
+    current = {"metadata": {"Código:": "11 – 2", "Versão\xa0FTE:": "1.2"}}
+
+    assert diff_entries(previous, current) == {}
+
+
+def test_repeated_documents_count_once(fte_entry):
+    shared = fte_entry(1, {"Código:": "18 – 13", "Versão FTE:": "1.0"})
+    newer = fte_entry(2, {"Código:": "18-13", "Versão FTE:": "2.0"})
+    lineage = build_lineage([shared, newer, shared])
+    versions = lineage["codes"]["18-13"]["versions"]
+
+    assert [version["id"] for version in versions] == ["1", "2"]
+    assert [version["position"] for version in versions] == [0, 1]
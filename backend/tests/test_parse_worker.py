@@ -0,0 +1,42 @@
+import functools
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from fte_viewer_backend import parse_worker
+from fte_viewer_backend.tracing import merge_profiles
+
+CORPUS = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "corpus", "fte")
+
+
+def corpus_pages():
+    pages = []
+    for path in sorted(glob.glob(os.path.join(CORPUS, "*.html")))[:4]:
+        with open(path, "rb") as f:
+            pages.append(f.read())
+    return pages
+
+
+def test_pool_workers_write_their_profile_when_shut_down(tmp_path):
+    parse = functools.partial(parse_worker.traced_parse_fte_page, profile_dir=str(tmp_path))
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(parse, corpus_pages()))
+        # Nothing is written while the workers are parsing
+        assert not list(tmp_path.glob("parse-*.prof"))
+
+    assert all("timing" in result for result in results)
+    assert list(tmp_path.glob("parse-*.prof"))
+    assert merge_profiles(str(tmp_path)) is not None
+
+
+def test_in_process_profile_is_written_by_dump_profile(tmp_path):
+    for page in corpus_pages():
+        parse_worker.traced_parse_fte_page(page, profile_dir=str(tmp_path))
+    assert not list(tmp_path.glob("parse-*.prof"))
+
+    parse_worker.dump_profile()
+    assert [path.name for path in tmp_path.glob("parse-*.prof")] == [f"parse-{os.getpid()}.prof"]
+    # Written once: a second call has nothing left to write
+    os.remove(tmp_path / f"parse-{os.getpid()}.prof")
+    parse_worker.dump_profile()
+    assert not list(tmp_path.glob("parse-*.prof"))
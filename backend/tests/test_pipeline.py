@@ -0,0 +1,38 @@
+import json
+
+from fte_viewer_backend import scrapper
+from fte_viewer_backend.crawler import run_crawl
+from fte_viewer_backend.extraction import metadata_value
+from fte_viewer_backend.fetcher import PageFetcher
+from fte_viewer_backend.jsonl_output import JsonlSink, finalize
+from fte_viewer_backend.parse_worker import parse_fte_page
+from fte_viewer_backend.serialization import dumps
+
+
+def crawl_mock_site(mock_site, monkeypatch, **options):
+    """The crawl command's fetch, parse and serialize stages against the mock site"""
+    site, listing_base_url = mock_site
+    monkeypatch.setattr(scrapper, "fetcher", PageFetcher())
+    listing_urls = [listing_base_url + slug for slug in site.slugs()]
+    return run_crawl(listing_urls, scrapper.process_listing, scrapper.fetch_fte, parse_fte_page,
+                     scrapper.finish_fte, **options)
+
+
+def test_pool_parsing_streams_the_same_entries(mock_site, monkeypatch, tmp_path):
+    site, _ = mock_site
+    in_process, issues = crawl_mock_site(mock_site, monkeypatch, parse_workers=0)
+    assert issues == []
+    assert len(in_process) == site.expected_entries()
+
+    sink = JsonlSink(str(tmp_path / "data.jsonl"), str(tmp_path / "checkpoint.jsonl"))
+    try:
+        crawl_mock_site(mock_site, monkeypatch, sink=sink, parse_workers=2, queue_depth=1)
+    finally:
+        sink.close()
+    count, _ = finalize(str(tmp_path / "data.jsonl"), str(tmp_path / "all_fte_data.json"),
+                        str(tmp_path / "debug.json"))
+
+    assert count == len(in_process)
+    pooled = json.loads((tmp_path / "all_fte_data.json").read_text(encoding="utf-8"))
+    assert pooled == json.loads(dumps(in_process))
+    assert all(metadata_value(entry["data"]["metadata"], "Código:") for entry in pooled)
@@ -0,0 +1,56 @@
+import json
+import os
+import re
+
+import pytest
+
+from fte_viewer_backend.publish import (
+    FTE_CODE_CATEGORIES, NO_CATEGORY, fte_category, summarize,
+)
+
+APP_JS = os.path.join(os.path.dirname(__file__), "..", "..", "src", "App.js")
+
+
+def app_js_categories():
+    """FTE_CODE_CATEGORIES of src/App.js, read as JSON"""
+    with open(APP_JS, encoding="utf-8") as f:
+        source = f.read()
+    body = source[source.index("const FTE_CODE_CATEGORIES = {"):]
+    body = body[body.index("{"):body.index("};") + 1]
+    # Quote bare keys and drop trailing commas
+    body = re.sub(r'^(\s*)([^\s"][^:\n]*):', r'\1"\2":', body, flags=re.M)
+    body = re.sub(r',(\s*[\]}])', r'\1', body)
+    return json.loads(body)
+
+
+@pytest.mark.skipif(not os.path.exists(APP_JS), reason="viewer sources not available")
+def test_categories_match_the_viewer():
+    categories = app_js_categories()
+    assert FTE_CODE_CATEGORIES == categories
+    assert list(FTE_CODE_CATEGORIES) == list(categories)
+
+
+def test_first_category_listing_a_code_wins():
+    assert fte_category("15 – 11") == "Agrotóxicos"
+    assert fte_category("22 – 3") == "Empreendimentos - Instalação"
+    assert fte_category("1 – 12") == "Mercúrio metálico"
+    assert fte_category("1 – 1") == "Mineração"
+    assert fte_category("99 – 1") == NO_CATEGORY
+    assert fte_category(None) == NO_CATEGORY
+
+
+def test_summary_leaves_category_to_the_viewer(fte_entry):
+    summary = summarize(fte_entry(1, {"Código:": "7 – 1"}))
+
+    assert summary == {"id": "1", "url": fte_entry.url(1), "data": {"metadata": {"Código:": "7 – 1"}}}
+
+
+def test_summary_keeps_cnae_codes_without_descriptions(fte_entry):
+    entry = fte_entry(1, {"Código:": "18 – 13"},
+                      cnae=[("subclasse", "4681-8/01", "Comércio atacadista de álcool carburante")])
+    summary = summarize(entry)
+
+    assert summary["data"]["Classificação Nacional de Atividades Econômicas"] == [
+        {"agrupamento": "subclasse", "código": "4681-8/01"},
+    ]
+    assert "sections" not in summary["data"] and "raw_content" not in summary["data"]
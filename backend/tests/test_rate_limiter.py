@@ -0,0 +1,89 @@
+import datetime
+import email.utils
+import time
+
+import pytest
+import requests
+
+from fte_viewer_backend import rate_limiter
+from fte_viewer_backend.fetcher import PageFetcher
+from fte_viewer_backend.rate_limiter import HostRateLimiter, RateLimiter, parse_retry_after
+
+URL = "https://sei.ibama.gov.br/documento_consulta_externa.php?id_documento=1"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Seconds each acquire() would have slept; nothing actually sleeps"""
+    slept = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", slept.append)
+    return slept
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    retry_at = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= parse_retry_after(retry_at) <= 30
+    assert parse_retry_after("Mon, 01 Jan 2001 00:00:00 GMT") == 0.0
+
+
+def test_rate_grows_while_fast_and_halves_on_throttle():
+    limiter = HostRateLimiter("sei.ibama.gov.br", 1.0, increase=0.5)
+    limiter.feedback(200, 0.1)
+    limiter.feedback(200, 0.1)
+    assert limiter.rate == 2.0
+
+    limiter.feedback(503, 0.1)
+    assert limiter.rate == 1.0
+    limiter.feedback(429, 0.1)
+    assert limiter.rate == 0.5
+    assert limiter.stats()["throttle_events"] == 2
+    assert limiter.stats()["highest_rate"] == 2.0
+
+
+def test_slow_responses_cut_the_rate_once_per_cooldown():
+    limiter = HostRateLimiter("sei.ibama.gov.br", 1.0, max_latency=1.0, cooldown=60)
+    limiter.feedback(200, 5.0)
+    limiter.feedback(200, 5.0)
+    assert limiter.rate == 0.5
+    assert limiter.throttle_events == 1
+
+
+def test_retry_after_pauses_the_host(sleeps):
+    limiter = HostRateLimiter("sei.ibama.gov.br", 1.0)
+    limiter.acquire()
+    assert sleeps == []
+
+    limiter.feedback(503, 0.1, retry_after=10)
+    limiter.acquire()
+    # The pause, then one token at the halved rate
+    assert 10 < sleeps[0] <= 12
+
+
+class Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b""
+        self.elapsed = datetime.timedelta(seconds=0.1)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+
+def test_fetcher_backs_off_and_retries_after_503(monkeypatch, sleeps):
+    limiter = RateLimiter(host_rates={"sei.ibama.gov.br": 2.0})
+    fetcher = PageFetcher(rate_limiter=limiter)
+    responses = [Response(503, {"Retry-After": "3"}), Response(200)]
+    monkeypatch.setattr(fetcher, "_send", lambda url, headers: responses.pop(0))
+
+    assert fetcher.get(URL).status_code == 200
+
+    stats = limiter.stats()["sei.ibama.gov.br"]
+    assert stats["throttle_events"] == 1
+    assert stats["lowest_rate"] == 1.0
+    # The retry waited for the Retry-After pause
+    assert sleeps and sleeps[-1] >= 3
@@ -0,0 +1,49 @@
+import json
+import os
+
+from fte_viewer_backend.archive import MANIFEST_FILE, RawArchive
+from fte_viewer_backend.scrapper import main
+
+BASE_URL = "https://www.gov.br/ftes/"
+LISTING_URL = BASE_URL + "atividades"
+SEI_URL = "https://sei.ibama.gov.br/documento_consulta_externa.php?id_documento=5&infra_hash="
+
+
+def fte_page(versao):
+    return (
+        "<html><body><table border='1'>"
+        "<tr><td>Código:</td><td>18 – 13</td></tr>"
+        f"<tr><td>Versão FTE:</td><td>{versao}</td></tr>"
+        "</table></body></html>"
+    ).encode("utf-8")
+
+
+def test_reparse_uses_the_latest_fetch_of_a_document(tmp_path):
+    archive_dir = str(tmp_path / "archive")
+    archive = RawArchive(archive_dir)
+    listing = f"<html><body><a href='{SEI_URL}b'>Acesse a FTE</a></body></html>"
+    fetches = [
+        # Newest fetch first in the manifest, under another infra_hash
+        (LISTING_URL, listing.encode("utf-8"), 100.0),
+        (SEI_URL + "a", fte_page("2.0"), 300.0),
+        (SEI_URL + "b", fte_page("1.0"), 200.0),
+    ]
+    lines = []
+    for url, body, fetched_at in fetches:
+        digest = archive.store(url, body, "text/html; charset=utf-8")
+        lines.append(json.dumps({"url": url, "hash": digest,
+                                 "content_type": "text/html; charset=utf-8",
+                                 "fetched_at": fetched_at}))
+    archive.close()
+    with open(os.path.join(archive_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+    urls_file = tmp_path / "listing_urls.txt"
+    urls_file.write_text("atividades\n", encoding="utf-8")
+    output = tmp_path / "all_fte_data.json"
+    assert main(["reparse", "--archive-dir", archive_dir, "--urls-file", str(urls_file),
+                 "--base-url", BASE_URL, "-o", str(output), "--parse-workers", "0"]) == 0
+
+    entries = json.loads(output.read_text(encoding="utf-8"))
+    assert [entry["data"]["metadata"]["Versão FTE:"] for entry in entries] == ["2.0"]
+    assert entries[0]["url"] == SEI_URL + "b"
@@ -0,0 +1,62 @@
+import json
+
+import requests
+
+import fte_viewer_backend
+from fte_viewer_backend.scrapper import FTEScraper
+
+URL = "https://sei.ibama.gov.br/documento_consulta_externa.php?id_documento={}"
+PAGE = ("<html><body><table border='1'>"
+        "<tr><td>Código:</td><td>18 – 13</td></tr>"
+        "<tr><td>Versão FTE:</td><td>1.0</td></tr>"
+        "</table></body></html>").encode("utf-8")
+
+
+def test_package_exports_the_scraper():
+    assert fte_viewer_backend.FTEScraper is FTEScraper
+
+
+def test_scrape_ftes_writes_the_crawl_format(tmp_path, monkeypatch):
+    scraper = FTEScraper(base_url="https://custom.gov.br")
+
+    def fetch_bytes(url):
+        if url == URL.format(2):
+            raise requests.exceptions.ConnectionError("unreachable")
+        return PAGE, "text/html; charset=utf-8"
+
+    monkeypatch.setattr(scraper.fetcher, "fetch_bytes", fetch_bytes)
+    output = tmp_path / "output.json"
+    results = scraper.scrape_ftes([URL.format(1), URL.format(2)], str(output))
+    scraper.close()
+
+    assert results == {"total_ftes": 1, "failed_urls": [URL.format(2)], "output_file": str(output)}
+    entries = json.loads(output.read_text(encoding="utf-8"))
+    assert entries[0]["url"] == URL.format(1)
+    assert entries[0]["data"]["metadata"] == {"Código:": "18 – 13", "Versão FTE:": "1.0"}
+    assert scraper.session is scraper.fetcher.session
+
+
+def test_finalize_only_fetches_nothing(tmp_path, monkeypatch, fte_entry):
+    from fte_viewer_backend import fetcher, scrapper
+    from fte_viewer_backend.jsonl_output import JsonlSink
+
+    monkeypatch.chdir(tmp_path)
+    listing = "https://www.ibama.gov.br/ftes/a"
+    sink = JsonlSink()
+    sink.write_entry(0, 0, fte_entry(1))
+    sink.complete_listing(0, listing, None)
+    # A listing page the interrupted run never finished
+    sink.write_entry(1, 0, fte_entry(2))
+    sink.close()
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("--finalize-only must not touch the network")
+
+    monkeypatch.setattr(fetcher, "PageFetcher", no_network)
+    monkeypatch.setattr(scrapper, "discover_listing_urls", no_network)
+    assert scrapper.main(["crawl", "--finalize-only", "--discover"]) == 0
+
+    entries = json.loads((tmp_path / "all_fte_data.json").read_text(encoding="utf-8"))
+    assert [entry["url"] for entry in entries] == [fte_entry.url(1), fte_entry.url(2)]
+    references = json.loads((tmp_path / "fte_references.json").read_text(encoding="utf-8"))
+    assert references == {"1": {"url": fte_entry.url(1), "listings": [listing]}}
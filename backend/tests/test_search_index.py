@@ -0,0 +1,40 @@
+from fte_viewer_backend.search_index import build_search_index, fold, search, tokenize
+
+
+def entries(fte_entry):
+    return [
+        fte_entry(1, {"Código:": "18 – 13", "Descrição:": "Importação de combustíveis"},
+                  cnae=[("subclasse", "4681-8/01", "Comércio atacadista de álcool carburante")]),
+        fte_entry(2, {"Código:": "21 – 5", "Descrição:": "Uso de agrotóxicos"},
+                  sections=[{"title": "Observações:", "content": "Registro de pesticidas",
+                             "items": []}]),
+        fte_entry(3, {"Código:": "18 – 5", "Descrição:": "Posto de combustível"}),
+    ]
+
+
+def test_tokens_are_folded_like_the_viewer():
+    assert fold("Importação") == "importacao"
+    assert tokenize("Código: 18 – 13") == ["codigo", "18", "13"]
+
+
+def test_index_layout(fte_entry):
+    index = build_search_index(entries(fte_entry))
+
+    assert index["count"] == 3
+    assert index["tokens"] == sorted(index["tokens"])
+    postings = dict(zip(index["tokens"], index["postings"]))
+    assert postings["18"] == [0, 2]
+    # A token repeated within an entry is posted once
+    assert postings["de"] == [0, 1, 2]
+
+
+def test_search_matches_every_term_as_a_prefix(fte_entry):
+    index = build_search_index(entries(fte_entry))
+
+    assert search(index, "combust") == {0, 2}
+    assert search(index, "combustivel posto") == {2}
+    assert search(index, "ALCOOL") == {0}
+    assert search(index, "pesticidas") == {1}
+    assert search(index, "4681") == {0}
+    assert search(index, "inexistente") == set()
+    assert search(index, "") == {0, 1, 2}
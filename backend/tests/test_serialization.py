@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from fte_viewer_backend import serialization
+from fte_viewer_backend.records import FTERecord
+
+ENTRY = {
+    "url": "https://sei.ibama.gov.br/documento_consulta_externa.php?id_documento=1",
+    "data": {
+        "metadata": {"Código:": "18 – 13", "Versão\xa0FTE:": "1.0"},
+        "sections": [{"title": "Potencial Poluidor:", "content": "Médio", "items": []}],
+        "raw_content": "Código:\n18 – 13",
+        "Classificação Nacional de Atividades Econômicas": [
+            {"agrupamento": "subclasse", "código": "4681-8/01", "descricao": "Comércio"},
+        ],
+    },
+}
+
+
+@pytest.fixture(params=["json", "orjson"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        # Installs without the fast extra use the json module
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_output_matches_the_json_module(backend, pretty):
+    record = FTERecord.from_entry(ENTRY)
+    if pretty:
+        expected = json.dumps([ENTRY], indent=2, ensure_ascii=False)
+    else:
+        expected = json.dumps([ENTRY], ensure_ascii=False, separators=(",", ":"))
+
+    assert serialization.dumps([record], pretty) == expected
+    assert serialization.loads(expected.encode("utf-8")) == [ENTRY]
+
+
+def test_write_json_streams_the_same_bytes(backend, tmp_path):
+    path = tmp_path / "all_fte_data.json"
+    serialization.write_json(str(path), [FTERecord.from_entry(ENTRY)] * 2, pretty=True)
+
+    assert path.read_text(encoding="utf-8") == json.dumps([ENTRY] * 2, indent=2, ensure_ascii=False)
@@ -0,0 +1,26 @@
+import json
+
+from fte_viewer_backend.service import Dataset, _matches
+
+
+def fte_code(fte_entry, id_documento, codigo, agrupamento="subclasse"):
+    return fte_entry(id_documento, {"Código:": codigo, "Versão FTE:": "1.0"},
+                     cnae=[(agrupamento, "0220-9")])
+
+
+def test_category_filter_covers_every_viewer_category(tmp_path, fte_entry):
+    data_file = tmp_path / "all_fte_data.json"
+    data_file.write_text(json.dumps([
+        fte_code(fte_entry, 1, "7 – 1"), fte_code(fte_entry, 2, "22 – 3"),
+        fte_code(fte_entry, 3, "1 – 1", "descritor"), fte_code(fte_entry, 4, "99 – 9"),
+    ]), encoding="utf-8")
+    summaries = Dataset(str(data_file)).summaries
+
+    def ids(**filters):
+        return [summary["id"] for summary in summaries if _matches(summary, **filters)]
+
+    assert ids(category="Flora e madeira") == ["1"]
+    assert ids(category="Empreendimentos - Instalação") == ["2"]
+    assert ids(category="Mineração", cnae_type="descritor") == ["3"]
+    assert ids(category="Sem categoria") == ["4"]
+    assert ids(codigo="22.3") == ["2"]
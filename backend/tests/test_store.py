@@ -0,0 +1,60 @@
+import sqlite3
+
+from fte_viewer_backend.store import FTEStore, SCHEMA
+
+
+def fte_version(fte_entry, id_documento, versao, descricao, version_label="Versão FTE:"):
+    metadata = {"Código:": "18 – 13", version_label: versao, "Descrição:": descricao}
+    return fte_entry(id_documento, metadata, cnae=[("subclasse", "4681-8/01")])
+
+
+def test_sync_query_and_export(tmp_path, fte_entry):
+    entries = [
+        fte_version(fte_entry, 1, "1.9", "Importação de combustíveis"),
+        fte_version(fte_entry, 2, "1.10", "Importação de óleo", version_label="Versão\xa0FTE:"),
+        fte_version(fte_entry, 1, "1.9", "Importação de combustíveis"),
+    ]
+    with FTEStore(str(tmp_path / "fte.sqlite3")) as store:
+        assert store.sync(entries) == (2, 0)
+        # Unchanged documents are not rewritten
+        assert store.sync(entries) == (0, 0)
+
+        assert [row["versao"] for row in store.versions("18-13")] == ["1.9", "1.10"]
+        assert store.latest_version("18.13")["url"] == fte_entry.url(2)
+        assert [row["id"] for row in store.ftes_for_cnae("4681-8/01")] == ["1", "2"]
+        assert [row["id"] for row in store.search("oleo")] == ["2"]
+        assert list(store.iter_entries()) == entries
+
+        assert store.sync(entries[:1]) == (0, 1)
+        assert store.count() == 1
+
+
+def test_cnae_codes_are_matched_by_key(tmp_path, fte_entry):
+    entries = [fte_entry(1, {"Código:": "18 – 13"}, cnae=[("subclasse", "4681-8/01 ")]),
+               fte_entry(2, {"Código:": "18 – 5"}, cnae=[("descritor", "4681801")])]
+    with FTEStore(str(tmp_path / "fte.sqlite3")) as store:
+        store.sync(entries)
+
+        for code in ("4681-8/01", "4681801", " 4681-8 / 01"):
+            rows = store.ftes_for_cnae(code)
+            assert [(row["id"], row["agrupamento"]) for row in rows] == [
+                ("1", "subclasse"), ("2", "descritor"),
+            ]
+
+
+
+def test_stores_without_cnae_keys_are_upgraded(tmp_path, fte_entry):
+    path = str(tmp_path / "fte.sqlite3")
+    # The cnae table as stores created before codigo_key had it
+    old_schema = SCHEMA.replace("    codigo_key TEXT,\n    descricao", "    descricao").replace(
+        "cnae_codigo_key ON cnae (codigo_key)", "cnae_codigo ON cnae (codigo)")
+    connection = sqlite3.connect(path)
+    connection.executescript(old_schema)
+    connection.execute("INSERT INTO fte (id, url, data) VALUES ('1', ?, '{}')", (fte_entry.url(1),))
+    connection.execute("INSERT INTO cnae (fte_id, position, agrupamento, codigo) "
+                       "VALUES ('1', 0, 'subclasse', '4681-8/01')")
+    connection.commit()
+    connection.close()
+
+    with FTEStore(path) as store:
+        assert [row["id"] for row in store.ftes_for_cnae("4681801")] == ["1"]
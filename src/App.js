@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useMemo } from "react";
 import {
   Container,
   Typography,
@@ -467,6 +467,90 @@ const getFteCategory = (codigo) => {
   return "Sem categoria";
 };
 
+// Accent-insensitive lowercase, matching fold() in the backend search index
+const foldText = (text) =>
+  text.normalize("NFD").replace(/[\u0300-\u036f]/g, "").toLowerCase();
+
+const tokenizeText = (text) => foldText(text).match(/[a-z0-9]+/g) || [];
+
+// Positions (in fte_index.json order) of the FTEs containing a token that
+// starts with each query term, or null when the query has no terms
+const searchFteIndex = (index, query) => {
+  let result = null;
+  for (const term of tokenizeText(query)) {
+    const matches = new Set();
+    // Tokens are sorted: binary search the first one >= term
+    let low = 0;
+    let high = index.tokens.length;
+    while (low < high) {
+      const mid = (low + high) >> 1;
+      if (index.tokens[mid] < term) low = mid + 1;
+      else high = mid;
+    }
+    for (
+      let i = low;
+      i < index.tokens.length && index.tokens[i].startsWith(term);
+      i++
+    ) {
+      index.postings[i].forEach((position) => matches.add(position));
+    }
+    result =
+      result === null
+        ? matches
+        : new Set([...result].filter((position) => matches.has(position)));
+    if (result.size === 0) break;
+  }
+  return result;
+};
+
+// Compare version strings such as "1.10" and "1.9" number by number,
+// like version_key() in the backend lineage
+const compareVersions = (a, b) => {
+  const left = (a || "").match(/\d+/g) || [];
+  const right = (b || "").match(/\d+/g) || [];
+  for (let i = 0; i < Math.max(left.length, right.length); i++) {
+    if (i >= left.length) return -1;
+    if (i >= right.length) return 1;
+    const difference = Number(left[i]) - Number(right[i]);
+    if (difference !== 0) return difference;
+  }
+  return 0;
+};
+
+// FTE id -> { codigo, rank, changes } from fte_lineage.json; rank orders
+// the versions of a code, oldest first
+const indexLineage = (lineage) => {
+  const byId = {};
+  Object.values(lineage.codes).forEach((code) => {
+    code.versions.forEach((version, rank) => {
+      byId[version.id] = {
+        codigo: code.codigo,
+        rank,
+        changes: version.changes,
+      };
+    });
+  });
+  return byId;
+};
+
+// Short Portuguese summary of a lineage diff
+const describeChanges = (changes) => {
+  if (!changes) return null;
+  const parts = [];
+  if (changes.metadata) {
+    parts.push(`metadados (${changes.metadata.join(", ")})`);
+  }
+  Object.entries(changes.sections || {}).forEach(([kind, titles]) => {
+    const label = { added: "incluídas", removed: "removidas", changed: "alteradas" }[kind];
+    parts.push(`seções ${label}: ${titles.join(", ")}`);
+  });
+  Object.entries(changes.cnae || {}).forEach(([kind, codes]) => {
+    const label = { added: "incluídos", removed: "removidos", changed: "alterados" }[kind];
+    parts.push(`CNAE ${label}: ${codes.join(", ")}`);
+  });
+  return parts.length > 0 ? parts.join("; ") : "sem alterações de conteúdo";
+};
+
 function App() {
   // Function to get FTE title from code
   const getFteTitle = (codigo) => {
@@ -484,6 +568,12 @@ function App() {
   const [statsDialogOpen, setStatsDialogOpen] = useState(false);
   const [viewMode, setViewMode] = useState("list"); // "list" or "list" or "grouped"
   const [categoryFilter, setCategoryFilter] = useState("");
+  // Full records (sections, raw_content) by FTE id, fetched when an FTE is opened
+  const [fteDetails, setFteDetails] = useState({});
+  // Inverted index written by `fte-scraper publish`; null until loaded
+  const [searchIndex, setSearchIndex] = useState(null);
+  // Version lineage written by `fte-scraper publish`, indexed by FTE id
+  const [lineageById, setLineageById] = useState(null);
 
   useEffect(() => {
     fetchFteData();
@@ -493,19 +583,47 @@ function App() {
     try {
       // Use the correct path for GitHub Pages deployment
       const basePath = process.env.PUBLIC_URL || '';
-      const response = await fetch(`${basePath}/all_fte_data.json`);
+      // Slim summary index written by `fte-scraper publish`
+      const response = await fetch(`${basePath}/fte_index.json`);
       if (!response.ok) {
         throw new Error("Failed to fetch FTE data");
       }
       const data = await response.json();
       setFteData(data);
       setLoading(false);
+      fetchSearchIndex(basePath);
+      fetchLineage(basePath);
     } catch (err) {
       setError(err.message);
       setLoading(false);
     }
   };
 
+  const fetchSearchIndex = async (basePath) => {
+    try {
+      const response = await fetch(`${basePath}/fte_search.json`);
+      if (response.ok) {
+        setSearchIndex(await response.json());
+      }
+    } catch (err) {
+      // Without the index the search box scans every FTE instead
+    }
+  };
+
+  const fetchLineage = async (basePath) => {
+    try {
+      const response = await fetch(`${basePath}/fte_lineage.json`);
+      if (response.ok) {
+        const lineage = await response.json();
+        if (lineage.version === 1) {
+          setLineageById(indexLineage(lineage));
+        }
+      }
+    } catch (err) {
+      // Without the lineage versions are grouped and compared here
+    }
+  };
+
   // Function to transform FTE code format from "18 – 4" to "18.4"
   const transformFteCode = (codigo) => {
     if (!codigo || codigo === "N/A") return "N/A";
@@ -513,12 +631,19 @@ function App() {
     return codigo.replace(/ – /g, ".");
   };
 
-  // Function to group FTE data by código and organize by versions
+  // Function to group FTE data by código and organize by versions, newest
+  // first. The lineage merges spellings of a code ("10–4", "10 – 4") and
+  // repeated documents; without it versions are compared number by number
   const groupFteByCodigo = (data) => {
     const grouped = {};
+    const seen = new Set();
 
     data.forEach((item) => {
-      const codigo = item.data?.metadata?.["Código:"] || "N/A";
+      if (item.id && seen.has(item.id)) return;
+      if (item.id) seen.add(item.id);
+      const lineageInfo = lineageById?.[item.id];
+      const codigo =
+        lineageInfo?.codigo || item.data?.metadata?.["Código:"] || "N/A";
       const version = item.data?.metadata?.["Versão FTE:"] || "N/A";
 
       if (!grouped[codigo]) {
@@ -530,37 +655,45 @@ function App() {
         };
       }
 
-      // Parse version number for comparison
-      const versionNum = parseFloat(version.replace(/[^\d.]/g, ""));
-
       grouped[codigo].versions.push({
         ...item,
         version,
-        versionNum,
+        rank: lineageInfo?.rank,
+        changes: lineageInfo?.changes,
       });
-
-      // Update latest version
-      if (
-        !grouped[codigo].latestVersion ||
-        versionNum > grouped[codigo].latestVersion.versionNum
-      ) {
-        grouped[codigo].latestVersion = {
-          ...item,
-          version,
-          versionNum,
-        };
-      }
     });
 
-    // Sort versions within each group
     Object.values(grouped).forEach((group) => {
-      group.versions.sort((a, b) => b.versionNum - a.versionNum);
+      group.versions.sort((a, b) =>
+        a.rank !== undefined && b.rank !== undefined
+          ? b.rank - a.rank
+          : compareVersions(b.version, a.version)
+      );
+      group.latestVersion = group.versions[0];
     });
 
     return grouped;
   };
 
-  const handleExpand = (index) => {
+  const loadFteDetail = async (item) => {
+    if (!item?.detail || fteDetails[item.id]) return;
+    try {
+      const basePath = process.env.PUBLIC_URL || '';
+      const response = await fetch(`${basePath}/${item.detail}`);
+      if (!response.ok) {
+        throw new Error("Failed to fetch FTE detail");
+      }
+      const detail = await response.json();
+      setFteDetails((prev) => ({ ...prev, [item.id]: detail }));
+    } catch (err) {
+      setFteDetails((prev) => ({ ...prev, [item.id]: { error: err.message } }));
+    }
+  };
+
+  const handleExpand = (index, items = []) => {
+    if (!expandedItems[index]) {
+      items.forEach(loadFteDetail);
+    }
     setExpandedItems((prev) => ({
       ...prev,
       [index]: !prev[index],
@@ -569,8 +702,9 @@ function App() {
 
   const handleExpandAll = () => {
     const allExpanded = {};
-    filteredData.forEach((_, index) => {
+    filteredData.forEach((item, index) => {
       allExpanded[index] = true;
+      loadFteDetail(item);
     });
     setExpandedItems(allExpanded);
   };
@@ -587,7 +721,30 @@ function App() {
     setCategoryFilter("");
   };
 
-  const filteredData = fteData.filter((item) => {
+  // FTE positions matching the search box, from the prebuilt index
+  const searchMatches = useMemo(() => {
+    if (
+      !searchTerm ||
+      !searchIndex ||
+      searchIndex.version !== 1 ||
+      searchIndex.count !== fteData.length
+    ) {
+      return null;
+    }
+    return searchFteIndex(searchIndex, searchTerm);
+  }, [searchTerm, searchIndex, fteData]);
+
+  // Codes whose title matches; titles only exist in FTE_CODE_TITLES
+  const titleMatches = useMemo(() => {
+    const searchFolded = foldText(searchTerm);
+    return new Set(
+      Object.keys(FTE_CODE_TITLES).filter((codigo) =>
+        foldText(FTE_CODE_TITLES[codigo]).includes(searchFolded)
+      )
+    );
+  }, [searchTerm]);
+
+  const filteredData = fteData.filter((item, position) => {
     if (
       !searchTerm &&
       !fteCodeSearch &&
@@ -599,13 +756,21 @@ function App() {
     const searchLower = searchTerm.toLowerCase();
     const url = item.url?.toLowerCase() || "";
     const metadata = item.data?.metadata || {};
-    const sections = item.data?.sections || [];
+    // Sections and CNAE descriptions only come with the full record: the
+    // detail file once loaded, or the record itself when the data is not a
+    // summary index
+    const fullData = fteDetails[item.id]?.data || item.data || {};
+    const sections = fullData.sections || [];
     const cnae =
-      item.data?.["Classificação Nacional de Atividades Econômicas"] || [];
+      fullData["Classificação Nacional de Atividades Econômicas"] ||
+      item.data?.["Classificação Nacional de Atividades Econômicas"] ||
+      [];
     const code = metadata["Código:"] || "";
 
     // Search filter
-    if (searchTerm) {
+    if (searchTerm && searchMatches) {
+      if (!searchMatches.has(position) && !titleMatches.has(code)) return false;
+    } else if (searchTerm) {
       const fteTitle = getFteTitle(metadata["Código:"] || "");
       const hasSearchMatch =
         url.includes(searchLower) ||
@@ -644,7 +809,7 @@ function App() {
 
     // Category filter
     if (categoryFilter) {
-      const fteCategory = getFteCategory(metadata["Código:"] || "");
+      const fteCategory = getFteCategory(code);
       if (fteCategory !== categoryFilter) {
         return false;
       }
@@ -794,8 +959,27 @@ function App() {
     document.body.removeChild(link);
   };
 
-  // Render FTE content for both views
-  const renderFteContent = (item, isGrouped = false) => (
+  // Render FTE content for both views, once its detail file has loaded
+  const renderFteContent = (item, isGrouped = false) => {
+    const detail = fteDetails[item.id];
+    if (!detail) {
+      return (
+        <Box sx={{ mt: 2, display: "flex", justifyContent: "center" }}>
+          <CircularProgress size={24} />
+        </Box>
+      );
+    }
+    if (detail.error) {
+      return (
+        <Alert severity="error" sx={{ mt: 2 }}>
+          {detail.error}
+        </Alert>
+      );
+    }
+    return renderFteDetail(detail, isGrouped);
+  };
+
+  const renderFteDetail = (item, isGrouped = false) => (
     <Box sx={{ mt: 2 }}>
       <Divider sx={{ mb: 2 }} />
 
@@ -1561,7 +1745,7 @@ function App() {
                         </Tooltip>
                       )}
                       <IconButton
-                        onClick={() => handleExpand(index)}
+                        onClick={() => handleExpand(index, [item])}
                         sx={{
                           transform: expandedItems[index]
                             ? "rotate(180deg)"
@@ -1643,7 +1827,7 @@ function App() {
                         </Tooltip>
                       )}
                       <IconButton
-                        onClick={() => handleExpand(codigo)}
+                        onClick={() => handleExpand(codigo, group.versions)}
                         sx={{
                           transform: expandedItems[codigo]
                             ? "rotate(180deg)"
@@ -1667,6 +1851,15 @@ function App() {
                         >
                           Versão Atual: {group.latestVersion.version}
                         </Typography>
+                        {group.latestVersion.changes && (
+                          <Typography
+                            variant="body2"
+                            color="text.secondary"
+                            gutterBottom
+                          >
+                            Alterações: {describeChanges(group.latestVersion.changes)}
+                          </Typography>
+                        )}
                         {renderFteContent(group.latestVersion, true)}
                       </Box>
 
@@ -1696,6 +1889,16 @@ function App() {
                               >
                                 Versão: {version.version}
                               </Typography>
+                              {version.changes && (
+                                <Typography
+                                  variant="body2"
+                                  color="text.secondary"
+                                  gutterBottom
+                                >
+                                  Alterações:{" "}
+                                  {describeChanges(version.changes)}
+                                </Typography>
+                              )}
                               {renderFteContent(version, true)}
                             </Box>
                           ))}